@@ -1,8 +1,11 @@
+# Imported first so the startup profile clock covers every other import
+from startup import startup_profile
+
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
-import requests
 import os
+import random
 import time
 import json
 from datetime import datetime, timedelta
@@ -71,12 +74,40 @@ def format_recipe(meal, user_dietary, is_vegetarian):
     }
 
 # Import MongoDB models and auth
-from database import mongo, User, UserPreference, RecipeRequest
-from auth import create_user_token, register_user, authenticate_user, get_current_user
+from database import mongo, User, UserPreference, RecipeRequest, preference_cache
+from auth import create_user_token, register_user, authenticate_user, get_current_user, get_user_preferences, get_user_preference, invalidate_user_preferences
 
 # Import blockchain module
 from blockchain_routes import blockchain_bp
 from blockchain_models import initialize_blockchain_indexes
+from blockchain_stats import blockchain_stats
+from blockchain_jobs import blockchain_jobs, initialize_job_indexes
+
+# Import shared outbound HTTP client and upstream response cache
+from http_client import http_client
+from cache import response_cache
+from circuit_breaker import circuit_breakers
+from prefetch import PrefetchScheduler, initialize_prefetch_indexes
+
+# Import bounded concurrent fetcher
+from fanout import fanout, Fanout
+
+# Import local recipe store
+from recipe_store import recipe_store, area_for_cuisine, initialize_recipe_indexes
+
+# Import jobs catalog
+from job_catalog import job_catalog, CATEGORY_KEYWORDS
+
+# Import weather service (OpenWeather key pool with wttr.in fallback)
+from weather import CityNotFoundError, weather_service
+
+# Import Reddit access-token manager
+from reddit_auth import RedditTokenManager
+
+# Import lazily created Verbwire client (warmed up in the background)
+from verbwire_service import get_verbwire_service
+
+startup_profile.mark('imports')
 
 app = Flask(__name__)
 CORS(app)
@@ -112,6 +143,110 @@ SPOONACULAR_API_KEY = os.getenv('SPOONACULAR_API_KEY', 'your_spoonacular_api_key
 VERBWIRE_SECRET_KEY = os.getenv('VERBWIRE_SECRET_KEY', 'sk_live_059687da-d760-4ebc-a82c-5c6988d6c7a6')
 VERBWIRE_PUBLIC_KEY = os.getenv('VERBWIRE_PUBLIC_KEY', 'pk_live_e3dad993-76b0-4447-b3f8-406af34d4ea5')
 
+# Overall deadlines (seconds) for parallel multi-category upstream fetches
+NEWS_FANOUT_DEADLINE = float(os.getenv('NEWS_FANOUT_DEADLINE', '10'))
+TRENDING_FANOUT_DEADLINE = float(os.getenv('TRENDING_FANOUT_DEADLINE', '5'))
+DASHBOARD_DEADLINE = float(os.getenv('DASHBOARD_DEADLINE', '12'))
+
+# Most cities one /api/weather/batch request may ask for
+WEATHER_MAX_BATCH_CITIES = int(os.getenv('WEATHER_MAX_BATCH_CITIES', '10'))
+
+# Dashboard sections get their own pool: they fan out again internally (news
+# categories, recipe lookups), so sharing the fanout pool could starve it
+dashboard_fanout = Fanout(max_workers=int(os.getenv('DASHBOARD_MAX_WORKERS', '16')))
+
+# Shared Reddit client-credentials token, refreshed ahead of expiry
+reddit_tokens = RedditTokenManager(
+    REDDIT_CLIENT_ID,
+    REDDIT_SECRET,
+    refresh_margin=int(os.getenv('REDDIT_TOKEN_REFRESH_MARGIN', '300'))
+)
+
+# TMDB API setup
+TMDB_BASE_URL = "https://api.themoviedb.org/3"
+TMDB_API_KEYS = {
+    'popular': "b4400a6612041fa02652d8a3375b8e72",
+    'upcoming': "cd3bf45901d632d42b8e91e3737a9160"
+}
+
+# CoinGecko API (free, no API key required)
+COINGECKO_MARKETS_URL = "https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=20&page=1&sparkline=false&price_change_percentage=24h"
+
+# Map frontend categories to YouTube search terms
+YOUTUBE_CATEGORY_MAPPING = {
+    'trending': 'trending viral popular',
+    'technology': 'technology tech latest',
+    'education': 'education tutorial learning',
+    'entertainment': 'entertainment funny viral',
+    'music': 'music latest hits',
+    'gaming': 'gaming gameplay review',
+    'sports': 'sports highlights news',
+    'travel': 'travel destinations adventure',
+    'fitness': 'fitness workout exercise'
+}
+
+REDDIT_SORT_OPTIONS = ['hot', 'new', 'rising', 'top']
+
+# Upstream request builders shared by the handlers and the prefetch scheduler,
+# so a prefetched response lands under the exact cache key a handler reads
+def gnews_headlines_request(category):
+    return f"https://gnews.io/api/v4/top-headlines?category={category}&lang=en&apikey={NEWS_API_KEY}&max=10", None
+
+def youtube_search_request(category):
+    """YouTube search for a category; the query and ordering vary by day"""
+    search_term = YOUTUBE_CATEGORY_MAPPING.get(category, category)
+    
+    # Vary search queries and ordering to get different content. The variant
+    # changes daily together with publishedAfter, so a category has one cache key per day
+    search_queries = [
+        f"{search_term} latest",
+        f"{search_term} 2025",
+        f"{search_term} updates",
+        f"{search_term} new",
+        f"best {search_term}",
+        f"{search_term} today"
+    ]
+    order_options = ['date', 'relevance', 'viewCount']
+    today = datetime.now()
+    variant = today.toordinal() % (len(search_queries) * len(order_options))
+    
+    return "https://www.googleapis.com/youtube/v3/search", {
+        'part': 'snippet',
+        'q': search_queries[variant // len(order_options)],
+        'type': 'video',
+        'maxResults': 15,
+        'order': order_options[variant % len(order_options)],
+        # Last 30 days, truncated to the day so the shared response cache can reuse the result
+        'publishedAfter': (today - timedelta(days=30)).strftime('%Y-%m-%dT00:00:00Z'),
+        'key': YOUTUBE_API_KEY
+    }
+
+def tmdb_movies_request(listing):
+    """TMDB movie list request, listing is 'popular' or 'upcoming'"""
+    return f"{TMDB_BASE_URL}/movie/{listing}", {
+        "api_key": TMDB_API_KEYS[listing],
+        "language": "en-US",
+        "page": 1
+    }
+
+def reddit_posts_request(subreddit, sort_type):
+    params = {'limit': 15}
+    if sort_type == 'top':
+        # For top posts, get daily top
+        params['t'] = 'day'
+    return f"https://oauth.reddit.com/r/{subreddit}/{sort_type}", params
+
+# Keeps hot feeds warm in the shared response cache
+prefetcher = PrefetchScheduler(
+    response_cache,
+    jitter=float(os.getenv('PREFETCH_JITTER', '0.1')),
+    lease_ttl=int(os.getenv('PREFETCH_LEASE_TTL', '60')),
+    sync_interval=int(os.getenv('PREFETCH_SYNC_INTERVAL', '60'))
+)
+
+def env_list(name, default):
+    return [item.strip() for item in os.getenv(name, default).split(',') if item.strip()]
+
 # MongoDB initialization
 def init_mongodb():
     try:
@@ -119,12 +254,79 @@ def init_mongodb():
         print("MongoDB connection initialized!")
         # Initialize blockchain indexes
         initialize_blockchain_indexes()
+        initialize_job_indexes()
+        initialize_recipe_indexes()
+        initialize_prefetch_indexes()
     except Exception as e:
         print(f"Error initializing MongoDB: {e}")
 
-# Initialize MongoDB when app starts
-with app.app_context():
-    init_mongodb()
+def init_mongodb_in_app_context():
+    with app.app_context():
+        init_mongodb()
+
+def load_job_catalog():
+    # Imports pandas and builds the category index, so /api/jobs never parses the CSV on the request path
+    if job_catalog.available():
+        job_catalog.load()
+
+def seed_blockchain_counters():
+    # One-time exact counts; afterwards /api/blockchain/stats reads maintained counters
+    blockchain_stats.seed_counters()
+
+def start_recipe_refresher():
+    # Keep the local recipe store warm in the background
+    if os.getenv('RECIPE_STORE_REFRESH', '1') != '0':
+        recipe_store.start_refresher()
+
+def start_prefetcher():
+    # Register hot keys for the providers that have real API keys configured
+    if os.getenv('PREFETCH_ENABLED', '1') == '0':
+        return
+    
+    if NEWS_API_KEY and NEWS_API_KEY != 'your_newsapi_key_here':
+        for category in env_list('PREFETCH_NEWS_CATEGORIES', 'general,technology'):
+            prefetcher.add(f'gnews:{category}', 'gnews', lambda category=category: gnews_headlines_request(category))
+    
+    if YOUTUBE_API_KEY and YOUTUBE_API_KEY != 'your_youtube_api_key_here':
+        for category in env_list('PREFETCH_YOUTUBE_CATEGORIES', 'trending'):
+            prefetcher.add(f'youtube:{category}', 'youtube', lambda category=category: youtube_search_request(category))
+    
+    if REDDIT_CLIENT_ID and REDDIT_CLIENT_ID != 'your_reddit_client_id_here':
+        for subreddit in env_list('PREFETCH_REDDIT_SUBREDDITS', 'technology'):
+            for sort_type in REDDIT_SORT_OPTIONS:
+                prefetcher.add(
+                    f'reddit:{subreddit}/{sort_type}', 'reddit',
+                    lambda subreddit=subreddit, sort_type=sort_type: reddit_posts_request(subreddit, sort_type),
+                    headers=reddit_tokens.auth_headers
+                )
+    
+    for listing in TMDB_API_KEYS:
+        prefetcher.add(f'tmdb:{listing}', 'tmdb', lambda listing=listing: tmdb_movies_request(listing))
+    
+    prefetcher.add('coingecko:markets', 'coingecko', lambda: (COINGECKO_MARKETS_URL, None))
+    prefetcher.start()
+
+def warm_up():
+    """Run deferred startup work on a background thread, once per process
+
+    Servers call this once they are listening (see start_app.py and
+    serve_async.py); the before_request hook below covers any other launcher.
+    """
+    return startup_profile.warm_up([
+        ('mongodb_indexes', init_mongodb_in_app_context),
+        ('job_catalog', load_job_catalog),
+        ('blockchain_counters', seed_blockchain_counters),
+        ('blockchain_jobs', blockchain_jobs.resume),
+        ('verbwire_client', get_verbwire_service),
+        ('recipe_refresher', start_recipe_refresher),
+        ('prefetch_scheduler', start_prefetcher)
+    ])
+
+@app.before_request
+def ensure_warm_up():
+    warm_up()
+
+startup_profile.mark('app_setup')
 
 # Database initialization endpoint for setup
 @app.route('/api/init-db', methods=['POST'])
@@ -204,9 +406,8 @@ def get_current_user_info():
         
         # Get user preferences
         preferences = {}
-        user_prefs = UserPreference.find_by_user_id(current_user.get_id())
-        for pref in user_prefs:
-            preferences[pref.category] = pref.preferences
+        for category, pref in get_user_preferences().items():
+            preferences[category] = pref.preferences
         
         user_data = {
             'id': current_user.get_id(),
@@ -234,26 +435,17 @@ def save_preferences():
         
         data = request.get_json()
         
-        for category, prefs in data.items():
-            # Find existing preference or create new one
-            user_pref = UserPreference.find_by_user_and_category(
-                current_user.get_id(), 
-                category
-            )
-            
-            if user_pref:
-                user_pref.preferences = prefs
-                user_pref.updated_at = datetime.utcnow()
-                user_pref.save()
-            else:
-                user_pref = UserPreference(
-                    user_id=current_user.get_id(),
-                    category=category,
-                    preferences=prefs
-                )
-                user_pref.save()
+        # Upsert every posted category in a single bulk write
+        results = UserPreference.bulk_save(current_user.get_id(), data)
+        invalidate_user_preferences()
+        
+        failed = [category for category, saved in results.items() if not saved]
+        if failed and len(failed) == len(results):
+            return jsonify({'message': 'Failed to save preferences', 'results': results}), 500
+        if failed:
+            return jsonify({'message': f"Failed to save preferences for: {', '.join(failed)}", 'results': results}), 207
         
-        return jsonify({'message': 'Preferences saved successfully'}), 200
+        return jsonify({'message': 'Preferences saved successfully', 'results': results}), 200
         
     except Exception as e:
         return jsonify({'message': str(e)}), 500
@@ -267,9 +459,8 @@ def get_preferences():
             return jsonify({'message': 'User not found'}), 404
         
         preferences = {}
-        user_prefs = UserPreference.find_by_user_id(current_user.get_id())
-        for pref in user_prefs:
-            preferences[pref.category] = pref.preferences
+        for category, pref in get_user_preferences().items():
+            preferences[category] = pref.preferences
         
         return jsonify({'preferences': preferences}), 200
         
@@ -286,10 +477,7 @@ def update_preference_category(category):
         
         data = request.get_json()
         
-        user_pref = UserPreference.find_by_user_and_category(
-            current_user.get_id(), 
-            category
-        )
+        user_pref = get_user_preference(category)
         
         if user_pref:
             user_pref.preferences = data
@@ -302,6 +490,7 @@ def update_preference_category(category):
                 preferences=data
             )
             user_pref.save()
+        invalidate_user_preferences()
         
         return jsonify({'message': f'{category} preferences updated successfully'}), 200
         
@@ -314,10 +503,7 @@ def update_preference_category(category):
 def get_food_recommendations():
     try:
         current_user = get_current_user()
-        food_prefs = UserPreference.find_by_user_and_category(
-            current_user.get_id(), 
-            'food'
-        )
+        food_prefs = get_user_preference('food')
         
         user_food_prefs = food_prefs.preferences if food_prefs else {}
         cuisines = user_food_prefs.get('cuisines', ['italian', 'chinese'])
@@ -363,10 +549,7 @@ def get_food_recommendations():
 def get_movie_recommendations():
     try:
         current_user = get_current_user()
-        movie_prefs = UserPreference.find_by_user_and_category(
-            current_user.get_id(), 
-            'movies'
-        )
+        movie_prefs = get_user_preference('movies')
         
         user_movie_prefs = movie_prefs.preferences if movie_prefs else {}
         genres = user_movie_prefs.get('genres', ['action', 'comedy'])
@@ -412,7 +595,17 @@ def get_movie_recommendations():
 # Health check endpoint
 @app.route('/health')
 def health():
-    return jsonify({"status": "healthy", "service": "dashboard-backend"})
+    return jsonify({
+        "status": "healthy",
+        "service": "dashboard-backend",
+        "response_cache": response_cache.stats(),
+        "prefetch": prefetcher.stats(),
+        "preference_cache": preference_cache.stats(),
+        "startup": startup_profile.report(),
+        "http_client": http_client.stats(),
+        "circuit_breakers": circuit_breakers.stats(),
+        "weather": weather_service.stats()
+    })
 
 # Public News Service Endpoint (no auth required)
 @app.route('/api/news/public')
@@ -449,8 +642,8 @@ def get_public_news():
         
         # Real NewsAPI call
         articles = []
-        url = f"https://gnews.io/api/v4/top-headlines?category={category}&lang=en&apikey={NEWS_API_KEY}&max=10"
-        response = requests.get(url, timeout=10)
+        url, params = gnews_headlines_request(category)
+        response = response_cache.get('gnews', url, params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -503,22 +696,26 @@ def get_public_news():
 @app.route('/api/news')
 @jwt_required()
 def get_news():
+    current_user = get_current_user()
+    if not current_user:
+        return jsonify({'message': 'User not found'}), 404
+    # Get user's news preferences
+    news_prefs = get_user_preference('news')
+    user_categories = news_prefs.preferences.get('categories', ['general']) if news_prefs else ['general']
+    
+    # Debug logging
+    print(f"DEBUG: User ID: {current_user.get_id()}")
+    print(f"DEBUG: News preferences found: {news_prefs is not None}")
+    if news_prefs:
+        print(f"DEBUG: User categories: {user_categories}")
+    else:
+        print("DEBUG: No news preferences found, using default")
+    
+    return jsonify(build_news_payload(user_categories))
+
+def build_news_payload(user_categories):
+    """News card payload for a user's preferred categories"""
     try:
-        current_user = get_current_user()
-        if not current_user:
-            return jsonify({'message': 'User not found'}), 404
-        # Get user's news preferences
-        news_prefs = UserPreference.find_by_user_and_category(current_user.get_id(), 'news')
-        user_categories = news_prefs.preferences.get('categories', ['general']) if news_prefs else ['general']
-        
-        # Debug logging
-        print(f"DEBUG: User ID: {current_user.get_id()}")
-        print(f"DEBUG: News preferences found: {news_prefs is not None}")
-        if news_prefs:
-            print(f"DEBUG: User categories: {user_categories}")
-        else:
-            print("DEBUG: No news preferences found, using default")
-        
         # Use user's preferred category or fallback to general
         # category = request.args.get('category', user_categories[0] if user_categories else 'general')
         # print(f"DEBUG: Selected category: {category}")
@@ -547,15 +744,33 @@ def get_news():
                 "is_mock": True
             }
             print(f"DEBUG: Returning mock data for category: {user_categories[0]}")
-            return jsonify(response_data)
+            return response_data
         
         # Real NewsAPI call
         # url = f"https://newsapi.org/v2/top-headlines?category={category}&apiKey={NEWS_API_KEY}&pageSize=20"
+        # Fetch every preferred category in parallel under one deadline
+        fetches = [
+            (cat, lambda cat=cat: response_cache.get('gnews', *gnews_headlines_request(cat), timeout=10))
+            for cat in user_categories
+        ]
+        results = fanout.fan_out(fetches, timeout=NEWS_FANOUT_DEADLINE)
+        
+        # Merge in preference order; failed or slow categories are skipped individually
         articles = []
-        for cat in user_categories:
-            url = f"https://gnews.io/api/v4/top-headlines?category={cat}&lang=en&apikey={NEWS_API_KEY}&max=10"
-            response = requests.get(url, timeout=10)
+        failed_categories = []
+        errors = []
+        for result in results:
+            cat = result.key
+            if result.timed_out:
+                failed_categories.append(cat)
+                errors.append(f"{cat}: timed out")
+                continue
+            if result.error is not None:
+                failed_categories.append(cat)
+                errors.append(f"{cat}: {result.error}")
+                continue
             
+            response = result.value
             if response.status_code == 200:
                 data = response.json()
                 
@@ -573,22 +788,27 @@ def get_news():
                     })
                 
             else:
-                raise Exception(f"API returned status {response.status_code}")
+                failed_categories.append(cat)
+                errors.append(f"{cat}: API returned status {response.status_code}")
+        
+        if failed_categories and len(failed_categories) == len(user_categories):
+            raise Exception("; ".join(errors))
         
         response_data = {
                 "category": user_categories,
                 "count": len(articles),
                 "articles": articles,
                 "user_preferences": user_categories,
+                "failed_categories": failed_categories,
                 "is_mock": False,
                 "timestamp": datetime.now().isoformat()
             }
         print(f"DEBUG: Returning real news data for category: {user_categories}, articles count: {len(articles)}")
-        return jsonify(response_data)
+        return response_data
             
     except Exception as e:
         # Fallback to mock data on error
-        return jsonify({
+        return {
             "category": user_categories[0],
             "count": 1,
             "articles": [{
@@ -603,7 +823,7 @@ def get_news():
                 "is_static": True
             }],
             "error": str(e)
-        })
+        }
 
 @app.route('/api/news/trending')
 @jwt_required()
@@ -614,46 +834,46 @@ def get_trending_news():
             return jsonify({'message': 'User not found'}), 404
         
         # Get user's news preferences
-        news_prefs = UserPreference.find_by_user_and_category(current_user.get_id(), 'news')
+        news_prefs = get_user_preference('news')
         user_categories = news_prefs.preferences.get('categories', ['technology', 'business', 'entertainment', 'sports']) if news_prefs else ['technology', 'business', 'entertainment', 'sports']
         
         # Use user's preferred categories instead of hardcoded ones
         categories = user_categories[:4]  # Limit to 4 categories for trending
         all_articles = []
         
-        for category in categories:
-            try:
-                if NEWS_API_KEY and NEWS_API_KEY != 'your_newsapi_key_here':
-                    url = f"https://newsapi.org/v2/top-headlines?category={category}&apiKey={NEWS_API_KEY}&pageSize=5"
-                    response = requests.get(url, timeout=5)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        for article in data.get('articles', []):
-                            all_articles.append({
-                                "id": f"trending_{int(time.time())}_{len(all_articles)}",
-                                "title": article.get('title', ''),
-                                "description": article.get('description', ''),
-                                "url": article.get('url', ''),
-                                "source": article.get('source', {}).get('name', ''),
-                                "category": category,
-                                "published_at": article.get('publishedAt', ''),
-                                "image_url": article.get('urlToImage', ''),
-                            })
-                else:
-                    # Add mock data if no API key or API fails
-                    all_articles.append({
-                        "id": f"mock_trending_{category}_{int(time.time())}",
-                        "title": f"Trending {category.title()} News",
-                        "description": f"Latest updates in {category}",
-                        "url": "#",
-                        "source": "Mock Source",
-                        "category": category,
-                        "published_at": datetime.now().isoformat(),
-                        "image_url": "https://via.placeholder.com/300x200",
-                    })
-            except Exception as e:
-                # Add mock data for failed categories
+        has_api_key = NEWS_API_KEY and NEWS_API_KEY != 'your_newsapi_key_here'
+        results = []
+        if has_api_key:
+            # Fetch all trending categories in parallel under one deadline
+            fetches = [
+                (category, lambda category=category: response_cache.get(
+                    'newsapi',
+                    f"https://newsapi.org/v2/top-headlines?category={category}&apiKey={NEWS_API_KEY}&pageSize=5",
+                    timeout=5
+                ))
+                for category in categories
+            ]
+            results = fanout.fan_out(fetches, timeout=TRENDING_FANOUT_DEADLINE)
+        
+        for index, category in enumerate(categories):
+            result = results[index] if has_api_key else None
+            if result is not None and result.ok:
+                response = result.value
+                if response.status_code == 200:
+                    data = response.json()
+                    for article in data.get('articles', []):
+                        all_articles.append({
+                            "id": f"trending_{int(time.time())}_{len(all_articles)}",
+                            "title": article.get('title', ''),
+                            "description": article.get('description', ''),
+                            "url": article.get('url', ''),
+                            "source": article.get('source', {}).get('name', ''),
+                            "category": category,
+                            "published_at": article.get('publishedAt', ''),
+                            "image_url": article.get('urlToImage', ''),
+                        })
+            else:
+                # Add mock data if no API key, or if this category failed or timed out
                 all_articles.append({
                     "id": f"mock_trending_{category}_{int(time.time())}",
                     "title": f"Trending {category.title()} News",
@@ -702,7 +922,7 @@ def search_news():
         if NEWS_API_KEY and NEWS_API_KEY != 'your_newsapi_key_here':
             try:
                 url = f"https://newsapi.org/v2/everything?q={query}&apiKey={NEWS_API_KEY}&pageSize=10&sortBy=relevancy"
-                response = requests.get(url, timeout=10)
+                response = http_client.get(url, timeout=10)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -820,7 +1040,7 @@ def get_videos():
         return jsonify({'message': 'User not found'}), 404
         
     # Get user's video preferences (stored as 'youtube' category in MongoDB)
-    video_prefs = UserPreference.find_by_user_and_category(current_user.get_id(), 'youtube')
+    video_prefs = get_user_preference('youtube')
     user_categories = video_prefs.preferences.get('categories', ['trending']) if video_prefs else ['trending']
     
     category = request.args.get('category', user_categories[0] if user_categories else 'trending')
@@ -833,6 +1053,10 @@ def get_videos():
         print("DEBUG: No video preferences found, using default")
     print(f"DEBUG: Selected category: {category}")
     
+    return jsonify(build_videos_payload(category, user_categories))
+
+def build_videos_payload(category, user_categories):
+    """Videos card payload for one YouTube category"""
     if not YOUTUBE_API_KEY or YOUTUBE_API_KEY == 'your_youtube_api_key_here':
         # Return mock data if no API key
         # Generate multiple mock videos for different categories
@@ -904,60 +1128,19 @@ def get_videos():
         print(f"DEBUG: Returning {len(videos)} videos for category: {category}")
         for video in videos:
             print(f"  - {video['title']}")
-        return jsonify({
+        return {
             "category": category,
             "count": len(videos),
             "videos": videos,
             "user_preferences": user_categories,
             "message": "Add YOUTUBE_API_KEY to get real data"
-        })
+        }
     
     # Real YouTube API call
     try:
-        # Map frontend categories to YouTube search terms
-        category_mapping = {
-            'trending': 'trending viral popular',
-            'technology': 'technology tech latest',
-            'education': 'education tutorial learning',
-            'entertainment': 'entertainment funny viral',
-            'music': 'music latest hits',
-            'gaming': 'gaming gameplay review',
-            'sports': 'sports highlights news',
-            'travel': 'travel destinations adventure',
-            'fitness': 'fitness workout exercise'
-        }
+        url, params = youtube_search_request(category)
         
-        # Get the mapped search term or use the category as-is
-        search_term = category_mapping.get(category, category)
-        
-        # Vary search queries to get different content
-        search_queries = [
-            f"{search_term} latest",
-            f"{search_term} 2025", 
-            f"{search_term} updates",
-            f"{search_term} new",
-            f"best {search_term}",
-            f"{search_term} today"
-        ]
-        import random
-        search_query = random.choice(search_queries)
-        
-        # Vary ordering to get different results
-        order_options = ['date', 'relevance', 'viewCount']
-        order = random.choice(order_options)
-        
-        url = f"https://www.googleapis.com/youtube/v3/search"
-        params = {
-            'part': 'snippet',
-            'q': search_query,
-            'type': 'video',
-            'maxResults': 15,
-            'order': order,
-            'publishedAfter': (datetime.now() - timedelta(days=30)).isoformat() + 'Z',  # Last 30 days
-            'key': YOUTUBE_API_KEY
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
+        response = response_cache.get('youtube', url, params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -979,19 +1162,19 @@ def get_videos():
                     "is_static": False
                 })
             
-            return jsonify({
+            return {
                 "category": category,
                 "count": len(videos),
                 "videos": videos,
                 "user_preferences": user_categories,
                 "source": "YouTube API"
-            })
+            }
         else:
             raise Exception(f"YouTube API returned status {response.status_code}")
             
     except Exception as e:
         # Fallback to mock data on error
-        return jsonify({
+        return {
             "category": category,
             "count": 1,
             "videos": [{
@@ -1006,7 +1189,7 @@ def get_videos():
                 "is_static": True
             }],
             "error": str(e)
-        })
+        }
 
 # Reddit Service Endpoints
 @app.route('/api/reddit')
@@ -1017,7 +1200,7 @@ def get_reddit_posts():
         return jsonify({'message': 'User not found'}), 404
         
     # Get user's news preferences (stored as 'news' category in MongoDB)
-    news_prefs = UserPreference.find_by_user_and_category(current_user.get_id(), 'news')
+    news_prefs = get_user_preference('news')
     user_categories = news_prefs.preferences.get('categories', ['technology']) if news_prefs else ['technology']
     
     subreddit = request.args.get('subreddit', user_categories[0] if user_categories else 'technology')
@@ -1030,6 +1213,10 @@ def get_reddit_posts():
         print("DEBUG: No news preferences found, using default")
     print(f"DEBUG: Selected subreddit: {subreddit}")
     
+    return jsonify(build_reddit_payload(subreddit, user_categories))
+
+def build_reddit_payload(subreddit, user_categories):
+    """Reddit card payload for one subreddit"""
     if not REDDIT_CLIENT_ID or REDDIT_CLIENT_ID == 'your_reddit_client_id_here':
         # Return mock data with category-specific content
         mock_reddit_data = {
@@ -1067,91 +1254,62 @@ def get_reddit_posts():
                 "is_static": True
             })
         
-        return jsonify({
+        return {
             "subreddit": subreddit,
             "count": len(posts),
             "posts": posts,
             "user_preferences": user_categories,
             "message": "Add REDDIT_CLIENT_ID and REDDIT_SECRET to get real data"
-        })
+        }
     
     # Real Reddit API call
     try:
-        # Get Reddit access token
-        auth_url = "https://www.reddit.com/api/v1/access_token"
-        auth_data = {
-            'grant_type': 'client_credentials'
-        }
-        auth_headers = {
-            'User-Agent': 'OneHub Dashboard/1.0'
-        }
-        
-        auth_response = requests.post(
-            auth_url, 
-            data=auth_data, 
-            headers=auth_headers,
-            auth=(REDDIT_CLIENT_ID, REDDIT_SECRET),
-            timeout=10
-        )
-        
-        if auth_response.status_code == 200:
-            token_data = auth_response.json()
-            access_token = token_data.get('access_token')
-            
-            # Fetch posts from subreddit with varied sorting
-            sort_options = ['hot', 'new', 'rising', 'top']
-            import random
-            sort_type = random.choice(sort_options)
-            
-            posts_url = f"https://oauth.reddit.com/r/{subreddit}/{sort_type}"
-            posts_headers = {
-                'Authorization': f'Bearer {access_token}',
-                'User-Agent': 'OneHub Dashboard/1.0'
-            }
-            posts_params = {
-                'limit': 15,
-                't': 'day' if sort_type == 'top' else None  # For top posts, get daily top
-            }
-            # Remove None values
-            posts_params = {k: v for k, v in posts_params.items() if v is not None}
-            
-            posts_response = requests.get(posts_url, headers=posts_headers, params=posts_params, timeout=10)
+        # Fetch posts from subreddit with varied sorting
+        import random
+        sort_type = random.choice(REDDIT_SORT_OPTIONS)
+        posts_url, posts_params = reddit_posts_request(subreddit, sort_type)
+        
+        # The access token is shared and refreshed ahead of expiry by reddit_tokens;
+        # listings are the same for every user, so they go through the response cache
+        posts_response = response_cache.get('reddit', posts_url, params=posts_params, headers=reddit_tokens.auth_headers(), timeout=10)
+        if posts_response.status_code == 401:
+            # Token was revoked early; fetch a new one and retry once
+            reddit_tokens.invalidate()
+            posts_response = response_cache.get('reddit', posts_url, params=posts_params, headers=reddit_tokens.auth_headers(), timeout=10)
+        
+        if posts_response.status_code == 200:
+            data = posts_response.json()
+            posts = []
             
-            if posts_response.status_code == 200:
-                data = posts_response.json()
-                posts = []
-                
-                for post_data in data.get('data', {}).get('children', []):
-                    post = post_data.get('data', {})
-                    
-                    posts.append({
-                        "id": post.get('id', ''),
-                        "title": post.get('title', ''),
-                        "description": post.get('selftext', '')[:200] + '...' if len(post.get('selftext', '')) > 200 else post.get('selftext', ''),
-                        "url": f"https://reddit.com{post.get('permalink', '')}",
-                        "subreddit": post.get('subreddit', subreddit),
-                        "author": post.get('author', 'unknown'),
-                        "score": post.get('score', 0),
-                        "comments": post.get('num_comments', 0),
-                        "created_at": datetime.fromtimestamp(post.get('created_utc', 0)).isoformat(),
-                        "is_static": False
-                    })
+            for post_data in data.get('data', {}).get('children', []):
+                post = post_data.get('data', {})
                 
-                return jsonify({
-                    "subreddit": subreddit,
-                    "count": len(posts),
-                    "posts": posts,
-                    "user_preferences": user_categories,
-                    "source": "Reddit API"
+                posts.append({
+                    "id": post.get('id', ''),
+                    "title": post.get('title', ''),
+                    "description": post.get('selftext', '')[:200] + '...' if len(post.get('selftext', '')) > 200 else post.get('selftext', ''),
+                    "url": f"https://reddit.com{post.get('permalink', '')}",
+                    "subreddit": post.get('subreddit', subreddit),
+                    "author": post.get('author', 'unknown'),
+                    "score": post.get('score', 0),
+                    "comments": post.get('num_comments', 0),
+                    "created_at": datetime.fromtimestamp(post.get('created_utc', 0)).isoformat(),
+                    "is_static": False
                 })
-            else:
-                raise Exception(f"Reddit posts API returned status {posts_response.status_code}")
+            
+            return {
+                "subreddit": subreddit,
+                "count": len(posts),
+                "posts": posts,
+                "user_preferences": user_categories,
+                "source": "Reddit API"
+            }
         else:
-            raise Exception(f"Reddit auth failed with status {auth_response.status_code}")
+            raise Exception(f"Reddit posts API returned status {posts_response.status_code}")
             
     except Exception as e:
         # Fallback to mock data on error
-        return jsonify({
+        return {
             "subreddit": subreddit,
             "count": 1,
             "posts": [{
@@ -1167,7 +1325,7 @@ def get_reddit_posts():
                 "is_static": True
             }],
             "error": str(e)
-        })
+        }
 
 @app.route('/api/reddit/trending')
 def get_trending_reddit():
@@ -1177,47 +1335,29 @@ def get_trending_reddit():
     for subreddit in subreddits:
         try:
             if REDDIT_CLIENT_ID and REDDIT_CLIENT_ID != 'your_reddit_client_id_here':
-                # Get Reddit access token
-                auth_url = "https://www.reddit.com/api/v1/access_token"
-                auth_data = {'grant_type': 'client_credentials'}
-                auth_headers = {'User-Agent': 'OneHub Dashboard/1.0'}
+                posts_url = f"https://oauth.reddit.com/r/{subreddit}/hot"
+                posts_params = {'limit': 2}
                 
-                auth_response = requests.post(
-                    auth_url, 
-                    data=auth_data, 
-                    headers=auth_headers,
-                    auth=(REDDIT_CLIENT_ID, REDDIT_SECRET),
-                    timeout=5
-                )
+                # Every subreddit reuses the one shared access token
+                posts_response = http_client.get(posts_url, headers=reddit_tokens.auth_headers(), params=posts_params, timeout=5)
                 
-                if auth_response.status_code == 200:
-                    token_data = auth_response.json()
-                    access_token = token_data.get('access_token')
-                    
-                    posts_url = f"https://oauth.reddit.com/r/{subreddit}/hot"
-                    posts_headers = {
-                        'Authorization': f'Bearer {access_token}',
-                        'User-Agent': 'OneHub Dashboard/1.0'
-                    }
-                    posts_params = {'limit': 2}
-                    
-                    posts_response = requests.get(posts_url, headers=posts_headers, params=posts_params, timeout=5)
-                    
-                    if posts_response.status_code == 200:
-                        data = posts_response.json()
-                        for post_data in data.get('data', {}).get('children', []):
-                            post = post_data.get('data', {})
-                            all_posts.append({
-                                "id": post.get('id', ''),
-                                "title": post.get('title', ''),
-                                "description": post.get('selftext', '')[:150] + '...' if len(post.get('selftext', '')) > 150 else post.get('selftext', ''),
-                                "url": f"https://reddit.com{post.get('permalink', '')}",
-                                "subreddit": post.get('subreddit', subreddit),
-                                "author": post.get('author', 'unknown'),
-                                "score": post.get('score', 0),
-                                "comments": post.get('num_comments', 0),
-                                "created_at": datetime.fromtimestamp(post.get('created_utc', 0)).isoformat(),
-                            })
+                if posts_response.status_code == 200:
+                    data = posts_response.json()
+                    for post_data in data.get('data', {}).get('children', []):
+                        post = post_data.get('data', {})
+                        all_posts.append({
+                            "id": post.get('id', ''),
+                            "title": post.get('title', ''),
+                            "description": post.get('selftext', '')[:150] + '...' if len(post.get('selftext', '')) > 150 else post.get('selftext', ''),
+                            "url": f"https://reddit.com{post.get('permalink', '')}",
+                            "subreddit": post.get('subreddit', subreddit),
+                            "author": post.get('author', 'unknown'),
+                            "score": post.get('score', 0),
+                            "comments": post.get('num_comments', 0),
+                            "created_at": datetime.fromtimestamp(post.get('created_utc', 0)).isoformat(),
+                        })
+                elif posts_response.status_code == 401:
+                    reddit_tokens.invalidate()
         except:
             # Add mock data for failed subreddits
             all_posts.append({
@@ -1247,13 +1387,9 @@ def get_popular_movies():
             return jsonify({'message': 'User not found'}), 404
             
         # Get user's movie preferences from MongoDB
-        movie_prefs = UserPreference.find_by_user_and_category(current_user.get_id(), 'movies')
+        movie_prefs = get_user_preference('movies')
         user_genres = movie_prefs.preferences.get('genres', []) if movie_prefs else []
         
-        # TMDB API setup
-        API_KEY = "b4400a6612041fa02652d8a3375b8e72"
-        BASE_URL = "https://api.themoviedb.org/3"
-        
         # TMDB genre mapping
         GENRE_MAP = {
             "action": 28,
@@ -1278,13 +1414,8 @@ def get_popular_movies():
         }
         
         # Fetch popular movies from TMDB
-        params = {
-            "api_key": API_KEY,
-            "language": "en-US",
-            "page": 1
-        }
-        
-        response = requests.get(f"{BASE_URL}/movie/popular", params=params, timeout=10)
+        url, params = tmdb_movies_request('popular')
+        response = response_cache.get('tmdb', url, params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -1384,13 +1515,9 @@ def get_upcoming_movies():
             return jsonify({'message': 'User not found'}), 404
             
         # Get user's movie preferences from MongoDB
-        movie_prefs = UserPreference.find_by_user_and_category(current_user.get_id(), 'movies')
+        movie_prefs = get_user_preference('movies')
         user_genres = movie_prefs.preferences.get('genres', []) if movie_prefs else []
         
-        # TMDB API setup
-        API_KEY = "cd3bf45901d632d42b8e91e3737a9160"
-        BASE_URL = "https://api.themoviedb.org/3"
-        
         # TMDB genre mapping
         GENRE_MAP = {
             "action": 28,
@@ -1415,13 +1542,8 @@ def get_upcoming_movies():
         }
         
         # Fetch upcoming movies from TMDB
-        params = {
-            "api_key": API_KEY,
-            "language": "en-US",
-            "page": 1
-        }
-        
-        response = requests.get(f"{BASE_URL}/movie/upcoming", params=params, timeout=10)
+        url, params = tmdb_movies_request('upcoming')
+        response = response_cache.get('tmdb', url, params=params, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -1634,119 +1756,20 @@ def update_user_name():
 @jwt_required()
 def get_jobs():
     try:
-        current_user_id = get_jwt_identity()
         category = request.args.get('category', '')
         
         # Get user preferences for jobs
-        from database import UserPreference
-        user_prefs = UserPreference.find_by_user_and_category(current_user_id, 'jobs')
+        user_prefs = get_user_preference('jobs')
         user_categories = user_prefs.preferences.get('categories', []) if user_prefs else []
         
-        # Read jobs from CSV file
-        import pandas as pd
-        import os
-        
-        csv_path = os.path.join(os.path.dirname(__file__), 'internshala_jobs_fully_cleaned_final.csv')
-        
-        if not os.path.exists(csv_path):
+        if not job_catalog.available():
             return jsonify({
                 "jobs": [],
                 "user_preferences": user_categories,
                 "error": "Jobs data file not found"
             }), 404
         
-        # Read CSV file
-        df = pd.read_csv(csv_path)
-        
-        # Filter jobs based on user preferences or category
-        filtered_jobs = []
-        
-        if category and category in ['frontend_developer', 'backend_developer', 'data_analyst', 'ai_ml_engineer', 
-                                   'graphic_designer', 'video_editor', 'marketing', 'android_developer']:
-            # Filter by specific category - improved keyword matching
-            category_keywords = {
-                'frontend_developer': ['frontend', 'front end', 'web', 'react', 'javascript', 'html', 'css', 'vue', 'angular', 'ui developer', 'web developer'],
-                'backend_developer': ['backend', 'back end', 'django', 'flask', 'node', 'server', 'python developer', 'java developer', 'api developer'],
-                'data_analyst': ['data analyst', 'data', 'analyst', 'sql', 'analytics', 'business analyst', 'quantitative analyst'],
-                'ai_ml_engineer': ['ai', 'ml', 'machine learning', 'deep learning', 'artificial intelligence', 'ai engineer', 'ml engineer'],
-                'graphic_designer': ['graphic designer', 'graphic', 'design', 'photoshop', 'illustrator', 'designer', 'visual designer'],
-                'video_editor': ['video editor', 'video', 'edit', 'premiere', 'after effects', 'final cut', 'editor'],
-                'marketing': ['marketing', 'seo', 'ads', 'content', 'digital marketing', 'performance marketing', 'marketing executive'],
-                'android_developer': ['android', 'kotlin', 'flutter', 'java android', 'mobile developer', 'app developer']
-            }
-            
-            keywords = category_keywords.get(category, [])
-            
-            for _, job in df.iterrows():
-                job_title = str(job['Job Title']).lower()
-                skills = str(job['Skills']).lower()
-                
-                if any(keyword in job_title or keyword in skills for keyword in keywords):
-                    filtered_jobs.append({
-                        "id": len(filtered_jobs) + 1,
-                        "title": job['Job Title'],
-                        "company": job['Company Name'],
-                        "location": job['Location'],
-                        "salary": job['Salary'],
-                        "work_from_home": job['Work From Home'] == 'Yes',
-                        "job_link": job['Job Link'],
-                        "skills": job['Skills'].split(', ') if pd.notna(job['Skills']) else [],
-                        "category": category
-                    })
-        
-        elif user_categories:
-            # Filter by user preferences - improved keyword matching
-            for category in user_categories:
-                category_keywords = {
-                    'frontend_developer': ['frontend', 'front end', 'web', 'react', 'javascript', 'html', 'css', 'vue', 'angular', 'ui developer', 'web developer'],
-                    'backend_developer': ['backend', 'back end', 'django', 'flask', 'node', 'server', 'python developer', 'java developer', 'api developer'],
-                    'data_analyst': ['data analyst', 'data', 'analyst', 'sql', 'analytics', 'business analyst', 'quantitative analyst'],
-                    'ai_ml_engineer': ['ai', 'ml', 'machine learning', 'deep learning', 'artificial intelligence', 'ai engineer', 'ml engineer'],
-                    'graphic_designer': ['graphic designer', 'graphic', 'design', 'photoshop', 'illustrator', 'designer', 'visual designer'],
-                    'video_editor': ['video editor', 'video', 'edit', 'premiere', 'after effects', 'final cut', 'editor'],
-                    'marketing': ['marketing', 'seo', 'ads', 'content', 'digital marketing', 'performance marketing', 'marketing executive'],
-                    'android_developer': ['android', 'kotlin', 'flutter', 'java android', 'mobile developer', 'app developer']
-                }
-                
-                keywords = category_keywords.get(category, [])
-                
-                for _, job in df.iterrows():
-                    job_title = str(job['Job Title']).lower()
-                    skills = str(job['Skills']).lower()
-                    
-                    if any(keyword in job_title or keyword in skills for keyword in keywords):
-                        if len(filtered_jobs) < 20:  # Limit to 20 jobs per category
-                            filtered_jobs.append({
-                                "id": len(filtered_jobs) + 1,
-                                "title": job['Job Title'],
-                                "company": job['Company Name'],
-                                "location": job['Location'],
-                                "salary": job['Salary'],
-                                "work_from_home": job['Work From Home'] == 'Yes',
-                                "job_link": job['Job Link'],
-                                "skills": job['Skills'].split(', ') if pd.notna(job['Skills']) else [],
-                                "category": category
-                            })
-        else:
-            # Return general jobs if no preferences set
-            for i, (_, job) in enumerate(df.head(15).iterrows()):
-                filtered_jobs.append({
-                    "id": i + 1,
-                    "title": job['Job Title'],
-                    "company": job['Company Name'],
-                    "location": job['Location'],
-                    "salary": job['Salary'],
-                    "work_from_home": job['Work From Home'] == 'Yes',
-                    "job_link": job['Job Link'],
-                    "skills": job['Skills'].split(', ') if pd.notna(job['Skills']) else [],
-                    "category": "general"
-                })
-        
-        return jsonify({
-            "jobs": filtered_jobs,
-            "user_preferences": user_categories,
-            "total": len(filtered_jobs)
-        })
+        return jsonify(build_jobs_payload(user_categories, category))
         
     except Exception as e:
         print(f"Error fetching jobs: {str(e)}")
@@ -1756,6 +1779,35 @@ def get_jobs():
             "error": str(e)
         }), 500
 
+def build_jobs_payload(user_categories, category=''):
+    """Jobs card payload from the preloaded catalog"""
+    # Filter jobs based on user preferences or category using the preloaded catalog index
+    filtered_jobs = []
+    
+    if category and category in CATEGORY_KEYWORDS:
+        filtered_jobs = job_catalog.jobs_for_category(category)
+    
+    elif user_categories:
+        for category in user_categories:
+            # Limit to 20 jobs across all preferred categories
+            remaining = 20 - len(filtered_jobs)
+            if remaining <= 0:
+                break
+            filtered_jobs.extend(job_catalog.jobs_for_category(
+                category,
+                limit=remaining,
+                start_id=len(filtered_jobs) + 1
+            ))
+    else:
+        # Return general jobs if no preferences set
+        filtered_jobs = job_catalog.head(15)
+    
+    return {
+        "jobs": filtered_jobs,
+        "user_preferences": user_categories,
+        "total": len(filtered_jobs)
+    }
+
 # Recommendations Service
 @app.route('/api/recommendations')
 def get_recommendations():
@@ -1795,264 +1847,94 @@ def get_weather():
     try:
         city = request.args.get('city', 'London')
         
-        # Multiple API keys to try
-        api_keys = [
-            "8ac5c4e57ba6a4b3dfcf622700447b1e",
-            "b8ecb570e8de5b1ea8dcbf7c6fb7c02e", 
-            "46575fbd9144430bb7dce528004ec99e",
-            "3b7b8a9c5d2e1f4a6b8c9d0e1f2a3b4c"
-        ]
-        
-        weather_data = None
-        
-        # Try each API key until one works
-        for api_key in api_keys:
-            try:
-                # Current weather
-                current_url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
-                current_response = requests.get(current_url, timeout=8)
-                
-                if current_response.status_code == 200:
-                    current_data = current_response.json()
-                    
-                    # 5-day forecast
-                    forecast_url = f"https://api.openweathermap.org/data/2.5/forecast?q={city}&appid={api_key}&units=metric"
-                    forecast_response = requests.get(forecast_url, timeout=8)
-                    
-                    forecast_list = []
-                    if forecast_response.status_code == 200:
-                        forecast_data = forecast_response.json()
-                        
-                        # Group forecasts by date to get daily highs/lows
-                        daily_forecasts = {}
-                        for item in forecast_data.get('list', []):
-                            date_str = datetime.fromtimestamp(item['dt']).strftime('%Y-%m-%d')
-                            day_name = datetime.fromtimestamp(item['dt']).strftime('%A')
-                            
-                            if date_str not in daily_forecasts:
-                                daily_forecasts[date_str] = {
-                                    'day': day_name,
-                                    'temps': [],
-                                    'descriptions': [],
-                                    'icons': [],
-                                    'timestamp': item['dt']
-                                }
-                            
-                            daily_forecasts[date_str]['temps'].append(item['main']['temp'])
-                            daily_forecasts[date_str]['descriptions'].append(item['weather'][0]['description'])
-                            daily_forecasts[date_str]['icons'].append(item['weather'][0]['icon'])
-                        
-                        # Convert to forecast list with accurate highs/lows
-                        sorted_dates = sorted(daily_forecasts.keys())
-                        for date_str in sorted_dates[:5]:
-                            day_data = daily_forecasts[date_str]
-                            temps = day_data['temps']
-                            
-                            # Get most common description and icon for the day
-                            most_common_desc = max(set(day_data['descriptions']), key=day_data['descriptions'].count)
-                            most_common_icon = max(set(day_data['icons']), key=day_data['icons'].count)
-                            
-                            forecast_list.append({
-                                "day": day_data['day'],
-                                "high": int(max(temps)),
-                                "low": int(min(temps)),
-                                "description": most_common_desc.title(),
-                                "icon": most_common_icon
-                            })
-                    
-                    # If forecast failed, create realistic forecast based on current weather
-                    if not forecast_list:
-                        base_temp = int(current_data['main']['temp'])
-                        base_desc = current_data['weather'][0]['description']
-                        base_icon = current_data['weather'][0]['icon']
-                        
-                        # Generate more realistic variations
-                        weather_variations = [
-                            {"desc": base_desc, "icon": base_icon, "temp_mod": 0},
-                            {"desc": "Partly cloudy", "icon": "02d", "temp_mod": -2},
-                            {"desc": "Light rain", "icon": "10d", "temp_mod": -4},
-                            {"desc": "Cloudy", "icon": "03d", "temp_mod": -1},
-                            {"desc": "Sunny", "icon": "01d", "temp_mod": 3}
-                        ]
-                        
-                        days = ['Today', 'Tomorrow', 'Wednesday', 'Thursday', 'Friday']
-                        for i, day in enumerate(days):
-                            variation = weather_variations[i % len(weather_variations)]
-                            high_temp = base_temp + variation['temp_mod'] + (i - 2)
-                            low_temp = high_temp - 8
-                            
-                            forecast_list.append({
-                                "day": day,
-                                "high": max(high_temp, low_temp + 5),  # Ensure high > low
-                                "low": low_temp,
-                                "description": variation['desc'].title(),
-                                "icon": variation['icon']
-                            })
-                    
-                    weather_data = {
-                        "city": current_data['name'],
-                        "country": current_data['sys']['country'],
-                        "temperature": int(current_data['main']['temp']),
-                        "feels_like": int(current_data['main']['feels_like']),
-                        "description": current_data['weather'][0]['description'].title(),
-                        "humidity": current_data['main']['humidity'],
-                        "wind_speed": int(current_data['wind']['speed'] * 3.6),
-                        "pressure": current_data['main']['pressure'],
-                        "visibility": current_data.get('visibility', 10000) // 1000,
-                        "icon": current_data['weather'][0]['icon'],
-                        "forecast": forecast_list,
-                        "is_mock": False,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    break
-                    
-            except Exception as e:
-                continue
-        
-        # If all APIs failed, try alternative weather service
-        if not weather_data:
-            try:
-                # Try wttr.in as backup
-                wttr_url = f"https://wttr.in/{city}?format=j1"
-                wttr_response = requests.get(wttr_url, timeout=5)
-                
-                if wttr_response.status_code == 200:
-                    wttr_data = wttr_response.json()
-                    current = wttr_data['current_condition'][0]
-                    
-                    weather_data = {
-                        "city": city.title(),
-                        "country": "",
-                        "temperature": int(current['temp_C']),
-                        "feels_like": int(current['FeelsLikeC']),
-                        "description": current['weatherDesc'][0]['value'],
-                        "humidity": int(current['humidity']),
-                        "wind_speed": int(float(current['windspeedKmph'])),
-                        "pressure": int(current['pressure']),
-                        "visibility": int(current['visibility']),
-                        "icon": "01d",  # Default icon
-                        "forecast": [
-                            {
-                                "day": "Today",
-                                "high": int(wttr_data['weather'][0]['maxtempC']),
-                                "low": int(wttr_data['weather'][0]['mintempC']),
-                                "description": wttr_data['weather'][0]['hourly'][0]['weatherDesc'][0]['value'],
-                                "icon": "01d"
-                            },
-                            {
-                                "day": "Tomorrow",
-                                "high": int(wttr_data['weather'][1]['maxtempC']) if len(wttr_data['weather']) > 1 else int(wttr_data['weather'][0]['maxtempC']) - 2,
-                                "low": int(wttr_data['weather'][1]['mintempC']) if len(wttr_data['weather']) > 1 else int(wttr_data['weather'][0]['mintempC']) - 3,
-                                "description": wttr_data['weather'][1]['hourly'][0]['weatherDesc'][0]['value'] if len(wttr_data['weather']) > 1 else "Partly Cloudy",
-                                "icon": "02d"
-                            },
-                            {
-                                "day": "Wednesday",
-                                "high": int(wttr_data['weather'][2]['maxtempC']) if len(wttr_data['weather']) > 2 else int(wttr_data['weather'][0]['maxtempC']) + 1,
-                                "low": int(wttr_data['weather'][2]['mintempC']) if len(wttr_data['weather']) > 2 else int(wttr_data['weather'][0]['mintempC']) - 1,
-                                "description": wttr_data['weather'][2]['hourly'][0]['weatherDesc'][0]['value'] if len(wttr_data['weather']) > 2 else "Light Rain",
-                                "icon": "10d"
-                            },
-                            {
-                                "day": "Thursday",
-                                "high": int(wttr_data['weather'][0]['maxtempC']) + 3,
-                                "low": int(wttr_data['weather'][0]['mintempC']) + 1,
-                                "description": "Sunny",
-                                "icon": "01d"
-                            },
-                            {
-                                "day": "Friday",
-                                "high": int(wttr_data['weather'][0]['maxtempC']) - 1,
-                                "low": int(wttr_data['weather'][0]['mintempC']) - 2,
-                                "description": "Cloudy",
-                                "icon": "03d"
-                            }
-                        ],
-                        "is_mock": False,
-                        "timestamp": datetime.now().isoformat()
-                    }
-            except:
-                pass
-        
-        # Final fallback to mock data
-        if not weather_data:
-            weather_data = {
-                "city": city.title(),
-                "country": "",
-                "temperature": 22,
-                "feels_like": 25,
-                "description": "Partly Cloudy",
-                "humidity": 65,
-                "wind_speed": 12,
-                "pressure": 1013,
-                "visibility": 10,
-                "icon": "02d",
-                "forecast": [
-                    {"day": "Today", "high": 24, "low": 18, "description": "Partly Cloudy", "icon": "02d"},
-                    {"day": "Tomorrow", "high": 26, "low": 20, "description": "Sunny", "icon": "01d"},
-                    {"day": "Wednesday", "high": 23, "low": 17, "description": "Light Rain", "icon": "10d"},
-                    {"day": "Thursday", "high": 25, "low": 19, "description": "Cloudy", "icon": "03d"},
-                    {"day": "Friday", "high": 27, "low": 21, "description": "Sunny", "icon": "01d"}
-                ],
-                "is_mock": True,
-                "timestamp": datetime.now().isoformat()
-            }
+        return jsonify(build_weather_payload(city)), 200
         
-        return jsonify(weather_data), 200
+    except CityNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': f'Weather service unavailable: {str(e)}'}), 500
+
+@app.route('/api/weather/batch')
+@jwt_required()
+def get_weather_batch():
+    """Weather for several cities in one call: /api/weather/batch?city=London&city=Paris,FR"""
+    try:
+        cities = [city.strip() for city in request.args.getlist('city') if city.strip()]
+        if not cities:
+            return jsonify({'error': 'At least one city is required'}), 400
+        if len(cities) > WEATHER_MAX_BATCH_CITIES:
+            return jsonify({'error': f'At most {WEATHER_MAX_BATCH_CITIES} cities per request'}), 400
+        
+        results = [
+            {"query": city, "weather": payload} if payload is not None
+            else {"query": city, "weather": None, "error": f"City not found: {city}"}
+            for city, payload in weather_service.get_many(cities)
+        ]
+        return jsonify({"results": results, "count": len(results)}), 200
         
     except Exception as e:
         return jsonify({'error': f'Weather service unavailable: {str(e)}'}), 500
 
+def build_weather_payload(city):
+    """Weather card payload: current conditions plus a 5-day forecast"""
+    return weather_service.get_weather(city)
+
 # Crypto API endpoints
 @app.route('/api/crypto')
 @jwt_required()
 def get_crypto():
     try:
-        # CoinGecko API (free, no API key required)
-        url = "https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=20&page=1&sparkline=false&price_change_percentage=24h"
-        
-        response = requests.get(url)
+        return jsonify(build_crypto_payload()), 200
         
-        if response.status_code == 200:
-            crypto_data = response.json()
-            
-            # Format the data
-            formatted_data = []
-            for coin in crypto_data:
-                formatted_data.append({
-                    "id": coin['id'],
-                    "name": coin['name'],
-                    "symbol": coin['symbol'].upper(),
-                    "price": coin['current_price'],
-                    "change_24h": coin['price_change_percentage_24h'],
-                    "market_cap": coin['market_cap'],
-                    "volume": coin['total_volume'],
-                    "image": coin['image'],
-                    "rank": coin['market_cap_rank']
-                })
-            
-            return jsonify({
-                "cryptocurrencies": formatted_data,
-                "count": len(formatted_data),
-                "last_updated": datetime.utcnow().isoformat()
-            }), 200
-        else:
-            # Return mock data if API fails
-            mock_crypto = {
-                "cryptocurrencies": [
-                    {"id": "bitcoin", "name": "Bitcoin", "symbol": "BTC", "price": 43250.50, "change_24h": 2.34, "market_cap": 850000000000, "volume": 25000000000, "rank": 1},
-                    {"id": "ethereum", "name": "Ethereum", "symbol": "ETH", "price": 2650.75, "change_24h": -1.23, "market_cap": 320000000000, "volume": 15000000000, "rank": 2},
-                    {"id": "binancecoin", "name": "BNB", "symbol": "BNB", "price": 315.20, "change_24h": 0.89, "market_cap": 48000000000, "volume": 1200000000, "rank": 3}
-                ],
-                "count": 3,
-                "last_updated": datetime.utcnow().isoformat(),
-                "is_mock": True
-            }
-            return jsonify(mock_crypto), 200
-            
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def build_crypto_payload():
+    """Crypto card payload: top coins by market cap"""
+    try:
+        response = response_cache.get('coingecko', COINGECKO_MARKETS_URL, timeout=10)
+    except Exception as e:
+        # Unreachable or circuit open: serve the mock data below
+        print(f"Error fetching crypto data: {e}")
+        response = None
+    
+    if response is not None and response.status_code == 200:
+        crypto_data = response.json()
+        
+        # Format the data
+        formatted_data = []
+        for coin in crypto_data:
+            formatted_data.append({
+                "id": coin['id'],
+                "name": coin['name'],
+                "symbol": coin['symbol'].upper(),
+                "price": coin['current_price'],
+                "change_24h": coin['price_change_percentage_24h'],
+                "market_cap": coin['market_cap'],
+                "volume": coin['total_volume'],
+                "image": coin['image'],
+                "rank": coin['market_cap_rank']
+            })
+        
+        return {
+            "cryptocurrencies": formatted_data,
+            "count": len(formatted_data),
+            "last_updated": datetime.utcnow().isoformat()
+        }
+    else:
+        # Return mock data if API fails
+        mock_crypto = {
+            "cryptocurrencies": [
+                {"id": "bitcoin", "name": "Bitcoin", "symbol": "BTC", "price": 43250.50, "change_24h": 2.34, "market_cap": 850000000000, "volume": 25000000000, "rank": 1},
+                {"id": "ethereum", "name": "Ethereum", "symbol": "ETH", "price": 2650.75, "change_24h": -1.23, "market_cap": 320000000000, "volume": 15000000000, "rank": 2},
+                {"id": "binancecoin", "name": "BNB", "symbol": "BNB", "price": 315.20, "change_24h": 0.89, "market_cap": 48000000000, "volume": 1200000000, "rank": 3}
+            ],
+            "count": 3,
+            "last_updated": datetime.utcnow().isoformat(),
+            "is_mock": True
+        }
+        return mock_crypto
+
 # Recipe API endpoints - Rebuilt from scratch
 @app.route('/api/recipes')
 @jwt_required()
@@ -2061,237 +1943,304 @@ def get_recipes():
         current_user = get_current_user()
         
         # Get user's food preferences
-        food_prefs = UserPreference.find_by_user_and_category(current_user.get_id(), 'food')
+        food_prefs = get_user_preference('food')
         user_cuisines = food_prefs.preferences.get('cuisines', ['italian', 'american']) if food_prefs else ['italian', 'american']
         user_dietary = food_prefs.preferences.get('dietary', []) if food_prefs else []
         
         query = request.args.get('query', '')
         
-        # Check if user is vegetarian/vegan
-        is_vegetarian = any(diet.lower() in ['vegetarian', 'vegan', 'plant-based'] for diet in user_dietary)
-        
-        recipes = []
+        return jsonify(build_recipes_payload(user_cuisines, user_dietary, query)), 200
         
-        try:
-            # Strategy 1: Search based on user's preferred cuisines first
-            if not query.strip():
-                # Load recipes matching user's cuisine preferences
-                for cuisine in user_cuisines[:3]:  # Try top 3 cuisines
-                    if len(recipes) >= 8:
-                        break
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def build_recipes_payload(user_cuisines, user_dietary, query=''):
+    """Recipes card payload matching a user's cuisines and dietary needs"""
+    # Check if user is vegetarian/vegan
+    is_vegetarian = any(diet.lower() in ['vegetarian', 'vegan', 'plant-based'] for diet in user_dietary)
+    
+    recipes = []
+    
+    try:
+        # Strategy 1: Search based on user's preferred cuisines first
+        if not query.strip():
+            # Load recipes matching user's cuisine preferences
+            for cuisine in user_cuisines[:3]:  # Try top 3 cuisines
+                if len(recipes) >= 8:
+                    break
+                
+                mapped_cuisine = area_for_cuisine(cuisine)
+                
+                try:
+                    # Answer from the local recipe store with a single indexed read, once a
+                    # refresh has stored the whole area; a partial area would cut the list short
+                    candidate_meals = []
+                    if recipe_store.is_area_complete(mapped_cuisine):
+                        candidate_meals = recipe_store.find_by_area(mapped_cuisine)
+                    from_store = bool(candidate_meals)
                     
-                    cuisine_mapping = {
-                        'italian': 'Italian',
-                        'chinese': 'Chinese', 
-                        'indian': 'Indian',
-                        'mexican': 'Mexican',
-                        'french': 'French',
-                        'american': 'American',
-                        'british': 'British',
-                        'thai': 'Thai',
-                        'japanese': 'Japanese'
-                    }
+                    if not from_store:
+                        # Store miss: list the area upstream, then look each meal up (store first)
+                        cuisine_url = f"https://www.themealdb.com/api/json/v1/1/filter.php?a={mapped_cuisine}"
+                        response = response_cache.get('themealdb', cuisine_url, timeout=8)
+                        if response.status_code != 200:
+                            continue
+                        candidate_meals = response.json().get('meals') or []
                     
-                    mapped_cuisine = cuisine_mapping.get(cuisine.lower(), cuisine.title())
+                    if from_store:
+                        detailed_meals = candidate_meals
+                    else:
+                        # Get detailed recipe info for every candidate in one concurrent batch
+                        detailed_meals = recipe_store.iter_lookup_many(
+                            [meal['idMeal'] for meal in candidate_meals]
+                        )
                     
-                    try:
-                        # Search by cuisine area first, then filter by diet
-                        cuisine_url = f"https://www.themealdb.com/api/json/v1/1/filter.php?a={mapped_cuisine}"
-                        response = requests.get(cuisine_url, timeout=8)
+                    cuisine_recipes_added = 0
+                    for detailed_meal in detailed_meals:
+                        if len(recipes) >= 8 or cuisine_recipes_added >= 3:
+                            break
                         
-                        if response.status_code == 200:
-                            data = response.json()
-                            if data.get('meals'):
-                                cuisine_recipes_added = 0
-                                for meal in data['meals']:
-                                    if len(recipes) >= 8 or cuisine_recipes_added >= 3:
-                                        break
-                                    
-                                    # Get detailed recipe info
-                                    detail_url = f"https://www.themealdb.com/api/json/v1/1/lookup.php?i={meal['idMeal']}"
-                                    detail_response = requests.get(detail_url, timeout=5)
-                                    
-                                    if detail_response.status_code == 200:
-                                        detail_data = detail_response.json()
-                                        if detail_data.get('meals'):
-                                            detailed_meal = detail_data['meals'][0]
-                                            
-                                            # Skip if already added
-                                            if any(r['id'] == detailed_meal['idMeal'] for r in recipes):
-                                                continue
-                                            
-                                            # Verify cuisine matches
-                                            meal_area = detailed_meal.get('strArea', '').lower()
-                                            if meal_area != cuisine.lower():
-                                                continue
-                                            
-                                            # Filter for vegetarian users
-                                            meal_name = detailed_meal.get('strMeal', '').lower()
-                                            meal_category = detailed_meal.get('strCategory', '').lower()
-                                            
-                                            if is_vegetarian:
-                                                meat_keywords = ['chicken', 'beef', 'pork', 'lamb', 'fish', 'seafood', 'meat', 'turkey', 'duck', 'bacon']
-                                                if any(keyword in meal_name or keyword in meal_category for keyword in meat_keywords):
-                                                    continue
-                                            
-                                            recipes.append(format_recipe(detailed_meal, user_dietary, is_vegetarian))
-                                            cuisine_recipes_added += 1
-                    except:
-                        continue
-            
-            # Strategy 2: Search by query if provided
-            if query.strip():
-                search_url = f"https://www.themealdb.com/api/json/v1/1/search.php?s={query}"
-                try:
-                    response = requests.get(search_url, timeout=8)
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data.get('meals'):
-                            for meal in data['meals'][:6]:
-                                if len(recipes) >= 8:
-                                    break
-                                
-                                # Skip if already added
-                                if any(r['id'] == meal['idMeal'] for r in recipes):
-                                    continue
-                                
-                                # Filter for vegetarian users
-                                meal_name = meal.get('strMeal', '').lower()
-                                meal_category = meal.get('strCategory', '').lower()
-                                
-                                if is_vegetarian:
-                                    meat_keywords = ['chicken', 'beef', 'pork', 'lamb', 'fish', 'seafood', 'meat', 'turkey', 'duck', 'bacon']
-                                    if any(keyword in meal_name or keyword in meal_category for keyword in meat_keywords):
-                                        continue
-                                
-                                recipes.append(format_recipe(meal, user_dietary, is_vegetarian))
-                        else:
-                            # No recipes found for search query
-                            return jsonify({
-                                "recipes": [],
-                                "query": query,
-                                "user_preferences": {"cuisines": user_cuisines, "dietary": user_dietary},
-                                "count": 0,
-                                "is_mock": False,
-                                "no_results": True,
-                                "message": f"No recipes found for '{query}'. Try searching for something else!"
-                            }), 200
+                        if not detailed_meal:
+                            continue
+                        
+                        # Skip if already added
+                        if any(r['id'] == detailed_meal['idMeal'] for r in recipes):
+                            continue
+                        
+                        # Verify cuisine matches
+                        meal_area = (detailed_meal.get('strArea') or '').lower()
+                        if meal_area != cuisine.lower():
+                            continue
+                        
+                        # Filter for vegetarian users
+                        meal_name = (detailed_meal.get('strMeal') or '').lower()
+                        meal_category = (detailed_meal.get('strCategory') or '').lower()
+                        
+                        if is_vegetarian:
+                            meat_keywords = ['chicken', 'beef', 'pork', 'lamb', 'fish', 'seafood', 'meat', 'turkey', 'duck', 'bacon']
+                            if any(keyword in meal_name or keyword in meal_category for keyword in meat_keywords):
+                                continue
+                        
+                        recipes.append(format_recipe(detailed_meal, user_dietary, is_vegetarian))
+                        cuisine_recipes_added += 1
+                    
+                    if not from_store:
+                        # Stop lookups for candidates we no longer need
+                        detailed_meals.close()
                 except:
-                    pass
-            
-            # If we have recipes, return them
-            if recipes:
-                return jsonify({
-                    "recipes": recipes[:8],  # Limit to 8 recipes
-                    "query": query,
-                    "user_preferences": {"cuisines": user_cuisines, "dietary": user_dietary},
-                    "count": len(recipes[:8]),
-                    "is_mock": False
-                }), 200
-            else:
-                raise Exception("No recipes found")
-                
-        except Exception as e:
-            # Enhanced fallback with more diverse and realistic mock data
-            import random
-            
-            # Create diverse recipe variations based on user preferences and query
-            recipe_templates = []
-            
-            if is_vegetarian:
-                recipe_templates = [
-                    {
-                        "title": f"Vegetarian {query.title()} Curry",
-                        "image": "https://images.unsplash.com/photo-1565299624946-b28f40a0ca4b?w=300&h=200&fit=crop",
-                        "ingredients": ["2 cups mixed vegetables", "1 can coconut milk", "2 tbsp curry powder", "1 onion diced", "3 cloves garlic", "1 inch ginger", "2 tbsp oil", "Salt to taste", "Fresh cilantro", "Basmati rice"],
-                        "instructions": "1. Heat oil in a large pan over medium heat. 2. Add onion, garlic, and ginger, cook until fragrant. 3. Add curry powder and cook for 1 minute. 4. Add vegetables and cook for 5 minutes. 5. Pour in coconut milk and simmer for 15 minutes. 6. Season with salt and garnish with cilantro. 7. Serve over basmati rice.",
-                        "time": 35,
-                        "cuisine": "Indian"
-                    },
-                    {
-                        "title": f"Mediterranean {query.title()} Bowl",
-                        "image": "https://images.unsplash.com/photo-1546069901-ba9599a7e63c?w=300&h=200&fit=crop",
-                        "ingredients": ["1 cup quinoa", "1 cucumber diced", "2 tomatoes chopped", "1/2 red onion", "1/4 cup olives", "1/4 cup feta cheese", "3 tbsp olive oil", "2 tbsp lemon juice", "1 tsp oregano", "Fresh parsley"],
-                        "instructions": "1. Cook quinoa according to package instructions and let cool. 2. Dice cucumber, tomatoes, and red onion. 3. In a large bowl, combine quinoa with vegetables. 4. Add olives and feta cheese. 5. Whisk together olive oil, lemon juice, and oregano. 6. Pour dressing over salad and toss. 7. Garnish with fresh parsley.",
-                        "time": 25,
-                        "cuisine": "Mediterranean"
-                    },
-                    {
-                        "title": f"Asian {query.title()} Stir-fry",
-                        "image": "https://images.unsplash.com/photo-1567620905732-2d1ec7ab7445?w=300&h=200&fit=crop",
-                        "ingredients": ["200g tofu cubed", "2 cups mixed stir-fry vegetables", "3 tbsp soy sauce", "2 tbsp sesame oil", "1 tbsp rice vinegar", "2 cloves garlic minced", "1 tsp ginger grated", "2 green onions", "1 tbsp sesame seeds", "Cooked rice"],
-                        "instructions": "1. Press tofu to remove excess water, then cube. 2. Heat sesame oil in a wok over high heat. 3. Add tofu and cook until golden, about 5 minutes. 4. Add garlic and ginger, cook for 30 seconds. 5. Add vegetables and stir-fry for 3-4 minutes. 6. Mix soy sauce and rice vinegar, pour over stir-fry. 7. Garnish with green onions and sesame seeds. 8. Serve over rice.",
-                        "time": 20,
-                        "cuisine": "Asian"
-                    }
-                ]
-            else:
-                recipe_templates = [
-                    {
-                        "title": f"Grilled {query.title()} with Herbs",
-                        "image": "https://images.unsplash.com/photo-1565299624946-b28f40a0ca4b?w=300&h=200&fit=crop",
-                        "ingredients": ["4 chicken breasts", "3 tbsp olive oil", "2 tbsp fresh rosemary", "3 cloves garlic minced", "1 lemon juiced", "Salt and pepper", "2 cups roasted vegetables", "1 lb baby potatoes"],
-                        "instructions": "1. Marinate chicken in olive oil, rosemary, garlic, and lemon juice for 30 minutes. 2. Preheat grill to medium-high heat. 3. Season chicken with salt and pepper. 4. Grill chicken for 6-7 minutes per side until cooked through. 5. Meanwhile, roast vegetables and potatoes at 400°F for 25 minutes. 6. Let chicken rest for 5 minutes before serving. 7. Serve with roasted vegetables and potatoes.",
-                        "time": 45,
-                        "cuisine": "American"
-                    },
-                    {
-                        "title": f"Spicy {query.title()} Pasta",
-                        "image": "https://images.unsplash.com/photo-1546069901-ba9599a7e63c?w=300&h=200&fit=crop",
-                        "ingredients": ["400g pasta", "500g ground beef", "1 onion diced", "4 cloves garlic", "1 can crushed tomatoes", "2 tbsp tomato paste", "1 tsp red pepper flakes", "1 tsp oregano", "1/2 cup red wine", "Parmesan cheese", "Fresh basil"],
-                        "instructions": "1. Cook pasta according to package directions. 2. In a large pan, brown ground beef over medium-high heat. 3. Add onion and garlic, cook until softened. 4. Add tomato paste and cook for 1 minute. 5. Add crushed tomatoes, red wine, red pepper flakes, and oregano. 6. Simmer for 20 minutes until sauce thickens. 7. Toss with cooked pasta. 8. Serve with Parmesan and fresh basil.",
-                        "time": 35,
-                        "cuisine": "Italian"
-                    },
-                    {
-                        "title": f"Pan-seared {query.title()} with Sauce",
-                        "image": "https://images.unsplash.com/photo-1567620905732-2d1ec7ab7445?w=300&h=200&fit=crop",
-                        "ingredients": ["4 salmon fillets", "2 tbsp butter", "1 lemon", "2 tbsp capers", "1/4 cup white wine", "2 tbsp fresh dill", "1 lb asparagus", "Salt and pepper", "Olive oil"],
-                        "instructions": "1. Season salmon fillets with salt and pepper. 2. Heat olive oil in a large skillet over medium-high heat. 3. Cook salmon skin-side up for 4 minutes, then flip and cook 3 more minutes. 4. Remove salmon and set aside. 5. Add butter, lemon juice, capers, and wine to pan. 6. Cook until sauce reduces slightly. 7. Meanwhile, roast asparagus with olive oil at 425°F for 12 minutes. 8. Serve salmon with sauce and asparagus, garnished with dill.",
-                        "time": 25,
-                        "cuisine": "French"
-                    }
-                ]
-            
-            # Select random recipes and customize them
-            selected_templates = random.sample(recipe_templates, min(3, len(recipe_templates)))
-            mock_recipes_list = []
-            
-            for i, template in enumerate(selected_templates):
-                # Calculate nutrition based on ingredients
-                protein_count = len([ing for ing in template['ingredients'] if any(p in ing.lower() for p in ['chicken', 'beef', 'salmon', 'tofu', 'cheese', 'egg'])])
-                carb_count = len([ing for ing in template['ingredients'] if any(c in ing.lower() for c in ['pasta', 'rice', 'potato', 'quinoa', 'bread'])])
-                
-                mock_recipes_list.append({
-                    "id": f"mock_{i+1}",
-                    "title": template['title'],
-                    "image": template['image'],
-                    "ready_in_minutes": template['time'],
-                    "servings": 4,
-                    "cuisine": [template['cuisine']],
-                    "dietary": user_dietary[:2] if user_dietary else (['Vegetarian'] if is_vegetarian else []),
-                    "ingredients": template['ingredients'],
-                    "instructions": template['instructions'],
-                    "source_url": "",
-                    "nutrition": {
-                        "calories": 300 + (protein_count * 50) + (carb_count * 30),
-                        "protein": f"{15 + (protein_count * 10)}g",
-                        "carbs": f"{30 + (carb_count * 15)}g",
-                        "fat": f"{12 + (protein_count * 3)}g"
-                    }
-                })
-            
-            mock_recipes = {
-                "recipes": mock_recipes_list,
+                    continue
+        
+        # Strategy 2: Search by query if provided
+        if query.strip():
+            search_url = f"https://www.themealdb.com/api/json/v1/1/search.php?s={query}"
+            try:
+                response = response_cache.get('themealdb', search_url, timeout=8)
+                if response.status_code == 200:
+                    data = response.json()
+                    if data.get('meals'):
+                        for meal in data['meals'][:6]:
+                            if len(recipes) >= 8:
+                                break
+                            
+                            # Skip if already added
+                            if any(r['id'] == meal['idMeal'] for r in recipes):
+                                continue
+                            
+                            # Filter for vegetarian users
+                            meal_name = meal.get('strMeal', '').lower()
+                            meal_category = meal.get('strCategory', '').lower()
+                            
+                            if is_vegetarian:
+                                meat_keywords = ['chicken', 'beef', 'pork', 'lamb', 'fish', 'seafood', 'meat', 'turkey', 'duck', 'bacon']
+                                if any(keyword in meal_name or keyword in meal_category for keyword in meat_keywords):
+                                    continue
+                            
+                            recipes.append(format_recipe(meal, user_dietary, is_vegetarian))
+                    else:
+                        # No recipes found for search query
+                        return {
+                            "recipes": [],
+                            "query": query,
+                            "user_preferences": {"cuisines": user_cuisines, "dietary": user_dietary},
+                            "count": 0,
+                            "is_mock": False,
+                            "no_results": True,
+                            "message": f"No recipes found for '{query}'. Try searching for something else!"
+                        }
+            except:
+                pass
+        
+        # If we have recipes, return them
+        if recipes:
+            return {
+                "recipes": recipes[:8],  # Limit to 8 recipes
                 "query": query,
                 "user_preferences": {"cuisines": user_cuisines, "dietary": user_dietary},
-                "count": len(mock_recipes_list),
-                "is_mock": True
+                "count": len(recipes[:8]),
+                "is_mock": False
             }
-            return jsonify(mock_recipes), 200
+        else:
+            raise Exception("No recipes found")
             
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        # Enhanced fallback with more diverse and realistic mock data
+        import random
+        
+        # Create diverse recipe variations based on user preferences and query
+        recipe_templates = []
+        
+        if is_vegetarian:
+            recipe_templates = [
+                {
+                    "title": f"Vegetarian {query.title()} Curry",
+                    "image": "https://images.unsplash.com/photo-1565299624946-b28f40a0ca4b?w=300&h=200&fit=crop",
+                    "ingredients": ["2 cups mixed vegetables", "1 can coconut milk", "2 tbsp curry powder", "1 onion diced", "3 cloves garlic", "1 inch ginger", "2 tbsp oil", "Salt to taste", "Fresh cilantro", "Basmati rice"],
+                    "instructions": "1. Heat oil in a large pan over medium heat. 2. Add onion, garlic, and ginger, cook until fragrant. 3. Add curry powder and cook for 1 minute. 4. Add vegetables and cook for 5 minutes. 5. Pour in coconut milk and simmer for 15 minutes. 6. Season with salt and garnish with cilantro. 7. Serve over basmati rice.",
+                    "time": 35,
+                    "cuisine": "Indian"
+                },
+                {
+                    "title": f"Mediterranean {query.title()} Bowl",
+                    "image": "https://images.unsplash.com/photo-1546069901-ba9599a7e63c?w=300&h=200&fit=crop",
+                    "ingredients": ["1 cup quinoa", "1 cucumber diced", "2 tomatoes chopped", "1/2 red onion", "1/4 cup olives", "1/4 cup feta cheese", "3 tbsp olive oil", "2 tbsp lemon juice", "1 tsp oregano", "Fresh parsley"],
+                    "instructions": "1. Cook quinoa according to package instructions and let cool. 2. Dice cucumber, tomatoes, and red onion. 3. In a large bowl, combine quinoa with vegetables. 4. Add olives and feta cheese. 5. Whisk together olive oil, lemon juice, and oregano. 6. Pour dressing over salad and toss. 7. Garnish with fresh parsley.",
+                    "time": 25,
+                    "cuisine": "Mediterranean"
+                },
+                {
+                    "title": f"Asian {query.title()} Stir-fry",
+                    "image": "https://images.unsplash.com/photo-1567620905732-2d1ec7ab7445?w=300&h=200&fit=crop",
+                    "ingredients": ["200g tofu cubed", "2 cups mixed stir-fry vegetables", "3 tbsp soy sauce", "2 tbsp sesame oil", "1 tbsp rice vinegar", "2 cloves garlic minced", "1 tsp ginger grated", "2 green onions", "1 tbsp sesame seeds", "Cooked rice"],
+                    "instructions": "1. Press tofu to remove excess water, then cube. 2. Heat sesame oil in a wok over high heat. 3. Add tofu and cook until golden, about 5 minutes. 4. Add garlic and ginger, cook for 30 seconds. 5. Add vegetables and stir-fry for 3-4 minutes. 6. Mix soy sauce and rice vinegar, pour over stir-fry. 7. Garnish with green onions and sesame seeds. 8. Serve over rice.",
+                    "time": 20,
+                    "cuisine": "Asian"
+                }
+            ]
+        else:
+            recipe_templates = [
+                {
+                    "title": f"Grilled {query.title()} with Herbs",
+                    "image": "https://images.unsplash.com/photo-1565299624946-b28f40a0ca4b?w=300&h=200&fit=crop",
+                    "ingredients": ["4 chicken breasts", "3 tbsp olive oil", "2 tbsp fresh rosemary", "3 cloves garlic minced", "1 lemon juiced", "Salt and pepper", "2 cups roasted vegetables", "1 lb baby potatoes"],
+                    "instructions": "1. Marinate chicken in olive oil, rosemary, garlic, and lemon juice for 30 minutes. 2. Preheat grill to medium-high heat. 3. Season chicken with salt and pepper. 4. Grill chicken for 6-7 minutes per side until cooked through. 5. Meanwhile, roast vegetables and potatoes at 400°F for 25 minutes. 6. Let chicken rest for 5 minutes before serving. 7. Serve with roasted vegetables and potatoes.",
+                    "time": 45,
+                    "cuisine": "American"
+                },
+                {
+                    "title": f"Spicy {query.title()} Pasta",
+                    "image": "https://images.unsplash.com/photo-1546069901-ba9599a7e63c?w=300&h=200&fit=crop",
+                    "ingredients": ["400g pasta", "500g ground beef", "1 onion diced", "4 cloves garlic", "1 can crushed tomatoes", "2 tbsp tomato paste", "1 tsp red pepper flakes", "1 tsp oregano", "1/2 cup red wine", "Parmesan cheese", "Fresh basil"],
+                    "instructions": "1. Cook pasta according to package directions. 2. In a large pan, brown ground beef over medium-high heat. 3. Add onion and garlic, cook until softened. 4. Add tomato paste and cook for 1 minute. 5. Add crushed tomatoes, red wine, red pepper flakes, and oregano. 6. Simmer for 20 minutes until sauce thickens. 7. Toss with cooked pasta. 8. Serve with Parmesan and fresh basil.",
+                    "time": 35,
+                    "cuisine": "Italian"
+                },
+                {
+                    "title": f"Pan-seared {query.title()} with Sauce",
+                    "image": "https://images.unsplash.com/photo-1567620905732-2d1ec7ab7445?w=300&h=200&fit=crop",
+                    "ingredients": ["4 salmon fillets", "2 tbsp butter", "1 lemon", "2 tbsp capers", "1/4 cup white wine", "2 tbsp fresh dill", "1 lb asparagus", "Salt and pepper", "Olive oil"],
+                    "instructions": "1. Season salmon fillets with salt and pepper. 2. Heat olive oil in a large skillet over medium-high heat. 3. Cook salmon skin-side up for 4 minutes, then flip and cook 3 more minutes. 4. Remove salmon and set aside. 5. Add butter, lemon juice, capers, and wine to pan. 6. Cook until sauce reduces slightly. 7. Meanwhile, roast asparagus with olive oil at 425°F for 12 minutes. 8. Serve salmon with sauce and asparagus, garnished with dill.",
+                    "time": 25,
+                    "cuisine": "French"
+                }
+            ]
+        
+        # Select random recipes and customize them
+        selected_templates = random.sample(recipe_templates, min(3, len(recipe_templates)))
+        mock_recipes_list = []
+        
+        for i, template in enumerate(selected_templates):
+            # Calculate nutrition based on ingredients
+            protein_count = len([ing for ing in template['ingredients'] if any(p in ing.lower() for p in ['chicken', 'beef', 'salmon', 'tofu', 'cheese', 'egg'])])
+            carb_count = len([ing for ing in template['ingredients'] if any(c in ing.lower() for c in ['pasta', 'rice', 'potato', 'quinoa', 'bread'])])
+            
+            mock_recipes_list.append({
+                "id": f"mock_{i+1}",
+                "title": template['title'],
+                "image": template['image'],
+                "ready_in_minutes": template['time'],
+                "servings": 4,
+                "cuisine": [template['cuisine']],
+                "dietary": user_dietary[:2] if user_dietary else (['Vegetarian'] if is_vegetarian else []),
+                "ingredients": template['ingredients'],
+                "instructions": template['instructions'],
+                "source_url": "",
+                "nutrition": {
+                    "calories": 300 + (protein_count * 50) + (carb_count * 30),
+                    "protein": f"{15 + (protein_count * 10)}g",
+                    "carbs": f"{30 + (carb_count * 15)}g",
+                    "fat": f"{12 + (protein_count * 3)}g"
+                }
+            })
+        
+        mock_recipes = {
+            "recipes": mock_recipes_list,
+            "query": query,
+            "user_preferences": {"cuisines": user_cuisines, "dietary": user_dietary},
+            "count": len(mock_recipes_list),
+            "is_mock": True
+        }
+        return mock_recipes
+
+# Aggregated dashboard endpoint
+DASHBOARD_SECTIONS = ['news', 'videos', 'reddit', 'weather', 'crypto', 'recipes', 'jobs']
+
+@app.route('/api/dashboard')
+@jwt_required()
+def get_dashboard():
+    """Compose every dashboard card in one request, with per-section status"""
+    current_user = get_current_user()
+    if not current_user:
+        return jsonify({'message': 'User not found'}), 404
+    
+    # Resolve all of the user's preferences with a single read
+    prefs = {category: pref.preferences for category, pref in get_user_preferences().items()}
+    news_categories = prefs.get('news', {}).get('categories', ['general'])
+    reddit_categories = prefs.get('news', {}).get('categories', ['technology'])
+    video_categories = prefs.get('youtube', {}).get('categories', ['trending'])
+    user_cuisines = prefs.get('food', {}).get('cuisines', ['italian', 'american'])
+    user_dietary = prefs.get('food', {}).get('dietary', [])
+    job_categories = prefs.get('jobs', {}).get('categories', [])
+    
+    def jobs_producer():
+        if not job_catalog.available():
+            raise Exception("Jobs data file not found")
+        return build_jobs_payload(job_categories)
+    
+    # Request args are read here; producers run on worker threads outside the request context
+    city = request.args.get('city', 'London')
+    producers = {
+        'news': lambda: build_news_payload(news_categories),
+        'videos': lambda: build_videos_payload(video_categories[0] if video_categories else 'trending', video_categories),
+        'reddit': lambda: build_reddit_payload(reddit_categories[0] if reddit_categories else 'technology', reddit_categories),
+        'weather': lambda: build_weather_payload(city),
+        'crypto': build_crypto_payload,
+        'recipes': lambda: build_recipes_payload(user_cuisines, user_dietary),
+        'jobs': jobs_producer
+    }
+    
+    requested = request.args.get('sections')
+    section_names = [name.strip() for name in requested.split(',')] if requested else DASHBOARD_SECTIONS
+    section_names = [name for name in section_names if name in producers]
+    
+    results = dashboard_fanout.fan_out(
+        [(name, producers[name]) for name in section_names],
+        timeout=DASHBOARD_DEADLINE
+    )
+    
+    sections = {}
+    for result in results:
+        if result.timed_out:
+            sections[result.key] = {"status": "timeout", "data": None}
+        elif result.error is not None:
+            sections[result.key] = {"status": "error", "data": None, "error": str(result.error)}
+        else:
+            sections[result.key] = {"status": "ok", "data": result.value}
+    
+    return jsonify({
+        "sections": sections,
+        "complete": all(section["status"] == "ok" for section in sections.values()),
+        "timestamp": datetime.now().isoformat()
+    })
 
 # Recipe request submission endpoint
 @app.route('/api/recipe-request', methods=['POST'])
@@ -2336,4 +2285,7 @@ if __name__ == '__main__':
     print("📍 Backend running on: http://localhost:5000")
     print("🔍 Health check: http://localhost:5000/health")
     print("📊 API endpoints: http://localhost:5000/api/")
+    # The debug reloader's parent process never serves; only the child warms up
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        warm_up()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -1,8 +1,8 @@
-from flask import request, jsonify
+from flask import request, jsonify, g
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
 from flask_bcrypt import Bcrypt
 from functools import wraps
-from database import User, bcrypt
+from database import User, UserPreference, bcrypt
 from datetime import datetime, timedelta
 
 def create_user_token(user):
@@ -55,10 +55,31 @@ def authenticate_user(email, password):
         return None, str(e)
 
 def get_current_user():
-    """Get current authenticated user"""
-    try:
-        user_id = get_jwt_identity()
-        user = User.find_by_id(user_id)
-        return user
-    except:
-        return None
+    """Get current authenticated user, read from MongoDB at most once per request"""
+    if 'current_user' not in g:
+        try:
+            user_id = get_jwt_identity()
+            g.current_user = User.find_by_id(user_id)
+        except:
+            g.current_user = None
+    return g.current_user
+
+def get_user_preferences():
+    """All of the current user's preferences keyed by category, loaded once per request"""
+    if 'user_preferences' not in g:
+        try:
+            user_id = get_jwt_identity()
+            g.user_preferences = {
+                pref.category: pref for pref in UserPreference.find_by_user_id(user_id)
+            } if user_id else {}
+        except:
+            return {}
+    return g.user_preferences
+
+def get_user_preference(category):
+    """The current user's UserPreference for one category, or None"""
+    return get_user_preferences().get(category)
+
+def invalidate_user_preferences():
+    """Drop the request's preference snapshot after a preference write"""
+    g.pop('user_preferences', None)
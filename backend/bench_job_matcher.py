@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized job keyword matcher against the old iterrows loop
+
+Generates a synthetic Internshala-shaped CSV and, for every job category,
+times the per-row `any(keyword in title or keyword in skills)` scan that
+get_jobs used to run against KeywordMatcher's single regex pass.
+
+Usage: python bench_job_matcher.py [--rows 100000] [--seed 42]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+
+from job_catalog import CATEGORY_KEYWORDS
+from job_matcher import KeywordMatcher
+
+TITLES = [
+    'Video Editor', 'Graphic Designer', 'Frontend Developer', 'Backend Developer', 'Data Analyst',
+    'Business Analyst', 'Machine Learning Engineer', 'Android Developer', 'Digital Marketing Executive',
+    'Content Writer', 'Sales Executive', 'Customer Success Associate', 'Flutter Developer', 'HR Executive',
+    'Full Stack Developer', 'SEO Specialist', 'UI/UX Designer', 'Accountant', 'Operations Associate'
+]
+
+SKILLS = [
+    'Adobe After Effects', 'Adobe Illustrator', 'Adobe Photoshop', 'Adobe Premiere Pro', 'DaVinci Resolve',
+    'Final Cut Pro', 'Video Editing', 'Graphic Design', 'HTML', 'CSS', 'JavaScript', 'React', 'Node.js',
+    'Django', 'Flask', 'Python', 'SQL', 'MS-Excel', 'Power BI', 'Tableau', 'Machine Learning', 'Deep Learning',
+    'Kotlin', 'Flutter', 'Java', 'Search Engine Optimization (SEO)', 'Social Media Marketing',
+    'English Proficiency (Spoken)', 'Email Marketing', 'Tally', 'Figma'
+]
+
+CITIES = ['Mumbai', 'Pune', 'Delhi', 'Bangalore', 'Hyderabad', 'Chennai', 'Kolkata', 'Noida', 'Gurgaon']
+
+
+def write_synthetic_csv(path, rows, seed):
+    """Write an Internshala-shaped CSV with the given number of rows"""
+    rng = random.Random(seed)
+    pd.DataFrame({
+        'Job Title': [rng.choice(TITLES) for _ in range(rows)],
+        'Company Name': [f"Company {rng.randint(1, 5000)}" for _ in range(rows)],
+        'Location': [rng.choice(CITIES) for _ in range(rows)],
+        'Salary': [f"₹ {rng.randint(2, 6)},00,000 - {rng.randint(6, 12)},00,000 /year" for _ in range(rows)],
+        'Work From Home': [rng.choice(['Yes', 'No']) for _ in range(rows)],
+        'Job Link': [f"https://internshala.com/job/detail/synthetic-{i}" for i in range(rows)],
+        'Skills': [', '.join(rng.sample(SKILLS, rng.randint(2, 8))) for _ in range(rows)]
+    }).to_csv(path, index=False)
+
+
+def iterrows_matches(df, keywords):
+    """The matching loop get_jobs ran before the catalog and matcher existed"""
+    matches = []
+    for row_id, (_, job) in enumerate(df.iterrows()):
+        job_title = str(job['Job Title']).lower()
+        skills = str(job['Skills']).lower()
+        if any(keyword in job_title or keyword in skills for keyword in keywords):
+            matches.append(row_id)
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help='number of synthetic job rows')
+    parser.add_argument('--seed', type=int, default=42, help='random seed for the synthetic data')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'synthetic_jobs.csv')
+        write_synthetic_csv(csv_path, args.rows, args.seed)
+        df = pd.read_csv(csv_path)
+
+    print(f"Synthetic catalog: {len(df)} rows, {len(CATEGORY_KEYWORDS)} categories")
+    print(f"{'category':<20}{'matches':>10}{'iterrows (s)':>15}{'vectorized (s)':>17}{'speedup':>10}")
+
+    matcher = KeywordMatcher(CATEGORY_KEYWORDS)
+    start = time.perf_counter()
+    text = matcher.combine(df['Job Title'].astype(str).str.lower(), df['Skills'].astype(str).str.lower())
+    prepare_time = time.perf_counter() - start
+
+    total_loop = 0.0
+    total_vectorized = 0.0
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        start = time.perf_counter()
+        expected = iterrows_matches(df, keywords)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mask = matcher.mask(category, text, cache_key='bench')
+        vectorized_time = time.perf_counter() - start
+
+        actual = mask.nonzero()[0].tolist()
+        if actual != expected:
+            raise SystemExit(f"Mismatch for {category}: {len(actual)} vectorized vs {len(expected)} iterrows")
+
+        total_loop += loop_time
+        total_vectorized += vectorized_time
+        print(f"{category:<20}{len(expected):>10}{loop_time:>15.3f}{vectorized_time:>17.4f}{loop_time / vectorized_time:>9.1f}x")
+
+    start = time.perf_counter()
+    matcher.masks(text, cache_key='bench')
+    cached_time = time.perf_counter() - start
+
+    print(f"{'total':<20}{'':>10}{total_loop:>15.3f}{total_vectorized:>17.4f}{total_loop / total_vectorized:>9.1f}x")
+    print(f"Column preparation (lowercase + join): {prepare_time:.4f}s, cached masks for all categories: {cached_time * 1000:.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from database import mongo
+from blockchain_models import NFTTransaction
+from verbwire_service import get_verbwire_service
+
+JOB_TYPES = ('mint', 'transfer', 'mint_batch')
+
+
+class BlockchainJobQueue:
+    """Runs slow Verbwire mints, batch mints and transfers off the request thread
+
+    Each job is a document in the blockchain_jobs collection, executed by an
+    in-process thread pool. Single mints and transfers are enqueued together
+    with a pending NFTTransaction, which the worker confirms or marks failed. Workers
+    claim jobs with an atomic queued -> running update, so a job runs once
+    even when several processes resume the queue, and renew a heartbeat
+    every heartbeat_interval seconds while it runs.
+
+    resume() re-submits jobs left queued by a process that stopped. A job
+    whose heartbeat is older than stale_after seconds was running in a
+    process that died; it may already have minted or transferred on-chain,
+    so it is marked needs_review instead of being run again. Batch jobs
+    record each item's mint call under progress as it returns, so a
+    reviewer can see which items reached the chain.
+    """
+    def __init__(self, max_workers=4, stale_after=600, heartbeat_interval=30):
+        self.stale_after = stale_after
+        self.heartbeat_interval = heartbeat_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='blockchain-job')
+
+    @property
+    def collection(self):
+        return mongo.db.blockchain_jobs
+
+    @staticmethod
+    def _pending_transaction(job_type, params):
+        if job_type == 'mint_batch':
+            # Batch items get their transactions when they are minted
+            return None
+        if job_type == 'mint':
+            transaction = NFTTransaction(None, 'mint', to_wallet=params['recipient_address'])
+        else:
+            token_id = str(params['token_id'])
+            transaction = NFTTransaction(
+                ObjectId(token_id) if ObjectId.is_valid(token_id) else None,
+                'transfer',
+                from_wallet=params['from_address'],
+                to_wallet=params['to_address']
+            )
+        if not transaction.save():
+            raise Exception("Could not record pending transaction")
+        return transaction
+
+    def enqueue(self, job_type, params, user_id=None):
+        """Store a job with its pending transaction and start it; returns the job document"""
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        transaction = self._pending_transaction(job_type, params)
+        now = datetime.utcnow()
+        job = {
+            'type': job_type,
+            'params': params,
+            'status': 'queued',
+            'user_id': user_id,
+            'transaction_id': transaction._id if transaction else None,
+            'attempts': 0,
+            'result': None,
+            'error': None,
+            'created_at': now,
+            'updated_at': now
+        }
+        job['_id'] = self.collection.insert_one(job).inserted_id
+        self._executor.submit(self._run, job['_id'])
+        return job
+
+    def get(self, job_id):
+        if not ObjectId.is_valid(job_id):
+            return None
+        try:
+            return self.collection.find_one({'_id': ObjectId(job_id)})
+        except Exception as e:
+            print(f"Error reading blockchain job {job_id}: {e}")
+            return None
+
+    def resume(self):
+        """Re-submit queued jobs after a restart and flag dead running ones; returns how many were submitted"""
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=self.stale_after)
+        abandoned = self.collection.update_many(
+            {'status': 'running', '$or': [
+                {'heartbeat_at': {'$lt': stale_before}},
+                # Jobs claimed before heartbeats were recorded
+                {'heartbeat_at': {'$exists': False}, 'started_at': {'$lt': stale_before}}
+            ]},
+            {'$set': {
+                'status': 'needs_review',
+                'error': 'The worker stopped while this job was running; check on-chain state before retrying',
+                'finished_at': now,
+                'updated_at': now
+            }}
+        )
+        if abandoned.modified_count:
+            print(f"Marked {abandoned.modified_count} interrupted blockchain jobs for review")
+
+        job_ids = [doc['_id'] for doc in self.collection.find({'status': 'queued'}, {'_id': 1})]
+        for job_id in job_ids:
+            self._executor.submit(self._run, job_id)
+        if job_ids:
+            print(f"Resumed {len(job_ids)} blockchain jobs")
+        return len(job_ids)
+
+    def _run(self, job_id):
+        now = datetime.utcnow()
+        job = self.collection.find_one_and_update(
+            {'_id': job_id, 'status': 'queued'},
+            {
+                '$set': {
+                    'status': 'running',
+                    'started_at': now,
+                    'heartbeat_at': now,
+                    'updated_at': now,
+                    'worker_pid': os.getpid()
+                },
+                '$inc': {'attempts': 1}
+            },
+            return_document=ReturnDocument.AFTER
+        )
+        if not job:
+            # Already claimed by another worker, or finished
+            return
+
+        finished = threading.Event()
+        threading.Thread(
+            target=self._heartbeat, args=(job_id, finished), name='blockchain-job-heartbeat', daemon=True
+        ).start()
+        try:
+            transaction = NFTTransaction.find_by_id(job['transaction_id']) if job.get('transaction_id') else None
+            try:
+                result = self._execute(job_id, job['type'], job['params'], transaction)
+            except Exception as e:
+                result = {'success': False, 'error': str(e)}
+            self._finish(job_id, transaction, result)
+        finally:
+            finished.set()
+
+    def _heartbeat(self, job_id, finished):
+        """Show resume() in other processes that this job's worker is still alive"""
+        while not finished.wait(self.heartbeat_interval):
+            try:
+                self.collection.update_one(
+                    {'_id': job_id, 'status': 'running'},
+                    {'$set': {'heartbeat_at': datetime.utcnow()}}
+                )
+            except Exception as e:
+                print(f"Error renewing heartbeat for blockchain job {job_id}: {e}")
+
+    def _finish(self, job_id, transaction, result):
+        if transaction and (not result.get('success') or transaction.status == 'pending'):
+            # The service normally settles it; never leave a finished job's transaction pending
+            transaction.status = 'confirmed' if result.get('success') else 'failed'
+            if result.get('success') and not transaction.tx_id:
+                transaction.tx_id = result.get('transaction_hash')
+            transaction.timestamp = datetime.utcnow()
+            transaction.save()
+
+        self.collection.update_one({'_id': job_id}, {'$set': {
+            'status': 'succeeded' if result.get('success') else 'failed',
+            # Batch results list which items were minted even when none were
+            'result': result if result.get('success') or 'results' in result else None,
+            'error': result.get('error'),
+            'finished_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow()
+        }})
+
+    def _checkpoint(self, job_id, index, outcome):
+        """Record a batch item's mint call as soon as it returns, for reviewing interrupted batches"""
+        try:
+            self.collection.update_one({'_id': job_id}, {'$set': {f'progress.{index}': {
+                'success': outcome['success'],
+                'transaction_hash': (outcome.get('data') or {}).get('transactionHash'),
+                'is_mock': outcome.get('is_mock', False),
+                'error': outcome.get('error')
+            }}})
+        except Exception as e:
+            print(f"Error checkpointing item {index} of blockchain job {job_id}: {e}")
+
+    def _execute(self, job_id, job_type, params, transaction):
+        verbwire_service = get_verbwire_service()
+        if job_type == 'mint_batch':
+            return verbwire_service.mint_batch(
+                params['nfts'],
+                on_item=lambda index, outcome: self._checkpoint(job_id, index, outcome)
+            )
+        if job_type == 'mint':
+            return verbwire_service.mint_nft(
+                recipient_address=params['recipient_address'],
+                name=params['name'],
+                description=params['description'],
+                image_url=params['image_url'],
+                attributes=params.get('attributes', []),
+                transaction=transaction
+            )
+        return verbwire_service.transfer_nft(
+            contract_address=params['contract_address'],
+            token_id=params['token_id'],
+            from_address=params['from_address'],
+            to_address=params['to_address'],
+            transaction=transaction
+        )
+
+    @staticmethod
+    def to_dict(job):
+        return {
+            'job_id': str(job['_id']),
+            'type': job['type'],
+            'status': job['status'],
+            'transaction_id': str(job['transaction_id']) if job.get('transaction_id') else None,
+            'attempts': job.get('attempts', 0),
+            'items_done': len(job['progress']) if job.get('progress') else None,
+            'result': job.get('result'),
+            'error': job.get('error'),
+            'created_at': job['created_at'].isoformat() if job.get('created_at') else None,
+            'started_at': job['started_at'].isoformat() if job.get('started_at') else None,
+            'finished_at': job['finished_at'].isoformat() if job.get('finished_at') else None
+        }
+
+
+def initialize_job_indexes():
+    """Initialize MongoDB indexes for the blockchain job queue"""
+    try:
+        mongo.db.blockchain_jobs.create_index([("status", 1), ("heartbeat_at", 1)])
+        mongo.db.blockchain_jobs.create_index([("user_id", 1), ("created_at", -1)])
+        print("Blockchain job MongoDB indexes created successfully!")
+        return True
+    except Exception as e:
+        print(f"Error creating blockchain job MongoDB indexes: {e}")
+        return False
+
+
+# Initialize blockchain job queue instance
+blockchain_jobs = BlockchainJobQueue(
+    max_workers=int(os.getenv('BLOCKCHAIN_JOB_WORKERS', '4')),
+    stale_after=int(os.getenv('BLOCKCHAIN_JOB_STALE_SECONDS', '600')),
+    heartbeat_interval=int(os.getenv('BLOCKCHAIN_JOB_HEARTBEAT_SECONDS', '30'))
+)
@@ -2,12 +2,43 @@ import os
 from flask_pymongo import PyMongo
 from datetime import datetime
 from bson import ObjectId
+from pymongo.errors import BulkWriteError
 import json
 
 # Import the existing mongo instance
 from database import mongo
+from blockchain_stats import increment_counter
+
+def _find_page(collection, sort_field, after=None, limit=None, fields=None):
+    """Cursor over a collection, newest first, resuming after the document with id `after`
+
+    Pages are keyed on (sort_field, _id) descending rather than skip(), so
+    every page is a single range scan of the matching compound index no
+    matter how deep into the listing it is.
+    """
+    query = {}
+    if after is not None:
+        anchor = collection.find_one({'_id': after}, {sort_field: 1})
+        if not anchor:
+            return []
+        query = {'$or': [
+            {sort_field: {'$lt': anchor.get(sort_field)}},
+            {sort_field: anchor.get(sort_field), '_id': {'$lt': after}}
+        ]}
+
+    projection = None
+    if fields:
+        projection = {field: 1 for field in fields if field != 'id'}
+        projection['_id'] = 1
+
+    cursor = collection.find(query, projection).sort([(sort_field, -1), ('_id', -1)])
+    if limit:
+        cursor = cursor.limit(limit)
+    return cursor
 
 class NFTMetadata:
+    FIELDS = ('id', 'name', 'description', 'image_url', 'owner_wallet', 'mint_date', 'created_at', 'updated_at')
+
     def __init__(self, name, description, image_url, owner_wallet, mint_date=None, _id=None):
         self.name = name
         self.description = description
@@ -21,8 +52,8 @@ class NFTMetadata:
     def get_id(self):
         return str(self._id) if self._id else None
 
-    def to_dict(self):
-        return {
+    def to_dict(self, fields=None):
+        data = {
             'id': self.get_id(),
             'name': self.name,
             'description': self.description,
@@ -32,18 +63,24 @@ class NFTMetadata:
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+        if fields:
+            data = {key: value for key, value in data.items() if key in fields}
+        return data
+
+    def _to_document(self):
+        return {
+            'name': self.name,
+            'description': self.description,
+            'image_url': self.image_url,
+            'owner_wallet': self.owner_wallet,
+            'mint_date': self.mint_date,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
 
     def save(self):
         try:
-            nft_data = {
-                'name': self.name,
-                'description': self.description,
-                'image_url': self.image_url,
-                'owner_wallet': self.owner_wallet,
-                'mint_date': self.mint_date,
-                'created_at': self.created_at,
-                'updated_at': self.updated_at
-            }
+            nft_data = self._to_document()
             
             if self._id:
                 # Update existing NFT
@@ -56,11 +93,37 @@ class NFTMetadata:
                 # Create new NFT
                 result = mongo.db.nft_metadata.insert_one(nft_data)
                 self._id = result.inserted_id
+                increment_counter('nfts')
                 return True
         except Exception as e:
             print(f"Error saving NFT metadata: {e}")
             return False
 
+    @staticmethod
+    def insert_many(nfts):
+        """Insert new NFTs in one round trip and set their ids
+
+        Returns False if any insert failed; NFTs that were inserted before
+        the failure still get their ids (the rest keep _id None).
+        """
+        if not nfts:
+            return True
+        documents = [nft._to_document() for nft in nfts]
+        try:
+            mongo.db.nft_metadata.insert_many(documents)
+            inserted, ok = len(nfts), True
+        except BulkWriteError as e:
+            inserted, ok = e.details.get('nInserted', 0), False
+            print(f"Error inserting NFT metadata: {e}")
+        except Exception as e:
+            print(f"Error inserting NFT metadata: {e}")
+            return False
+        # Ordered inserts stop at the first error, so the first `inserted` documents were written
+        for nft, document in zip(nfts[:inserted], documents):
+            nft._id = document['_id']
+        increment_counter('nfts', inserted)
+        return ok
+
     @staticmethod
     def find_by_id(nft_id):
         try:
@@ -108,28 +171,42 @@ class NFTMetadata:
             return []
 
     @staticmethod
-    def find_all():
+    def _from_doc(doc):
+        # Projected documents may omit any field but _id; to_dict(fields) drops those
+        nft = NFTMetadata(
+            doc.get('name'),
+            doc.get('description'),
+            doc.get('image_url'),
+            doc.get('owner_wallet'),
+            doc.get('mint_date')
+        )
+        nft.created_at = doc.get('created_at', datetime.utcnow())
+        nft.updated_at = doc.get('updated_at', datetime.utcnow())
+        nft._id = doc['_id']
+        return nft
+
+    @staticmethod
+    def find_all(after=None, limit=None, fields=None):
+        """NFTs newest first; `after` is the last id of the previous page"""
         try:
-            nfts = []
-            nft_docs = mongo.db.nft_metadata.find().sort('created_at', -1)
-            for doc in nft_docs:
-                nft = NFTMetadata(
-                    doc['name'],
-                    doc['description'],
-                    doc['image_url'],
-                    doc['owner_wallet'],
-                    doc.get('mint_date', datetime.utcnow())
-                )
-                nft.created_at = doc.get('created_at', datetime.utcnow())
-                nft.updated_at = doc.get('updated_at', datetime.utcnow())
-                nft._id = doc['_id']
-                nfts.append(nft)
-            return nfts
+            nft_docs = _find_page(mongo.db.nft_metadata, 'created_at', after, limit, fields)
+            return [NFTMetadata._from_doc(doc) for doc in nft_docs]
         except Exception as e:
             print(f"Error finding all NFTs: {e}")
             return []
 
+    @staticmethod
+    def estimated_count():
+        """Collection size from metadata, without scanning documents"""
+        try:
+            return mongo.db.nft_metadata.estimated_document_count()
+        except Exception as e:
+            print(f"Error counting NFTs: {e}")
+            return None
+
 class NFTTransaction:
+    FIELDS = ('id', 'nft_id', 'action', 'from_wallet', 'to_wallet', 'tx_id', 'status', 'timestamp')
+
     def __init__(self, nft_id, action, from_wallet=None, to_wallet=None, tx_id=None, status='pending', _id=None):
         self.nft_id = nft_id
         self.action = action  # 'mint', 'transfer', 'burn'
@@ -143,8 +220,8 @@ class NFTTransaction:
     def get_id(self):
         return str(self._id) if self._id else None
 
-    def to_dict(self):
-        return {
+    def to_dict(self, fields=None):
+        data = {
             'id': self.get_id(),
             'nft_id': str(self.nft_id) if self.nft_id else None,
             'action': self.action,
@@ -154,18 +231,29 @@ class NFTTransaction:
             'status': self.status,
             'timestamp': self.timestamp.isoformat() if self.timestamp else None
         }
+        if fields:
+            data = {key: value for key, value in data.items() if key in fields}
+        return data
+
+    def _to_document(self):
+        tx_data = {
+            'nft_id': self.nft_id,
+            'action': self.action,
+            'from_wallet': self.from_wallet,
+            'to_wallet': self.to_wallet,
+            'tx_id': self.tx_id,
+            'status': self.status,
+            'timestamp': self.timestamp
+        }
+        # Pending transactions have no hash yet; storing null would
+        # collide on the unique sparse tx_id index
+        if tx_data['tx_id'] is None:
+            del tx_data['tx_id']
+        return tx_data
 
     def save(self):
         try:
-            tx_data = {
-                'nft_id': self.nft_id,
-                'action': self.action,
-                'from_wallet': self.from_wallet,
-                'to_wallet': self.to_wallet,
-                'tx_id': self.tx_id,
-                'status': self.status,
-                'timestamp': self.timestamp
-            }
+            tx_data = self._to_document()
             
             if self._id:
                 # Update existing transaction
@@ -178,11 +266,44 @@ class NFTTransaction:
                 # Create new transaction
                 result = mongo.db.nft_transactions.insert_one(tx_data)
                 self._id = result.inserted_id
+                increment_counter('transactions')
                 return True
         except Exception as e:
             print(f"Error saving NFT transaction: {e}")
             return False
 
+    @staticmethod
+    def insert_many(transactions):
+        """Insert new transactions in one round trip and set their ids (see NFTMetadata.insert_many)"""
+        if not transactions:
+            return True
+        documents = [tx._to_document() for tx in transactions]
+        try:
+            mongo.db.nft_transactions.insert_many(documents)
+            inserted, ok = len(transactions), True
+        except BulkWriteError as e:
+            inserted, ok = e.details.get('nInserted', 0), False
+            print(f"Error inserting NFT transactions: {e}")
+        except Exception as e:
+            print(f"Error inserting NFT transactions: {e}")
+            return False
+        for tx, document in zip(transactions[:inserted], documents):
+            tx._id = document['_id']
+        increment_counter('transactions', inserted)
+        return ok
+
+    @staticmethod
+    def find_by_id(transaction_id):
+        try:
+            if isinstance(transaction_id, str):
+                transaction_id = ObjectId(transaction_id)
+            
+            tx_data = mongo.db.nft_transactions.find_one({'_id': transaction_id})
+            return NFTTransaction._from_doc(tx_data) if tx_data else None
+        except Exception as e:
+            print(f"Error finding transaction by ID: {e}")
+            return None
+
     @staticmethod
     def find_by_nft_id(nft_id):
         try:
@@ -237,28 +358,42 @@ class NFTTransaction:
             return []
 
     @staticmethod
-    def find_all():
+    def _from_doc(doc):
+        # Projected documents may omit any field but _id; to_dict(fields) drops those
+        tx = NFTTransaction(
+            doc.get('nft_id'),
+            doc.get('action'),
+            doc.get('from_wallet'),
+            doc.get('to_wallet'),
+            doc.get('tx_id'),
+            doc.get('status', 'pending')
+        )
+        tx.timestamp = doc.get('timestamp', datetime.utcnow())
+        tx._id = doc['_id']
+        return tx
+
+    @staticmethod
+    def find_all(after=None, limit=None, fields=None):
+        """Transactions newest first; `after` is the last id of the previous page"""
         try:
-            transactions = []
-            tx_docs = mongo.db.nft_transactions.find().sort('timestamp', -1)
-            for doc in tx_docs:
-                tx = NFTTransaction(
-                    doc['nft_id'],
-                    doc['action'],
-                    doc.get('from_wallet'),
-                    doc.get('to_wallet'),
-                    doc.get('tx_id'),
-                    doc.get('status', 'pending')
-                )
-                tx.timestamp = doc.get('timestamp', datetime.utcnow())
-                tx._id = doc['_id']
-                transactions.append(tx)
-            return transactions
+            tx_docs = _find_page(mongo.db.nft_transactions, 'timestamp', after, limit, fields)
+            return [NFTTransaction._from_doc(doc) for doc in tx_docs]
         except Exception as e:
             print(f"Error finding all transactions: {e}")
             return []
 
+    @staticmethod
+    def estimated_count():
+        """Collection size from metadata, without scanning documents"""
+        try:
+            return mongo.db.nft_transactions.estimated_document_count()
+        except Exception as e:
+            print(f"Error counting transactions: {e}")
+            return None
+
 class NFTCollection:
+    FIELDS = ('id', 'name', 'description', 'creator_wallet', 'contract_address', 'created_at', 'updated_at')
+
     def __init__(self, name, description, creator_wallet, contract_address=None, _id=None):
         self.name = name
         self.description = description
@@ -271,8 +406,8 @@ class NFTCollection:
     def get_id(self):
         return str(self._id) if self._id else None
 
-    def to_dict(self):
-        return {
+    def to_dict(self, fields=None):
+        data = {
             'id': self.get_id(),
             'name': self.name,
             'description': self.description,
@@ -281,6 +416,9 @@ class NFTCollection:
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
+        if fields:
+            data = {key: value for key, value in data.items() if key in fields}
+        return data
 
     def save(self):
         try:
@@ -304,6 +442,7 @@ class NFTCollection:
                 # Create new collection
                 result = mongo.db.nft_collections.insert_one(collection_data)
                 self._id = result.inserted_id
+                increment_counter('collections')
                 return True
         except Exception as e:
             print(f"Error saving NFT collection: {e}")
@@ -333,26 +472,38 @@ class NFTCollection:
             return None
 
     @staticmethod
-    def find_all():
+    def _from_doc(doc):
+        # Projected documents may omit any field but _id; to_dict(fields) drops those
+        collection = NFTCollection(
+            doc.get('name'),
+            doc.get('description'),
+            doc.get('creator_wallet'),
+            doc.get('contract_address')
+        )
+        collection.created_at = doc.get('created_at', datetime.utcnow())
+        collection.updated_at = doc.get('updated_at', datetime.utcnow())
+        collection._id = doc['_id']
+        return collection
+
+    @staticmethod
+    def find_all(after=None, limit=None, fields=None):
+        """Collections newest first; `after` is the last id of the previous page"""
         try:
-            collections = []
-            collection_docs = mongo.db.nft_collections.find().sort('created_at', -1)
-            for doc in collection_docs:
-                collection = NFTCollection(
-                    doc['name'],
-                    doc['description'],
-                    doc['creator_wallet'],
-                    doc.get('contract_address')
-                )
-                collection.created_at = doc.get('created_at', datetime.utcnow())
-                collection.updated_at = doc.get('updated_at', datetime.utcnow())
-                collection._id = doc['_id']
-                collections.append(collection)
-            return collections
+            collection_docs = _find_page(mongo.db.nft_collections, 'created_at', after, limit, fields)
+            return [NFTCollection._from_doc(doc) for doc in collection_docs]
         except Exception as e:
             print(f"Error finding all collections: {e}")
             return []
 
+    @staticmethod
+    def estimated_count():
+        """Collection size from metadata, without scanning documents"""
+        try:
+            return mongo.db.nft_collections.estimated_document_count()
+        except Exception as e:
+            print(f"Error counting collections: {e}")
+            return None
+
 def initialize_blockchain_indexes():
     """Initialize MongoDB indexes for blockchain collections"""
     try:
@@ -364,6 +515,10 @@ def initialize_blockchain_indexes():
         mongo.db.nft_transactions.create_index("tx_id", unique=True, sparse=True)
         mongo.db.nft_collections.create_index("creator_wallet")
         mongo.db.nft_collections.create_index("contract_address", unique=True, sparse=True)
+        # Compound indexes matching the paginated listing sorts
+        mongo.db.nft_metadata.create_index([("created_at", -1), ("_id", -1)])
+        mongo.db.nft_transactions.create_index([("timestamp", -1), ("_id", -1)])
+        mongo.db.nft_collections.create_index([("created_at", -1), ("_id", -1)])
         print("Blockchain MongoDB indexes created successfully!")
         return True
     except Exception as e:
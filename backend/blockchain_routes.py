@@ -1,20 +1,74 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
+from bson import ObjectId
 import json
+import os
+import time
 
 from auth import get_current_user
 from blockchain_models import NFTMetadata, NFTTransaction, NFTCollection
-from verbwire_service import verbwire_service
+from blockchain_stats import blockchain_stats
+from blockchain_jobs import blockchain_jobs
+from concurrent.futures import wait
+from verbwire_service import get_verbwire_service
 
 # Create Blueprint for blockchain routes
 blockchain_bp = Blueprint('blockchain', __name__, url_prefix='/api/blockchain')
 
+# Listing endpoints return pages of at most this many items
+DEFAULT_PAGE_SIZE = int(os.getenv('BLOCKCHAIN_PAGE_SIZE', '50'))
+MAX_PAGE_SIZE = int(os.getenv('BLOCKCHAIN_MAX_PAGE_SIZE', '200'))
+
+# Largest number of NFTs accepted by one /mintNFTBatch call
+MAX_MINT_BATCH = int(os.getenv('VERBWIRE_MAX_MINT_BATCH', '500'))
+
+# How long /getNFTs?wallet= waits for Verbwire before answering with database data only
+VERBWIRE_WALLET_DEADLINE = float(os.getenv('VERBWIRE_WALLET_DEADLINE', '3'))
+
+def parse_page_args(allowed_fields):
+    """Read limit, after and fields query params; raises ValueError on bad input"""
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    
+    after = request.args.get('after')
+    if after:
+        if not ObjectId.is_valid(after):
+            raise ValueError('after must be an id from a previous page')
+        after = ObjectId(after)
+    
+    fields = None
+    if request.args.get('fields'):
+        fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()]
+        unknown = [field for field in fields if field not in allowed_fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        # The id is the cursor for the next page
+        if 'id' not in fields:
+            fields.append('id')
+    
+    return limit, after or None, fields
+
+def page_response(key, items, limit, fields, total_estimate):
+    """Serialize one page; items holds up to limit + 1 rows to detect a next page"""
+    has_more = len(items) > limit
+    items = items[:limit]
+    return {
+        'count': len(items),
+        key: [item.to_dict(fields) for item in items],
+        'total_estimate': total_estimate,
+        'has_more': has_more,
+        'next_after': items[-1].get_id() if has_more else None
+    }
+
 @blockchain_bp.route('/health', methods=['GET'])
 def blockchain_health():
     """Health check for blockchain module"""
     # Check Verbwire service health
-    verbwire_health = verbwire_service.health_check()
+    verbwire_health = get_verbwire_service().health_check()
     
     return jsonify({
         'status': 'healthy',
@@ -26,7 +80,7 @@ def blockchain_health():
 @blockchain_bp.route('/mintNFT', methods=['POST'])
 @jwt_required()
 def mint_nft():
-    """Mint a new NFT"""
+    """Queue a new NFT mint and return its job id"""
     try:
         current_user = get_current_user()
         if not current_user:
@@ -45,48 +99,72 @@ def mint_nft():
                 print(f"DEBUG: Missing field: {field}")  # Debug log
                 return jsonify({'message': f'{field} is required'}), 400
         
-        # Extract data
-        name = data['name']
-        description = data['description']
-        image_url = data['image_url']
-        recipient_address = data['recipient_address']
-        attributes = data.get('attributes', [])
-        
-        # Mint NFT using Verbwire
-        print(f"DEBUG: Calling Verbwire mint_nft with: {name}, {description}, {image_url}, {recipient_address}")
-        print(f"DEBUG: Attributes: {attributes}")
-        result = verbwire_service.mint_nft(
-            recipient_address=recipient_address,
-            name=name,
-            description=description,
-            image_url=image_url,
-            attributes=attributes
-        )
-        
-        print(f"DEBUG: Verbwire result: {result}")
+        # Mint in the background; the client polls /jobs/<job_id>
+        job = blockchain_jobs.enqueue('mint', {
+            'name': data['name'],
+            'description': data['description'],
+            'image_url': data['image_url'],
+            'recipient_address': data['recipient_address'],
+            'attributes': data.get('attributes', [])
+        }, user_id=current_user.get_id())
         
-        if result['success']:
-            return jsonify({
-                'message': 'NFT minted successfully',
-                'nft_id': result['nft_id'],
-                'transaction_hash': result['transaction_hash'],
-                'token_id': result.get('token_id'),
-                'contract_address': result.get('contract_address')
-            }), 201
-        else:
-            print(f"DEBUG: Verbwire error: {result['error']}")
-            return jsonify({
-                'message': 'Failed to mint NFT',
-                'error': result['error']
-            }), 400
+        return jsonify({
+            'message': 'NFT mint queued',
+            'job_id': str(job['_id']),
+            'status': job['status'],
+            'transaction_id': str(job['transaction_id'])
+        }), 202
             
     except Exception as e:
         return jsonify({'message': f'Error minting NFT: {str(e)}'}), 500
 
+@blockchain_bp.route('/mintNFTBatch', methods=['POST'])
+@jwt_required()
+def mint_nft_batch():
+    """Queue a batch of NFT mints; per-item results are in the job result"""
+    try:
+        current_user = get_current_user()
+        if not current_user:
+            return jsonify({'message': 'User not found'}), 404
+        
+        data = request.get_json()
+        nfts = data.get('nfts') if data else None
+        
+        if not isinstance(nfts, list) or not nfts:
+            return jsonify({'message': 'nfts must be a non-empty list'}), 400
+        if len(nfts) > MAX_MINT_BATCH:
+            return jsonify({'message': f'At most {MAX_MINT_BATCH} NFTs per batch'}), 400
+        if not all(isinstance(spec, dict) for spec in nfts):
+            return jsonify({'message': 'Each NFT must be an object'}), 400
+        
+        # Items missing required fields are reported per item, not rejected here
+        job = blockchain_jobs.enqueue('mint_batch', {
+            'nfts': [
+                {
+                    'name': spec.get('name'),
+                    'description': spec.get('description'),
+                    'image_url': spec.get('image_url'),
+                    'recipient_address': spec.get('recipient_address'),
+                    'attributes': spec.get('attributes', [])
+                }
+                for spec in nfts
+            ]
+        }, user_id=current_user.get_id())
+        
+        return jsonify({
+            'message': 'NFT batch mint queued',
+            'job_id': str(job['_id']),
+            'status': job['status'],
+            'count': len(nfts)
+        }), 202
+        
+    except Exception as e:
+        return jsonify({'message': f'Error minting NFT batch: {str(e)}'}), 500
+
 @blockchain_bp.route('/transferNFT', methods=['POST'])
 @jwt_required()
 def transfer_nft():
-    """Transfer an NFT"""
+    """Queue an NFT transfer and return its job id"""
     try:
         current_user = get_current_user()
         if not current_user:
@@ -100,32 +178,43 @@ def transfer_nft():
             if not data.get(field):
                 return jsonify({'message': f'{field} is required'}), 400
         
-        # Transfer NFT using Verbwire
-        result = verbwire_service.transfer_nft(
-            contract_address=data['contract_address'],
-            token_id=data['token_id'],
-            from_address=data['from_address'],
-            to_address=data['to_address']
-        )
+        # Transfer in the background; the client polls /jobs/<job_id>
+        job = blockchain_jobs.enqueue('transfer', {
+            field: data[field] for field in required_fields
+        }, user_id=current_user.get_id())
         
-        if result['success']:
-            return jsonify({
-                'message': 'NFT transferred successfully',
-                'transaction_hash': result['transaction_hash']
-            }), 200
-        else:
-            return jsonify({
-                'message': 'Failed to transfer NFT',
-                'error': result['error']
-            }), 400
+        return jsonify({
+            'message': 'NFT transfer queued',
+            'job_id': str(job['_id']),
+            'status': job['status'],
+            'transaction_id': str(job['transaction_id'])
+        }), 202
             
     except Exception as e:
         return jsonify({'message': f'Error transferring NFT: {str(e)}'}), 500
 
+@blockchain_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_job_status(job_id):
+    """Get the status of a queued mint or transfer"""
+    try:
+        current_user = get_current_user()
+        if not current_user:
+            return jsonify({'message': 'User not found'}), 404
+        
+        job = blockchain_jobs.get(job_id)
+        if not job or job.get('user_id') != current_user.get_id():
+            return jsonify({'message': 'Job not found'}), 404
+        
+        return jsonify(blockchain_jobs.to_dict(job)), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Error getting job status: {str(e)}'}), 500
+
 @blockchain_bp.route('/getNFTs', methods=['GET'])
 @jwt_required()
 def get_nfts():
-    """Get NFTs - can filter by wallet or get all"""
+    """Get NFTs - can filter by wallet or page through all (limit, after, fields)"""
     try:
         current_user = get_current_user()
         if not current_user:
@@ -134,34 +223,38 @@ def get_nfts():
         wallet_address = request.args.get('wallet')
         
         if wallet_address:
-            # Get NFTs from database by wallet
-            nfts = NFTMetadata.find_by_owner(wallet_address)
-            
-            # Also try to get from Verbwire API
-            verbwire_result = verbwire_service.get_nfts_by_wallet(wallet_address)
+            # Start Verbwire in the background (joining any lookup already in flight
+            # for this wallet) and read the database meanwhile on this thread; the
+            # database already covers Verbwire's fallback, so skip it there
+            started = time.monotonic()
+            verbwire_lookup = get_verbwire_service().submit_wallet_lookup(wallet_address)
+            nft_list = [nft.to_dict() for nft in NFTMetadata.find_by_owner(wallet_address)]
             
-            nft_list = [nft.to_dict() for nft in nfts]
+            remaining = VERBWIRE_WALLET_DEADLINE - (time.monotonic() - started)
+            wait([verbwire_lookup], timeout=max(remaining, 0))
             
             response_data = {
                 'count': len(nft_list),
                 'nfts': nft_list,
-                'wallet_address': wallet_address
+                'wallet_address': wallet_address,
+                # A slow Verbwire call keeps running and fills the wallet cache for the next request
+                'verbwire_pending': not verbwire_lookup.done()
             }
             
             # Add Verbwire data if available
-            if verbwire_result['success']:
-                response_data['verbwire_data'] = verbwire_result['data']
+            if verbwire_lookup.done() and verbwire_lookup.exception() is None and verbwire_lookup.result()['success']:
+                response_data['verbwire_data'] = verbwire_lookup.result()['data']
             
             return jsonify(response_data), 200
         else:
-            # Get all NFTs from database
-            nfts = NFTMetadata.find_all()
-            nft_list = [nft.to_dict() for nft in nfts]
+            # Get one page of all NFTs from database
+            try:
+                limit, after, fields = parse_page_args(NFTMetadata.FIELDS)
+            except ValueError as e:
+                return jsonify({'message': str(e)}), 400
             
-            return jsonify({
-                'count': len(nft_list),
-                'nfts': nft_list
-            }), 200
+            nfts = NFTMetadata.find_all(after=after, limit=limit + 1, fields=fields)
+            return jsonify(page_response('nfts', nfts, limit, fields, NFTMetadata.estimated_count())), 200
             
     except Exception as e:
         return jsonify({'message': f'Error getting NFTs: {str(e)}'}), 500
@@ -195,7 +288,7 @@ def get_nft_details(nft_id):
 @blockchain_bp.route('/getTransactions', methods=['GET'])
 @jwt_required()
 def get_transactions():
-    """Get NFT transactions - can filter by wallet or NFT ID"""
+    """Get NFT transactions - can filter by wallet or NFT ID, or page through all (limit, after, fields)"""
     try:
         current_user = get_current_user()
         if not current_user:
@@ -209,7 +302,14 @@ def get_transactions():
         elif nft_id:
             transactions = NFTTransaction.find_by_nft_id(nft_id)
         else:
-            transactions = NFTTransaction.find_all()
+            # Get one page of all transactions
+            try:
+                limit, after, fields = parse_page_args(NFTTransaction.FIELDS)
+            except ValueError as e:
+                return jsonify({'message': str(e)}), 400
+            
+            transactions = NFTTransaction.find_all(after=after, limit=limit + 1, fields=fields)
+            return jsonify(page_response('transactions', transactions, limit, fields, NFTTransaction.estimated_count())), 200
         
         transaction_list = [tx.to_dict() for tx in transactions]
         
@@ -224,19 +324,19 @@ def get_transactions():
 @blockchain_bp.route('/getCollections', methods=['GET'])
 @jwt_required()
 def get_collections():
-    """Get NFT collections"""
+    """Get NFT collections, one page at a time (limit, after, fields)"""
     try:
         current_user = get_current_user()
         if not current_user:
             return jsonify({'message': 'User not found'}), 404
         
-        collections = NFTCollection.find_all()
-        collection_list = [collection.to_dict() for collection in collections]
+        try:
+            limit, after, fields = parse_page_args(NFTCollection.FIELDS)
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
         
-        return jsonify({
-            'count': len(collection_list),
-            'collections': collection_list
-        }), 200
+        collections = NFTCollection.find_all(after=after, limit=limit + 1, fields=fields)
+        return jsonify(page_response('collections', collections, limit, fields, NFTCollection.estimated_count())), 200
         
     except Exception as e:
         return jsonify({'message': f'Error getting collections: {str(e)}'}), 500
@@ -259,7 +359,7 @@ def deploy_contract():
                 return jsonify({'message': f'{field} is required'}), 400
         
         # Deploy contract using Verbwire
-        result = verbwire_service.deploy_contract(
+        result = get_verbwire_service().deploy_contract(
             name=data['name'],
             symbol=data['symbol'],
             description=data.get('description', '')
@@ -291,7 +391,7 @@ def get_collection_nfts(contract_address):
             return jsonify({'message': 'User not found'}), 404
         
         # Get collection NFTs using Verbwire
-        result = verbwire_service.get_collection_nfts(contract_address)
+        result = get_verbwire_service().get_collection_nfts(contract_address)
         
         if result['success']:
             return jsonify({
@@ -317,7 +417,7 @@ def get_transaction_status(transaction_hash):
             return jsonify({'message': 'User not found'}), 404
         
         # Get transaction status using Verbwire
-        result = verbwire_service.get_transaction_status(transaction_hash)
+        result = get_verbwire_service().get_transaction_status(transaction_hash)
         
         if result['success']:
             return jsonify({
@@ -336,23 +436,17 @@ def get_transaction_status(transaction_hash):
 @blockchain_bp.route('/stats', methods=['GET'])
 @jwt_required()
 def get_blockchain_stats():
-    """Get blockchain module statistics"""
+    """Get blockchain module statistics (optional days window for the breakdown)"""
     try:
         current_user = get_current_user()
         if not current_user:
             return jsonify({'message': 'User not found'}), 404
         
-        # Get counts from database
-        total_nfts = len(NFTMetadata.find_all())
-        total_transactions = len(NFTTransaction.find_all())
-        total_collections = len(NFTCollection.find_all())
+        # Maintained counters plus a cached breakdown of recent transactions
+        stats = blockchain_stats.get_stats(days=request.args.get('days', type=int))
+        stats['timestamp'] = datetime.utcnow().isoformat()
         
-        return jsonify({
-            'total_nfts': total_nfts,
-            'total_transactions': total_transactions,
-            'total_collections': total_collections,
-            'timestamp': datetime.utcnow().isoformat()
-        }), 200
+        return jsonify(stats), 200
         
     except Exception as e:
         return jsonify({'message': f'Error getting stats: {str(e)}'}), 500
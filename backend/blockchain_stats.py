@@ -0,0 +1,153 @@
+import os
+from datetime import datetime, timedelta
+
+from cache import TTLCache
+from database import mongo
+
+# Maintained totals live in one document of the blockchain_counters collection
+COUNTERS_ID = 'blockchain'
+
+# Counter name -> collection it counts
+COUNTED_COLLECTIONS = {
+    'nfts': 'nft_metadata',
+    'transactions': 'nft_transactions',
+    'collections': 'nft_collections'
+}
+
+
+def increment_counter(name, amount=1):
+    """Bump a maintained total after an insert
+
+    Increments never upsert: until seed_counters() has created the counters
+    document from real counts, they are no-ops and totals fall back to
+    collection metadata.
+    """
+    try:
+        mongo.db.blockchain_counters.update_one(
+            {'_id': COUNTERS_ID},
+            {'$inc': {name: amount}, '$set': {'updated_at': datetime.utcnow()}}
+        )
+    except Exception as e:
+        print(f"Error updating blockchain counter {name}: {e}")
+
+
+class BlockchainStatsService:
+    """Blockchain module statistics that don't grow with the collections
+
+    Totals are read from the counters document (one _id lookup) or, before
+    it exists, from estimated_document_count(). Per-status, per-action and
+    per-day breakdowns come from one $facet aggregation over a recent
+    window of transactions, cached briefly.
+    """
+    def __init__(self, breakdown_ttl=60, default_days=30, max_days=365):
+        self.default_days = default_days
+        self.max_days = max_days
+        self.breakdown_cache = TTLCache(max_entries=32, default_ttl=breakdown_ttl)
+
+    def seed_counters(self):
+        """Create the counters document from exact counts if it doesn't exist yet"""
+        if mongo.db.blockchain_counters.find_one({'_id': COUNTERS_ID}, {'_id': 1}):
+            return False
+
+        counts = {
+            name: mongo.db[collection].count_documents({})
+            for name, collection in COUNTED_COLLECTIONS.items()
+        }
+        counts['updated_at'] = datetime.utcnow()
+        mongo.db.blockchain_counters.update_one(
+            {'_id': COUNTERS_ID},
+            {'$setOnInsert': counts},
+            upsert=True
+        )
+        print(f"Blockchain counters seeded: {counts}")
+        return True
+
+    def reconcile(self):
+        """Reset the counters to exact counts, e.g. after documents were removed by hand"""
+        counts = {
+            name: mongo.db[collection].count_documents({})
+            for name, collection in COUNTED_COLLECTIONS.items()
+        }
+        counts['updated_at'] = datetime.utcnow()
+        mongo.db.blockchain_counters.update_one({'_id': COUNTERS_ID}, {'$set': counts}, upsert=True)
+        self.breakdown_cache.clear()
+        return counts
+
+    def totals(self):
+        """Return ({name: count}, source) without scanning any collection"""
+        doc = mongo.db.blockchain_counters.find_one({'_id': COUNTERS_ID})
+        if doc:
+            return {name: doc.get(name, 0) for name in COUNTED_COLLECTIONS}, 'counters'
+
+        return {
+            name: mongo.db[collection].estimated_document_count()
+            for name, collection in COUNTED_COLLECTIONS.items()
+        }, 'estimated'
+
+    def breakdown(self, days=None):
+        """Transaction counts by status, by action and by day for the last `days` days"""
+        days = max(1, min(days or self.default_days, self.max_days))
+        cached = self.breakdown_cache.get(days)
+        if cached is not None:
+            return cached
+
+        since = datetime.utcnow() - timedelta(days=days)
+        pipeline = [
+            # Leading range match uses the (timestamp, _id) index
+            {'$match': {'timestamp': {'$gte': since}}},
+            {'$facet': {
+                'by_status': [
+                    {'$group': {'_id': '$status', 'count': {'$sum': 1}}}
+                ],
+                'by_action': [
+                    {'$group': {'_id': '$action', 'count': {'$sum': 1}}}
+                ],
+                'by_day': [
+                    {'$group': {
+                        '_id': {'$dateToString': {'format': '%Y-%m-%d', 'date': '$timestamp'}},
+                        'transactions': {'$sum': 1},
+                        'mints': {'$sum': {'$cond': [{'$eq': ['$action', 'mint']}, 1, 0]}},
+                        'transfers': {'$sum': {'$cond': [{'$eq': ['$action', 'transfer']}, 1, 0]}},
+                        'confirmed': {'$sum': {'$cond': [{'$eq': ['$status', 'confirmed']}, 1, 0]}}
+                    }},
+                    {'$sort': {'_id': 1}}
+                ]
+            }}
+        ]
+        facets = next(mongo.db.nft_transactions.aggregate(pipeline), {})
+
+        breakdown = {
+            'days': days,
+            'since': since.isoformat(),
+            'by_status': {row['_id'] or 'unknown': row['count'] for row in facets.get('by_status', [])},
+            'by_action': {row['_id'] or 'unknown': row['count'] for row in facets.get('by_action', [])},
+            'by_day': [
+                {
+                    'date': row['_id'],
+                    'transactions': row['transactions'],
+                    'mints': row['mints'],
+                    'transfers': row['transfers'],
+                    'confirmed': row['confirmed']
+                }
+                for row in facets.get('by_day', [])
+            ]
+        }
+        self.breakdown_cache.set(days, breakdown)
+        return breakdown
+
+    def get_stats(self, days=None):
+        totals, source = self.totals()
+        return {
+            'total_nfts': totals['nfts'],
+            'total_transactions': totals['transactions'],
+            'total_collections': totals['collections'],
+            'totals_source': source,
+            'breakdown': self.breakdown(days)
+        }
+
+
+# Initialize blockchain stats service instance
+blockchain_stats = BlockchainStatsService(
+    breakdown_ttl=int(os.getenv('BLOCKCHAIN_STATS_TTL', '60')),
+    default_days=int(os.getenv('BLOCKCHAIN_STATS_DAYS', '30'))
+)
@@ -0,0 +1,381 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from circuit_breaker import CircuitOpenError, circuit_breakers
+from http_client import http_client
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a TTL
+
+    The cache is bounded by entry count and, optionally, by the summed size
+    of its entries; the least recently used entries are evicted first.
+    """
+    def __init__(self, max_entries=1000, default_ttl=300, max_bytes=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return a live entry, counting the lookup as a hit or miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at, size = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None, size=0):
+        """Store a value for ttl seconds (default_ttl when omitted)"""
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            self._evict()
+
+    def invalidate(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or
+            (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response holding a decoded JSON payload"""
+    def __init__(self, status_code, payload, from_cache=False, stale=False):
+        self.status_code = status_code
+        self._payload = payload
+        self.from_cache = from_cache
+        self.stale = stale
+
+    def json(self):
+        return self._payload
+
+
+# Seconds an upstream payload stays fresh, per provider. Override with CACHE_TTL_<PROVIDER>.
+DEFAULT_PROVIDER_TTLS = {
+    'gnews': 600,
+    'newsapi': 600,
+    'youtube': 1800,
+    'tmdb': 3600,
+    'coingecko': 60,
+    'themealdb': 86400,
+    'reddit': 300,
+}
+
+# Seconds past its TTL an entry may still be served while a background refresh
+# runs (stale-while-revalidate), per provider; 0 disables it. Override with CACHE_STALE_<PROVIDER>.
+DEFAULT_PROVIDER_STALE_TTLS = {
+    # Covers the ~2h prefetch interval GNews' 1 call/hour budget gives two categories
+    'gnews': 14400,
+    'newsapi': 1800,
+    'youtube': 3600,
+    'tmdb': 3600,
+    'coingecko': 120,
+    'themealdb': 86400,
+    'reddit': 600,
+}
+
+
+class _Flight:
+    """One in-progress upstream fetch that concurrent callers can wait on"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class ResponseCache:
+    """Process-wide cache for upstream GET requests shared by all users
+
+    Entries are keyed by provider plus the normalized URL and query params,
+    so two users asking for the same feed share one upstream call per TTL
+    window. Only successful (HTTP 200) JSON responses are cached; request
+    headers are not part of the key.
+
+    Concurrent misses for one key are coalesced into a single upstream
+    call (single-flight). Once an entry's TTL passes it is still served,
+    marked stale, for the provider's stale window while one background
+    refresh replaces it, so a popular key expiring doesn't send every
+    waiting request upstream at once.
+
+    Past the stale window an entry is kept for outage_ttl more seconds as
+    last-known-good data. It is returned, marked stale, only when the
+    upstream call fails: an error, a 5xx or 429 response, or the
+    provider's circuit being open.
+    """
+    def __init__(self, provider_ttls=None, provider_stale_ttls=None, max_entries=500,
+                 max_bytes=50 * 1024 * 1024, default_ttl=300, default_stale_ttl=0, refresh_workers=4,
+                 outage_ttl=86400):
+        self.provider_ttls = self._with_env_overrides(DEFAULT_PROVIDER_TTLS, provider_ttls, 'CACHE_TTL')
+        self.provider_stale_ttls = self._with_env_overrides(DEFAULT_PROVIDER_STALE_TTLS, provider_stale_ttls, 'CACHE_STALE')
+        self.default_ttl = default_ttl
+        self.default_stale_ttl = default_stale_ttl
+        self.outage_ttl = outage_ttl
+        self._store = TTLCache(max_entries=max_entries, default_ttl=default_ttl, max_bytes=max_bytes)
+        self._provider_stats = {}
+        self._stats_lock = threading.Lock()
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='cache-refresh')
+
+    @staticmethod
+    def _with_env_overrides(defaults, overrides, env_prefix):
+        values = dict(defaults)
+        values.update(overrides or {})
+        for provider in values:
+            env_value = os.getenv(f'{env_prefix}_{provider.upper()}')
+            if env_value:
+                values[provider] = int(env_value)
+        return values
+
+    @staticmethod
+    def make_key(provider, url, params=None):
+        """Normalize provider, URL and params into a stable cache key"""
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if params:
+            query.extend((key, str(value)) for key, value in params.items() if value is not None)
+        normalized_url = urlunsplit((
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path or '/',
+            urlencode(sorted(query)),
+            ''
+        ))
+        return f"{provider}|{normalized_url}"
+
+    def ttl_for(self, provider):
+        return self.provider_ttls.get(provider, self.default_ttl)
+
+    def stale_ttl_for(self, provider):
+        return self.provider_stale_ttls.get(provider, self.default_stale_ttl)
+
+    def _count(self, provider, outcome):
+        with self._stats_lock:
+            counters = self._provider_stats.setdefault(provider, {
+                'hits': 0, 'misses': 0, 'stale': 0, 'coalesced': 0, 'refreshes': 0, 'fallbacks': 0
+            })
+            counters[outcome] += 1
+
+    def get(self, provider, url, params=None, timeout=10, **kwargs):
+        """GET an upstream URL through the cache
+
+        Returns a CachedResponse for cache hits (stale=True when served
+        past its TTL, or as last-known-good data during an outage) and
+        fresh 200 responses, or the raw requests.Response for anything else.
+        """
+        key = self.make_key(provider, url, params)
+        entry = self._store.get(key)
+        last_good = None
+        if entry is not None:
+            cached, fresh_until, stale_until = entry
+            now = time.monotonic()
+            if now < fresh_until:
+                self._count(provider, 'hits')
+                return CachedResponse(cached.status_code, cached.json(), from_cache=True)
+            if now < stale_until:
+                self._count(provider, 'stale')
+                # No point refreshing while the provider's circuit is open
+                if circuit_breakers.for_host(urlsplit(url).netloc.lower()).state != 'open':
+                    self._refresh_in_background(provider, key, url, params, timeout, kwargs)
+                return CachedResponse(cached.status_code, cached.json(), from_cache=True, stale=True)
+            last_good = cached
+
+        self._count(provider, 'misses')
+        try:
+            response = self._get_shared(provider, key, url, params, timeout, kwargs)
+        except Exception as e:
+            if last_good is None:
+                raise
+            if not isinstance(e, CircuitOpenError):
+                print(f"Error fetching {provider} response, serving last known good copy: {e}")
+            return self._fallback(provider, last_good)
+
+        if last_good is not None and (response.status_code >= 500 or response.status_code == 429):
+            return self._fallback(provider, last_good)
+        return response
+
+    def _get_shared(self, provider, key, url, params, timeout, kwargs):
+        """Fetch a key, or wait for the fetch another request already started"""
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+            else:
+                leader = False
+
+        if leader:
+            return self._lead(flight, provider, key, url, params, timeout, kwargs)
+
+        # Another request is already fetching this key; share its result
+        self._count(provider, 'coalesced')
+        if not flight.done.wait(timeout):
+            return self._fetch(provider, key, url, params, timeout, kwargs)
+        if flight.error is not None:
+            raise flight.error
+        return flight.response
+
+    def _fallback(self, provider, cached):
+        self._count(provider, 'fallbacks')
+        return CachedResponse(cached.status_code, cached.json(), from_cache=True, stale=True)
+
+    def refresh(self, provider, url, params=None, timeout=10, **kwargs):
+        """Fetch and store a new copy now, even if the cached one is fresh
+
+        Used by the prefetch scheduler. Joins an in-flight fetch for the
+        same key instead of starting a second one.
+        """
+        key = self.make_key(provider, url, params)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            flight.done.wait(timeout)
+            return flight.response
+
+        self._count(provider, 'refreshes')
+        return self._lead(flight, provider, key, url, params, timeout, kwargs)
+
+    def _lead(self, flight, provider, key, url, params, timeout, kwargs):
+        """Fetch for every caller waiting on this flight, then release them"""
+        try:
+            flight.response = self._fetch(provider, key, url, params, timeout, kwargs)
+            return flight.response
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _refresh_in_background(self, provider, key, url, params, timeout, kwargs):
+        with self._flights_lock:
+            if key in self._flights:
+                return
+            flight = self._flights[key] = _Flight()
+
+        def refresh():
+            try:
+                self._lead(flight, provider, key, url, params, timeout, kwargs)
+            except Exception as e:
+                print(f"Error refreshing cached {provider} response: {e}")
+
+        self._count(provider, 'refreshes')
+        self._refresh_executor.submit(refresh)
+
+    def _fetch(self, provider, key, url, params, timeout, kwargs):
+        response = http_client.get(url, params=params, timeout=timeout, **kwargs)
+        if response.status_code != 200:
+            return response
+
+        cached = CachedResponse(response.status_code, response.json())
+        ttl = self.ttl_for(provider)
+        stale_ttl = self.stale_ttl_for(provider)
+        now = time.monotonic()
+        # Kept past the stale window as last-known-good data for outages
+        self._store.set(
+            key,
+            (cached, now + ttl, now + ttl + stale_ttl),
+            ttl=ttl + stale_ttl + self.outage_ttl,
+            size=len(response.content)
+        )
+        return cached
+
+    def put(self, provider, key, payload, age=0, size=0):
+        """Store a payload fetched elsewhere, age seconds ago (e.g. by another process's prefetcher)"""
+        ttl = self.ttl_for(provider)
+        stale_ttl = self.stale_ttl_for(provider)
+        if age >= ttl + stale_ttl:
+            return False
+        now = time.monotonic() - age
+        self._store.set(
+            key,
+            (CachedResponse(200, payload), now + ttl, now + ttl + stale_ttl),
+            ttl=ttl + stale_ttl + self.outage_ttl - age,
+            size=size
+        )
+        return True
+
+    def invalidate(self, provider, url, params=None):
+        self._store.invalidate(self.make_key(provider, url, params))
+
+    def clear(self):
+        self._store.clear()
+
+    def stats(self):
+        with self._stats_lock:
+            providers = {provider: dict(counters) for provider, counters in self._provider_stats.items()}
+        return {
+            'store': self._store.stats(),
+            'providers': providers,
+            'ttls': dict(self.provider_ttls),
+            'stale_ttls': dict(self.provider_stale_ttls),
+            'outage_ttl': self.outage_ttl
+        }
+
+
+# Initialize shared response cache instance
+response_cache = ResponseCache(
+    max_entries=int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '500')),
+    max_bytes=int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(50 * 1024 * 1024))),
+    outage_ttl=int(os.getenv('RESPONSE_CACHE_OUTAGE_TTL', '86400'))
+)
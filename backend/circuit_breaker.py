@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+
+# Upstream host -> provider name; hosts not listed get a breaker of their own
+HOST_PROVIDERS = {
+    'gnews.io': 'gnews',
+    'newsapi.org': 'newsapi',
+    'www.googleapis.com': 'youtube',
+    'www.reddit.com': 'reddit',
+    'oauth.reddit.com': 'reddit',
+    'api.themoviedb.org': 'tmdb',
+    'api.coingecko.com': 'coingecko',
+    'www.themealdb.com': 'themealdb',
+    'api.openweathermap.org': 'openweather',
+    'wttr.in': 'wttr',
+    'api.verbwire.com': 'verbwire',
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open"""
+    def __init__(self, provider, retry_in):
+        super().__init__(f"{provider} circuit open, retrying in {retry_in:.0f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream provider
+
+    closed: requests go through. After failure_threshold consecutive
+    failures (errors, timeouts, 5xx or 429 responses) the circuit opens
+    and requests fail immediately for reset_timeout seconds. Then it is
+    half-open: one probe request goes through while the others keep
+    failing fast; a successful probe closes the circuit, a failed one
+    opens it again.
+    """
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._opened_at = None
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    def _state(self, now):
+        if self._opened_at is None:
+            return 'closed'
+        if now - self._opened_at < self.reset_timeout:
+            return 'open'
+        return 'half_open'
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def before_request(self):
+        """Let a request through, or raise CircuitOpenError"""
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(now)
+            if state == 'closed':
+                return
+            if state == 'half_open':
+                # A probe that never reported back doesn't block the next one forever
+                if self._probe_started is None or now - self._probe_started >= self.reset_timeout:
+                    self._probe_started = now
+                    return
+            self.rejected += 1
+            retry_in = max(self._opened_at + self.reset_timeout - now, 0)
+        raise CircuitOpenError(self.name, retry_in)
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                print(f"Circuit for {self.name} closed")
+            self.failures = 0
+            self._opened_at = None
+            self._probe_started = None
+
+    def record_failure(self):
+        now = time.monotonic()
+        with self._lock:
+            self.failures += 1
+            if self._state(now) == 'half_open' or (
+                self._opened_at is None and self.failures >= self.failure_threshold
+            ):
+                self._opened_at = now
+                self._probe_started = None
+                self.trips += 1
+                print(f"Circuit for {self.name} opened after {self.failures} consecutive failures")
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(now)
+            return {
+                'state': state,
+                'consecutive_failures': self.failures,
+                'trips': self.trips,
+                'rejected': self.rejected,
+                'retry_in': round(max(self._opened_at + self.reset_timeout - now, 0), 1) if state == 'open' else None
+            }
+
+
+class CircuitBreakerRegistry:
+    """One CircuitBreaker per upstream provider, created on first use"""
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def provider_for_host(host):
+        return HOST_PROVIDERS.get(host, host)
+
+    def get(self, provider):
+        with self._lock:
+            breaker = self._breakers.get(provider)
+            if breaker is None:
+                env_timeout = os.getenv(f'CIRCUIT_RESET_TIMEOUT_{provider.upper()}')
+                breaker = self._breakers[provider] = CircuitBreaker(
+                    provider,
+                    failure_threshold=self.failure_threshold,
+                    reset_timeout=int(env_timeout) if env_timeout else self.reset_timeout
+                )
+            return breaker
+
+    def for_host(self, host):
+        return self.get(self.provider_for_host(host))
+
+    def stats(self):
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {provider: breaker.stats() for provider, breaker in sorted(breakers.items())}
+
+
+# Initialize per-provider circuit breakers
+circuit_breakers = CircuitBreakerRegistry(
+    failure_threshold=int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5')),
+    reset_timeout=int(os.getenv('CIRCUIT_RESET_TIMEOUT', '30'))
+)
@@ -3,12 +3,23 @@ from flask_pymongo import PyMongo
 from flask_bcrypt import Bcrypt
 from datetime import datetime
 from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 import json
+import copy
+
+from cache import TTLCache
 
 # Initialize MongoDB and Bcrypt
 mongo = PyMongo()
 bcrypt = Bcrypt()
 
+# Per-process cache of each user's preference documents, keyed by user id
+preference_cache = TTLCache(
+    max_entries=int(os.getenv('PREFERENCE_CACHE_MAX_ENTRIES', '5000')),
+    default_ttl=int(os.getenv('PREFERENCE_CACHE_TTL', '300'))
+)
+
 class User:
     def __init__(self, email=None, name=None, password_hash=None, _id=None):
         self.email = email
@@ -126,23 +137,76 @@ class UserPreference:
                 },
                 upsert=True
             )
+            preference_cache.invalidate(str(self.user_id))
             return True
         except Exception as e:
             print(f"Error saving user preference: {e}")
             return False
     
+    @staticmethod
+    def bulk_save(user_id, prefs_by_category):
+        """Upsert several categories in one unordered bulk write; returns {category: saved}"""
+        categories = list(prefs_by_category.keys())
+        if not categories:
+            return {}
+        
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {'user_id': user_id, 'category': category},
+                {
+                    '$set': {
+                        'preferences': prefs_by_category[category],
+                        'updated_at': now
+                    },
+                    '$setOnInsert': {
+                        'user_id': user_id,
+                        'category': category,
+                        'created_at': now
+                    }
+                },
+                upsert=True
+            )
+            for category in categories
+        ]
+        
+        results = {category: True for category in categories}
+        try:
+            mongo.db.user_preferences.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Unordered: every other operation was still applied
+            for error in e.details.get('writeErrors', []):
+                results[categories[error['index']]] = False
+            print(f"Error bulk saving user preferences: {e.details.get('writeErrors')}")
+        except Exception as e:
+            print(f"Error bulk saving user preferences: {e}")
+            results = {category: False for category in categories}
+        # Even a partial failure may have written some categories
+        preference_cache.invalidate(str(user_id))
+        return results
+    
+    @staticmethod
+    def _from_doc(doc):
+        pref = UserPreference(doc['user_id'], doc['category'], copy.deepcopy(doc['preferences']))
+        pref.created_at = doc.get('created_at', datetime.utcnow())
+        pref.updated_at = doc.get('updated_at', datetime.utcnow())
+        return pref
+    
+    @staticmethod
+    def _load_docs(user_id):
+        """A user's preference documents, from preference_cache when possible"""
+        docs = preference_cache.get(str(user_id))
+        if docs is None:
+            docs = list(mongo.db.user_preferences.find({'user_id': user_id}))
+            preference_cache.set(str(user_id), docs)
+        return docs
+    
     @staticmethod
     def find_by_user_and_category(user_id, category):
         try:
-            doc = mongo.db.user_preferences.find_one({
-                'user_id': user_id, 
-                'category': category
-            })
-            if doc:
-                pref = UserPreference(doc['user_id'], doc['category'], doc['preferences'])
-                pref.created_at = doc.get('created_at', datetime.utcnow())
-                pref.updated_at = doc.get('updated_at', datetime.utcnow())
-                return pref
+            for doc in UserPreference._load_docs(user_id):
+                if doc['category'] == category:
+                    return UserPreference._from_doc(doc)
             return None
         except Exception as e:
             print(f"Error finding user preference: {e}")
@@ -151,14 +215,7 @@ class UserPreference:
     @staticmethod
     def find_by_user_id(user_id):
         try:
-            docs = mongo.db.user_preferences.find({'user_id': user_id})
-            preferences = []
-            for doc in docs:
-                pref = UserPreference(doc['user_id'], doc['category'], doc['preferences'])
-                pref.created_at = doc.get('created_at', datetime.utcnow())
-                pref.updated_at = doc.get('updated_at', datetime.utcnow())
-                preferences.append(pref)
-            return preferences
+            return [UserPreference._from_doc(doc) for doc in UserPreference._load_docs(user_id)]
         except Exception as e:
             print(f"Error finding user preferences: {e}")
             return []
@@ -216,8 +273,8 @@ class RecipeRequest:
 def test_mongodb_connection():
     """Test MongoDB connection"""
     try:
-        if mongo.client:
-            mongo.client.admin.command('ping')
+        if mongo.cx:
+            mongo.cx.admin.command('ping')
             print("MongoDB connection successful!")
             return True
         else:
@@ -0,0 +1,52 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class FanoutResult:
+    """Outcome of one task in a fan-out: a value, an error, or a timeout"""
+    def __init__(self, key, value=None, error=None, timed_out=False):
+        self.key = key
+        self.value = value
+        self.error = error
+        self.timed_out = timed_out
+
+    @property
+    def ok(self):
+        return self.error is None and not self.timed_out
+
+
+class Fanout:
+    """Run blocking calls concurrently on a bounded, shared thread pool
+
+    All tasks of one fan_out call share a single overall deadline. Tasks that
+    fail or don't finish in time are reported individually, so callers can
+    degrade per item instead of failing the whole response.
+    """
+    def __init__(self, max_workers=16):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fanout')
+
+    def submit(self, fn, *args, **kwargs):
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def fan_out(self, tasks, timeout):
+        """Run (key, callable) pairs and return FanoutResults in input order"""
+        futures = [(key, self._executor.submit(fn)) for key, fn in tasks]
+        wait([future for _, future in futures], timeout=timeout)
+
+        results = []
+        for key, future in futures:
+            if not future.done():
+                # Queued tasks never start; running ones finish in the background
+                future.cancel()
+                results.append(FanoutResult(key, timed_out=True))
+                continue
+            try:
+                results.append(FanoutResult(key, value=future.result()))
+            except Exception as e:
+                results.append(FanoutResult(key, error=e))
+        return results
+
+
+# Initialize shared fan-out pool
+fanout = Fanout(max_workers=int(os.getenv('FANOUT_MAX_WORKERS', '16')))
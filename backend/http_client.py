@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from circuit_breaker import circuit_breakers
+
+
+class HttpClient:
+    """Shared outbound HTTP client with per-host keep-alive connection pools
+
+    Every upstream call (GNews, YouTube, Reddit, TMDB, CoinGecko, TheMealDB,
+    OpenWeather, Verbwire, ...) goes through one requests.Session, so TLS
+    connections are reused across requests instead of being re-established
+    per call. Cookies are never stored, since the session is shared by all
+    users. Per-host latency and connection reuse counters are exposed
+    through stats().
+
+    Each call also passes through its provider's circuit breaker. Errors,
+    timeouts, 5xx and 429 responses count as failures. While a provider's
+    circuit is open, calls raise CircuitOpenError right away instead of
+    waiting out the timeout, so the callers' existing fallbacks answer
+    instantly.
+    """
+    def __init__(self, pool_connections=32, pool_maxsize=32, timeout=10):
+        self.default_timeout = timeout
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self._host_stats = {}
+        self._lock = threading.Lock()
+
+    def request(self, method, url, timeout=None, **kwargs):
+        host = urlsplit(url).netloc.lower()
+        breaker = circuit_breakers.for_host(host)
+        breaker.before_request()
+        start = time.perf_counter()
+        try:
+            response = self.session.request(
+                method,
+                url,
+                timeout=self.default_timeout if timeout is None else timeout,
+                **kwargs
+            )
+        except Exception:
+            self._record(host, time.perf_counter() - start, error=True)
+            breaker.record_failure()
+            raise
+        self._record(host, time.perf_counter() - start)
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def _record(self, host, elapsed, error=False):
+        with self._lock:
+            stats = self._host_stats.setdefault(host, {
+                'requests': 0,
+                'errors': 0,
+                'total_latency': 0.0,
+                'max_latency': 0.0
+            })
+            stats['requests'] += 1
+            stats['total_latency'] += elapsed
+            stats['max_latency'] = max(stats['max_latency'], elapsed)
+            if error:
+                stats['errors'] += 1
+
+    def _pool_counters(self):
+        """Connections opened vs requests served, per host, from urllib3's pools"""
+        counters = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = pool.host.lower()
+            if pool.port and pool.port not in (80, 443):
+                host = f"{host}:{pool.port}"
+            entry = counters.setdefault(host, {'connections_opened': 0, 'pool_requests': 0})
+            entry['connections_opened'] += pool.num_connections
+            entry['pool_requests'] += pool.num_requests
+        return counters
+
+    def stats(self):
+        pool_counters = self._pool_counters()
+        with self._lock:
+            hosts = {}
+            for host, stats in self._host_stats.items():
+                pools = pool_counters.get(host, {'connections_opened': 0, 'pool_requests': 0})
+                hosts[host] = {
+                    'requests': stats['requests'],
+                    'errors': stats['errors'],
+                    'avg_latency_ms': round(stats['total_latency'] * 1000 / stats['requests'], 2),
+                    'max_latency_ms': round(stats['max_latency'] * 1000, 2),
+                    'connections_opened': pools['connections_opened'],
+                    'connections_reused': max(pools['pool_requests'] - pools['connections_opened'], 0)
+                }
+        return {
+            'pool_maxsize': self.adapter._pool_maxsize,
+            'default_timeout': self.default_timeout,
+            'hosts': hosts
+        }
+
+
+# Initialize shared outbound HTTP client
+http_client = HttpClient(
+    pool_connections=int(os.getenv('HTTP_POOL_CONNECTIONS', '32')),
+    pool_maxsize=int(os.getenv('HTTP_POOL_MAXSIZE', '32')),
+    timeout=float(os.getenv('HTTP_DEFAULT_TIMEOUT', '10'))
+)
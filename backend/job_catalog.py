@@ -0,0 +1,131 @@
+import os
+import threading
+
+from job_matcher import KeywordMatcher
+
+# Keyword buckets used to map Internshala job titles/skills onto the job
+# categories users pick during onboarding
+CATEGORY_KEYWORDS = {
+    'frontend_developer': ['frontend', 'front end', 'web', 'react', 'javascript', 'html', 'css', 'vue', 'angular', 'ui developer', 'web developer'],
+    'backend_developer': ['backend', 'back end', 'django', 'flask', 'node', 'server', 'python developer', 'java developer', 'api developer'],
+    'data_analyst': ['data analyst', 'data', 'analyst', 'sql', 'analytics', 'business analyst', 'quantitative analyst'],
+    'ai_ml_engineer': ['ai', 'ml', 'machine learning', 'deep learning', 'artificial intelligence', 'ai engineer', 'ml engineer'],
+    'graphic_designer': ['graphic designer', 'graphic', 'design', 'photoshop', 'illustrator', 'designer', 'visual designer'],
+    'video_editor': ['video editor', 'video', 'edit', 'premiere', 'after effects', 'final cut', 'editor'],
+    'marketing': ['marketing', 'seo', 'ads', 'content', 'digital marketing', 'performance marketing', 'marketing executive'],
+    'android_developer': ['android', 'kotlin', 'flutter', 'java android', 'mobile developer', 'app developer']
+}
+
+DEFAULT_CSV_PATH = os.path.join(os.path.dirname(__file__), 'internshala_jobs_fully_cleaned_final.csv')
+
+
+class _JobSnapshot:
+    """Immutable, column-oriented copy of the jobs CSV plus its category index"""
+    def __init__(self, mtime, titles, companies, locations, salaries, work_from_home,
+                 links, skills, titles_lower, skills_lower, index):
+        self.mtime = mtime
+        self.titles = titles
+        self.companies = companies
+        self.locations = locations
+        self.salaries = salaries
+        self.work_from_home = work_from_home
+        self.links = links
+        self.skills = skills
+        self.titles_lower = titles_lower
+        self.skills_lower = skills_lower
+        self.index = index
+
+    def __len__(self):
+        return len(self.titles)
+
+
+class JobCatalog:
+    def __init__(self, csv_path=DEFAULT_CSV_PATH):
+        self.csv_path = csv_path
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self.matcher = KeywordMatcher(CATEGORY_KEYWORDS)
+
+    def available(self):
+        """Check whether the jobs CSV exists on disk"""
+        return os.path.exists(self.csv_path)
+
+    def load(self):
+        """Load the CSV if it has never been loaded or its mtime changed"""
+        mtime = os.path.getmtime(self.csv_path)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.mtime == mtime:
+            return snapshot
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.mtime == mtime:
+                return snapshot
+
+            snapshot = self._read_snapshot(mtime)
+            self._snapshot = snapshot
+            self.matcher.invalidate(keep_key=mtime)
+            print(f"Job catalog loaded: {len(snapshot)} jobs from {os.path.basename(self.csv_path)}")
+            return snapshot
+
+    def _read_snapshot(self, mtime):
+        import pandas as pd
+
+        df = pd.read_csv(self.csv_path)
+
+        skills = df['Skills'].tolist()
+        titles_lower = df['Job Title'].astype(str).str.lower()
+        skills_lower = df['Skills'].astype(str).str.lower()
+
+        return _JobSnapshot(
+            mtime=mtime,
+            titles=df['Job Title'].tolist(),
+            companies=df['Company Name'].tolist(),
+            locations=df['Location'].tolist(),
+            salaries=df['Salary'].tolist(),
+            work_from_home=(df['Work From Home'] == 'Yes').tolist(),
+            links=df['Job Link'].tolist(),
+            skills=[value.split(', ') if pd.notna(value) else [] for value in skills],
+            titles_lower=titles_lower.tolist(),
+            skills_lower=skills_lower.tolist(),
+            index=self._build_index(titles_lower, skills_lower, mtime)
+        )
+
+    def _build_index(self, titles_lower, skills_lower, mtime):
+        """Map each category to the row ids whose title or skills match one of its keywords"""
+        import numpy as np
+
+        text = self.matcher.combine(titles_lower, skills_lower)
+        masks = self.matcher.masks(text, cache_key=mtime)
+        return {category: np.flatnonzero(mask).tolist() for category, mask in masks.items()}
+
+    def _job(self, snapshot, row_id, job_id, category):
+        return {
+            "id": job_id,
+            "title": snapshot.titles[row_id],
+            "company": snapshot.companies[row_id],
+            "location": snapshot.locations[row_id],
+            "salary": snapshot.salaries[row_id],
+            "work_from_home": snapshot.work_from_home[row_id],
+            "job_link": snapshot.links[row_id],
+            "skills": list(snapshot.skills[row_id]),
+            "category": category
+        }
+
+    def jobs_for_category(self, category, limit=None, start_id=1):
+        """Return jobs matching a category, numbered from start_id"""
+        snapshot = self.load()
+        row_ids = snapshot.index.get(category, [])
+        if limit is not None:
+            row_ids = row_ids[:max(limit, 0)]
+        return [self._job(snapshot, row_id, start_id + i, category) for i, row_id in enumerate(row_ids)]
+
+    def head(self, count, category="general"):
+        """Return the first rows of the catalog, unfiltered"""
+        snapshot = self.load()
+        return [self._job(snapshot, row_id, row_id + 1, category) for row_id in range(min(count, len(snapshot)))]
+
+
+# Initialize job catalog instance
+job_catalog = JobCatalog()
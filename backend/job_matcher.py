@@ -0,0 +1,64 @@
+import re
+import threading
+
+
+class KeywordMatcher:
+    """Vectorized substring matcher for job category keyword buckets
+
+    Each category's keyword list is compiled into a single alternation regex
+    and evaluated over a whole string column at once. Masks are cached per
+    (cache_key, category) so a catalog version only pays for matching once.
+    """
+    def __init__(self, category_keywords):
+        self.category_keywords = category_keywords
+        self.patterns = {
+            category: self._compile(keywords)
+            for category, keywords in category_keywords.items()
+        }
+        self._masks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _compile(keywords):
+        unique_keywords = dict.fromkeys(keywords)
+        return re.compile('|'.join(re.escape(keyword) for keyword in unique_keywords))
+
+    @staticmethod
+    def combine(titles_lower, skills_lower):
+        """Join lowercased title and skills columns into one searchable column
+
+        The newline separator never appears in a keyword, so a match can't
+        straddle the two fields.
+        """
+        return titles_lower + '\n' + skills_lower
+
+    def mask(self, category, text, cache_key=None):
+        """Return a boolean NumPy mask of rows in text matching the category"""
+        pattern = self.patterns.get(category)
+        if pattern is None:
+            import numpy as np
+            return np.zeros(len(text), dtype=bool)
+
+        if cache_key is not None:
+            cached = self._masks.get((cache_key, category))
+            if cached is not None:
+                return cached
+
+        result = text.str.contains(pattern, regex=True).to_numpy(dtype=bool)
+
+        if cache_key is not None:
+            with self._lock:
+                self._masks[(cache_key, category)] = result
+        return result
+
+    def masks(self, text, cache_key=None):
+        """Return masks for every known category"""
+        return {category: self.mask(category, text, cache_key) for category in self.patterns}
+
+    def invalidate(self, keep_key=None):
+        """Drop cached masks, optionally keeping the ones for keep_key"""
+        with self._lock:
+            self._masks = {
+                key: value for key, value in self._masks.items()
+                if keep_key is not None and key[0] == keep_key
+            }
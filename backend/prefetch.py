@@ -0,0 +1,324 @@
+import heapq
+import json
+import os
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from database import mongo
+
+# Upstream calls per hour the prefetcher may spend, per provider, across all
+# processes. Kept well under the free daily quotas (GNews: 100 requests,
+# YouTube: 100 searches) so user requests for other keys still get through;
+# the providers' stale windows in cache.py are long enough to cover the
+# stretched intervals. Override with PREFETCH_BUDGET_<PROVIDER>; user
+# requests are not counted.
+DEFAULT_PROVIDER_BUDGETS = {
+    'gnews': 1,
+    'youtube': 1,
+    'tmdb': 60,
+    'coingecko': 60,
+    'reddit': 240,
+}
+
+LEASE_ID = 'prefetch'
+
+
+class PrefetchJob:
+    def __init__(self, name, provider, build_request, interval, timeout=10, headers=None):
+        self.name = name
+        self.provider = provider
+        self.build_request = build_request
+        self.interval = interval
+        self.timeout = timeout
+        # Optional callable returning request headers (e.g. a current auth token)
+        self.headers = headers
+        self.runs = 0
+        self.skipped = 0
+        self.errors = 0
+        self.synced = 0
+        self.last_run = None
+        self.last_status = None
+        # fetched_at of the shared payload this process last loaded
+        self.loaded_at = None
+
+
+class PrefetchScheduler:
+    """Keeps hot upstream feeds warm in every worker's response cache
+
+    Each job's build_request() returns the (url, params) its handler passes
+    to response_cache.get, from the same helper, so prefetched entries have
+    the handler's cache key. Jobs run every interval seconds (by default a
+    little under the provider's TTL) with random jitter so they don't fire
+    together. Intervals are stretched to fit each provider's hourly budget;
+    a job whose budget is spent is retried in the next hour. start() warns
+    when a stretched interval outgrows the provider's TTL plus stale window,
+    since entries would then expire between refreshes.
+
+    Every worker process runs a scheduler. The holder of a lease in the
+    service_leases collection fetches upstream and publishes each payload to
+    the prefetch_payloads collection; the other processes load those payloads
+    into their own cache every sync_interval seconds instead of calling the
+    upstream. If the holder exits, another process takes over once the lease
+    expires, and budget spend, counted in prefetch_budgets, carries over.
+    stats() reports only in-process state, so /health never waits on MongoDB.
+    """
+    def __init__(self, cache, budgets=None, jitter=0.1, lease_ttl=60, sync_interval=60):
+        self.cache = cache
+        self.jitter = jitter
+        self.budgets = dict(DEFAULT_PROVIDER_BUDGETS)
+        self.budgets.update(budgets or {})
+        for provider in self.budgets:
+            env_budget = os.getenv(f'PREFETCH_BUDGET_{provider.upper()}')
+            if env_budget:
+                self.budgets[provider] = int(env_budget)
+        self.lease_ttl = lease_ttl
+        self.sync_interval = sync_interval
+        self.holder = None
+        self.jobs = []
+        self._spent = {}
+        self._leader_until = 0.0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, name, provider, build_request, interval=None, timeout=10, headers=None):
+        """Register a hot key; interval defaults to 90% of the provider's cache TTL"""
+        interval = interval or self.cache.ttl_for(provider) * 0.9
+        job = PrefetchJob(name, provider, build_request, interval, timeout, headers)
+        with self._lock:
+            self.jobs.append(job)
+        self._wakeup.set()
+        return job
+
+    def _jittered(self, interval):
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def effective_interval(self, job):
+        """The job's interval, stretched so all of its provider's jobs fit the hourly budget"""
+        budget = self.budgets.get(job.provider)
+        if not budget:
+            return job.interval
+        with self._lock:
+            provider_jobs = sum(1 for other in self.jobs if other.provider == job.provider)
+        return max(job.interval, 3600 * provider_jobs / budget)
+
+    def _check_coverage(self, job):
+        longest_gap = self.effective_interval(job) * (1 + self.jitter)
+        kept_for = self.cache.ttl_for(job.provider) + self.cache.stale_ttl_for(job.provider)
+        if longest_gap > kept_for:
+            print(f"WARNING: prefetch job {job.name} may run every {longest_gap:.0f}s but {job.provider} "
+                  f"entries are only kept for {kept_for}s; raise PREFETCH_BUDGET_{job.provider.upper()} "
+                  f"or CACHE_STALE_{job.provider.upper()}")
+
+    def is_leader(self):
+        """Take or renew the prefetch lease; only its holder calls upstreams
+
+        The result is reused for a third of the lease so the lease isn't
+        written before every job.
+        """
+        if time.monotonic() < self._leader_until:
+            return True
+
+        now = datetime.utcnow()
+        try:
+            mongo.db.service_leases.find_one_and_update(
+                {'_id': LEASE_ID, '$or': [{'holder': self.holder}, {'expires_at': {'$lt': now}}]},
+                {'$set': {
+                    'holder': self.holder,
+                    'expires_at': now + timedelta(seconds=self.lease_ttl),
+                    'updated_at': now
+                }},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # Another process holds a live lease
+            return False
+        except Exception as e:
+            print(f"Error taking prefetch lease: {e}")
+            return False
+        self._leader_until = time.monotonic() + self.lease_ttl / 3
+        return True
+
+    def _take_budget(self, provider):
+        """Spend one call from the provider's shared budget for the current hour"""
+        budget = self.budgets.get(provider)
+        if budget is None:
+            return True
+        hour = int(time.time() // 3600)
+        try:
+            # The filter fails once the budget is spent; the upsert then hits the existing _id
+            counter = mongo.db.prefetch_budgets.find_one_and_update(
+                {'_id': f'{provider}:{hour}', 'spent': {'$lt': budget}},
+                {
+                    '$inc': {'spent': 1},
+                    '$setOnInsert': {'expires_at': datetime.utcfromtimestamp((hour + 2) * 3600)}
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            self._spent[provider] = (hour, budget)
+            return False
+        except Exception as e:
+            print(f"Error updating prefetch budget for {provider}: {e}")
+            return False
+        self._spent[provider] = (hour, counter['spent'])
+        return True
+
+    def run_job(self, job):
+        """Fetch a job's payload upstream into this process's cache and publish it to the others"""
+        job.last_run = time.time()
+        try:
+            url, params = job.build_request()
+            kwargs = {'headers': job.headers()} if job.headers else {}
+            response = self.cache.refresh(job.provider, url, params=params, timeout=job.timeout, **kwargs)
+            job.last_status = response.status_code if response is not None else None
+            job.runs += 1
+            if job.last_status == 200:
+                self._publish(job, self.cache.make_key(job.provider, url, params), response.json())
+            return True
+        except Exception as e:
+            job.errors += 1
+            print(f"Error prefetching {job.name}: {e}")
+            return False
+
+    def _publish(self, job, key, payload):
+        now = datetime.utcnow()
+        kept_for = self.cache.ttl_for(job.provider) + self.cache.stale_ttl_for(job.provider)
+        mongo.db.prefetch_payloads.update_one(
+            {'_id': key},
+            {'$set': {
+                'provider': job.provider,
+                # Stored as text: upstream payloads may have keys MongoDB doesn't accept
+                'payload': json.dumps(payload),
+                'fetched_at': now,
+                'expires_at': now + timedelta(seconds=kept_for)
+            }},
+            upsert=True
+        )
+        job.loaded_at = now
+
+    def sync_job(self, job):
+        """Load the payload the lease holder published for a job, if it is newer than ours"""
+        try:
+            url, params = job.build_request()
+            key = self.cache.make_key(job.provider, url, params)
+            doc = mongo.db.prefetch_payloads.find_one({'_id': key})
+            if not doc or (job.loaded_at and doc['fetched_at'] <= job.loaded_at):
+                return False
+            age = (datetime.utcnow() - doc['fetched_at']).total_seconds()
+            payload = doc['payload']
+            self.cache.put(job.provider, key, json.loads(payload), age=age, size=len(payload))
+            job.loaded_at = doc['fetched_at']
+            job.synced += 1
+            return True
+        except Exception as e:
+            print(f"Error loading shared prefetch payload for {job.name}: {e}")
+            return False
+
+    def _next_hour_delay(self):
+        """Seconds until a little after the next budget hour starts"""
+        return 3600 - time.time() % 3600 + random.uniform(0, 300)
+
+    def start(self):
+        """Start the scheduler thread once per process"""
+        if self._thread and self._thread.is_alive():
+            return self._thread
+
+        def run():
+            queue = []
+            scheduled = set()
+            while not self._stop.is_set():
+                with self._lock:
+                    new_jobs = [job for job in self.jobs if id(job) not in scheduled]
+                for job in new_jobs:
+                    scheduled.add(id(job))
+                    self._check_coverage(job)
+                    # Stagger the first round over a few seconds instead of firing every job at once
+                    heapq.heappush(queue, (time.monotonic() + random.uniform(0, 5), id(job), job))
+
+                if not queue:
+                    self._wakeup.wait(60)
+                    self._wakeup.clear()
+                    continue
+
+                next_run, _, job = queue[0]
+                delay = next_run - time.monotonic()
+                if delay > 0:
+                    # Woken early when jobs are added or on stop
+                    self._wakeup.wait(delay)
+                    self._wakeup.clear()
+                    continue
+
+                heapq.heappop(queue)
+                if not self.is_leader():
+                    # Another process fetches; pick up what it published
+                    self.sync_job(job)
+                    delay = self._jittered(min(self.effective_interval(job), self.sync_interval))
+                elif not self._take_budget(job.provider):
+                    job.skipped += 1
+                    delay = self._next_hour_delay()
+                else:
+                    self.run_job(job)
+                    delay = self._jittered(self.effective_interval(job))
+                heapq.heappush(queue, (time.monotonic() + delay, id(job), job))
+
+        # Per process: gunicorn workers fork after import, so the pid is read here
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        self._leader_until = 0.0
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name='prefetch-scheduler', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+
+    def stats(self):
+        """In-process state only; never touches MongoDB"""
+        with self._lock:
+            jobs = list(self.jobs)
+        hour = int(time.time() // 3600)
+        return {
+            'running': bool(self._thread and self._thread.is_alive()),
+            'leader': time.monotonic() < self._leader_until,
+            'budgets_per_hour': dict(self.budgets),
+            # As last seen by this process when it spent budget
+            'spent_this_hour': {
+                provider: spent for provider, (spent_hour, spent) in list(self._spent.items()) if spent_hour == hour
+            },
+            'jobs': [
+                {
+                    'name': job.name,
+                    'provider': job.provider,
+                    'interval': round(self.effective_interval(job)),
+                    'runs': job.runs,
+                    'synced': job.synced,
+                    'skipped': job.skipped,
+                    'errors': job.errors,
+                    'last_status': job.last_status
+                }
+                for job in jobs
+            ]
+        }
+
+
+def initialize_prefetch_indexes():
+    """Initialize MongoDB indexes for the prefetch scheduler"""
+    try:
+        # Old hourly budget counters and published payloads are removed by MongoDB
+        mongo.db.prefetch_budgets.create_index("expires_at", expireAfterSeconds=0)
+        mongo.db.prefetch_payloads.create_index("expires_at", expireAfterSeconds=0)
+        print("Prefetch MongoDB indexes created successfully!")
+        return True
+    except Exception as e:
+        print(f"Error creating prefetch MongoDB indexes: {e}")
+        return False
@@ -0,0 +1,285 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from pymongo import ASCENDING, UpdateOne
+
+from database import mongo
+from http_client import http_client
+
+MEALDB_BASE_URL = "https://www.themealdb.com/api/json/v1/1"
+
+# Cuisine preference -> TheMealDB area name
+CUISINE_AREAS = {
+    'italian': 'Italian',
+    'chinese': 'Chinese',
+    'indian': 'Indian',
+    'mexican': 'Mexican',
+    'french': 'French',
+    'american': 'American',
+    'british': 'British',
+    'thai': 'Thai',
+    'japanese': 'Japanese'
+}
+
+
+def area_for_cuisine(cuisine):
+    """Map a user cuisine preference onto a TheMealDB area"""
+    return CUISINE_AREAS.get(cuisine.lower(), cuisine.title())
+
+
+class RecipeStore:
+    """Local MongoDB copy of fully detailed TheMealDB meals
+
+    Meals are stored whole (as returned by lookup.php) keyed by idMeal and
+    indexed by area and category, so cuisine queries are one indexed read.
+    A background refresher keeps the configured areas up to date and stamps
+    an area in the recipe_areas collection once every meal TheMealDB lists
+    for it is stored. Single lookups also add meals, so only a stamped area
+    is known to be complete.
+    """
+    def __init__(self, max_age_hours=24, refresh_interval=6 * 3600, lookup_concurrency=8):
+        self.max_age = timedelta(hours=max_age_hours)
+        self.refresh_interval = refresh_interval
+        self.lookup_concurrency = lookup_concurrency
+        self._refresher = None
+        self._stop = threading.Event()
+        self._lookup_executor = ThreadPoolExecutor(max_workers=lookup_concurrency, thread_name_prefix='recipe-lookup')
+
+    @property
+    def collection(self):
+        return mongo.db.recipes
+
+    @property
+    def areas(self):
+        return mongo.db.recipe_areas
+
+    @staticmethod
+    def _to_doc(meal):
+        doc = dict(meal)
+        doc['_id'] = meal['idMeal']
+        doc['area_lower'] = (meal.get('strArea') or '').lower()
+        doc['category_lower'] = (meal.get('strCategory') or '').lower()
+        doc['refreshed_at'] = datetime.utcnow()
+        return doc
+
+    @staticmethod
+    def _to_meal(doc):
+        meal = dict(doc)
+        for key in ('_id', 'area_lower', 'category_lower', 'refreshed_at'):
+            meal.pop(key, None)
+        return meal
+
+    def save_many(self, meals):
+        """Upsert detailed meals in one bulk write"""
+        operations = [
+            UpdateOne({'_id': meal['idMeal']}, {'$set': self._to_doc(meal)}, upsert=True)
+            for meal in meals if meal and meal.get('idMeal')
+        ]
+        if not operations:
+            return 0
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            return result.upserted_count + result.modified_count
+        except Exception as e:
+            print(f"Error saving recipes to store: {e}")
+            return 0
+
+    def find_by_area(self, area, limit=None):
+        """Return stored meals for an area, ordered by name like filter.php"""
+        try:
+            cursor = self.collection.find({'area_lower': area.lower()}).sort('strMeal', ASCENDING)
+            if limit:
+                cursor = cursor.limit(limit)
+            return [self._to_meal(doc) for doc in cursor]
+        except Exception as e:
+            print(f"Error reading recipes for area {area}: {e}")
+            return []
+
+    def is_area_complete(self, area):
+        """True if a refresh stored every meal in the area within the last max_age"""
+        try:
+            doc = self.areas.find_one({'_id': area.lower()})
+        except Exception as e:
+            print(f"Error reading recipe area {area}: {e}")
+            return False
+        return bool(doc) and doc['completed_at'] >= datetime.utcnow() - self.max_age
+
+    def _mark_area_complete(self, area, meal_count):
+        try:
+            self.areas.update_one(
+                {'_id': area.lower()},
+                {'$set': {'area': area, 'meal_count': meal_count, 'completed_at': datetime.utcnow()}},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"Error marking recipe area {area} complete: {e}")
+
+    def find_by_category(self, category, limit=None):
+        try:
+            cursor = self.collection.find({'category_lower': category.lower()}).sort('strMeal', ASCENDING)
+            if limit:
+                cursor = cursor.limit(limit)
+            return [self._to_meal(doc) for doc in cursor]
+        except Exception as e:
+            print(f"Error reading recipes for category {category}: {e}")
+            return []
+
+    def get(self, meal_id):
+        try:
+            doc = self.collection.find_one({'_id': str(meal_id)})
+            return self._to_meal(doc) if doc else None
+        except Exception as e:
+            print(f"Error reading recipe {meal_id}: {e}")
+            return None
+
+    def lookup(self, meal_id, timeout=5):
+        """Return a detailed meal, calling lookup.php only on a store miss"""
+        meal = self.get(meal_id)
+        if meal:
+            return meal
+
+        meal = self._fetch_detail(meal_id, timeout)
+        if meal:
+            self.save_many([meal])
+        return meal
+
+    def _fetch_detail(self, meal_id, timeout):
+        try:
+            response = http_client.get(f"{MEALDB_BASE_URL}/lookup.php", params={'i': meal_id}, timeout=timeout)
+            if response.status_code != 200:
+                return None
+            meals = response.json().get('meals') or []
+            return meals[0] if meals else None
+        except Exception as e:
+            print(f"Error looking up recipe {meal_id}: {e}")
+            return None
+
+    def iter_lookup_many(self, meal_ids, timeout=5):
+        """Yield detailed meals (or None) in input order, fetching store misses concurrently
+
+        Stored meals come from one $in read; the rest are fetched from
+        lookup.php at most lookup_concurrency at a time. Closing the
+        generator early cancels lookups that haven't started yet.
+        """
+        meal_ids = [str(meal_id) for meal_id in meal_ids]
+        try:
+            stored = {
+                doc['_id']: self._to_meal(doc)
+                for doc in self.collection.find({'_id': {'$in': meal_ids}})
+            }
+        except Exception as e:
+            print(f"Error reading recipes from store: {e}")
+            stored = {}
+
+        futures = {
+            meal_id: self._lookup_executor.submit(self._fetch_detail, meal_id, timeout)
+            for meal_id in dict.fromkeys(meal_ids) if meal_id not in stored
+        }
+        fetched = []
+        try:
+            for meal_id in meal_ids:
+                if meal_id in stored:
+                    yield stored[meal_id]
+                    continue
+                meal = futures[meal_id].result()
+                if meal:
+                    stored[meal_id] = meal
+                    fetched.append(meal)
+                yield meal
+        finally:
+            for future in futures.values():
+                future.cancel()
+            self.save_many(fetched)
+
+    def lookup_many(self, meal_ids, timeout=5):
+        """Return detailed meals (or None) for a list of ids, in input order"""
+        return list(self.iter_lookup_many(meal_ids, timeout=timeout))
+
+    def refresh_area(self, area, timeout=8):
+        """Pull an area's meal list and store details for new or stale meals"""
+        response = http_client.get(f"{MEALDB_BASE_URL}/filter.php", params={'a': area}, timeout=timeout)
+        if response.status_code != 200:
+            return 0
+        meal_ids = [meal['idMeal'] for meal in (response.json().get('meals') or [])]
+        if not meal_ids:
+            return 0
+
+        fresh_after = datetime.utcnow() - self.max_age
+        fresh_ids = {
+            doc['_id'] for doc in self.collection.find(
+                {'_id': {'$in': meal_ids}, 'refreshed_at': {'$gte': fresh_after}},
+                {'_id': 1}
+            )
+        }
+
+        refreshed = []
+        missing = 0
+        for meal_id in meal_ids:
+            if meal_id in fresh_ids:
+                continue
+            if self._stop.is_set():
+                missing += 1
+                continue
+            meal = self._fetch_detail(meal_id, timeout)
+            if meal:
+                refreshed.append(meal)
+            else:
+                missing += 1
+            # Be gentle with the free TheMealDB tier
+            time.sleep(0.1)
+
+        count = self.save_many(refreshed)
+        if not missing and count == len(refreshed):
+            self._mark_area_complete(area, len(meal_ids))
+        return count
+
+    def refresh_all(self, areas=None):
+        for area in (areas or CUISINE_AREAS.values()):
+            if self._stop.is_set():
+                break
+            try:
+                count = self.refresh_area(area)
+                print(f"Recipe store refreshed {count} {area} recipes")
+            except Exception as e:
+                print(f"Error refreshing {area} recipes: {e}")
+
+    def start_refresher(self, areas=None):
+        """Start the background refresher thread once per process"""
+        if self._refresher and self._refresher.is_alive():
+            return self._refresher
+
+        def run():
+            while not self._stop.is_set():
+                self.refresh_all(areas)
+                self._stop.wait(self.refresh_interval)
+
+        self._stop.clear()
+        self._refresher = threading.Thread(target=run, name='recipe-store-refresher', daemon=True)
+        self._refresher.start()
+        return self._refresher
+
+    def stop_refresher(self):
+        self._stop.set()
+
+
+def initialize_recipe_indexes():
+    """Initialize MongoDB indexes for the recipe store"""
+    try:
+        mongo.db.recipes.create_index([("area_lower", 1), ("strMeal", 1)])
+        mongo.db.recipes.create_index([("category_lower", 1), ("strMeal", 1)])
+        print("Recipe store MongoDB indexes created successfully!")
+        return True
+    except Exception as e:
+        print(f"Error creating recipe store MongoDB indexes: {e}")
+        return False
+
+
+# Initialize recipe store instance
+recipe_store = RecipeStore(
+    max_age_hours=int(os.getenv('RECIPE_STORE_MAX_AGE_HOURS', '24')),
+    refresh_interval=int(os.getenv('RECIPE_STORE_REFRESH_INTERVAL', str(6 * 3600))),
+    lookup_concurrency=int(os.getenv('RECIPE_LOOKUP_CONCURRENCY', '8'))
+)
@@ -0,0 +1,126 @@
+import threading
+import time
+from datetime import datetime
+
+from database import mongo
+from http_client import http_client
+
+REDDIT_TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+REDDIT_USER_AGENT = 'OneHub Dashboard/1.0'
+
+
+class RedditTokenManager:
+    """Caches Reddit's client-credentials access token and refreshes it ahead of expiry
+
+    The token lives in process memory and in the service_tokens collection,
+    so every thread and every worker process shares one token instead of
+    POSTing to /api/v1/access_token before each fetch. A timer refreshes
+    the token refresh_margin seconds before it expires.
+    """
+    def __init__(self, client_id, client_secret, refresh_margin=300, timeout=10):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def _is_fresh(self, expires_at):
+        return expires_at - time.time() > self.refresh_margin
+
+    def get_token(self):
+        """Return a valid access token, fetching one only when none is cached"""
+        if self._token and self._is_fresh(self._expires_at):
+            return self._token
+
+        with self._lock:
+            if self._token and self._is_fresh(self._expires_at):
+                return self._token
+
+            shared = self._load_shared()
+            if shared and self._is_fresh(shared[1]):
+                self._token, self._expires_at = shared
+            else:
+                self._fetch()
+            self._schedule_refresh()
+            return self._token
+
+    def invalidate(self):
+        """Forget the cached token, e.g. after Reddit answers 401"""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0.0
+            try:
+                mongo.db.service_tokens.delete_one({'_id': 'reddit'})
+            except Exception as e:
+                print(f"Error clearing shared Reddit token: {e}")
+
+    def _fetch(self):
+        response = http_client.post(
+            REDDIT_TOKEN_URL,
+            data={'grant_type': 'client_credentials'},
+            headers={'User-Agent': REDDIT_USER_AGENT},
+            auth=(self.client_id, self.client_secret),
+            timeout=self.timeout
+        )
+        if response.status_code != 200:
+            raise Exception(f"Reddit auth failed with status {response.status_code}")
+
+        token_data = response.json()
+        self._token = token_data.get('access_token')
+        self._expires_at = time.time() + int(token_data.get('expires_in', 3600))
+        self._store_shared()
+
+    def _load_shared(self):
+        try:
+            doc = mongo.db.service_tokens.find_one({'_id': 'reddit'})
+            if doc and doc.get('access_token'):
+                return doc['access_token'], doc['expires_at'].timestamp()
+        except Exception as e:
+            print(f"Error reading shared Reddit token: {e}")
+        return None
+
+    def _store_shared(self):
+        try:
+            mongo.db.service_tokens.update_one(
+                {'_id': 'reddit'},
+                {'$set': {
+                    'access_token': self._token,
+                    'expires_at': datetime.fromtimestamp(self._expires_at),
+                    'updated_at': datetime.utcnow()
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"Error storing shared Reddit token: {e}")
+
+    def _schedule_refresh(self):
+        if self._timer:
+            self._timer.cancel()
+        delay = max(self._expires_at - time.time() - self.refresh_margin, 1)
+        self._timer = threading.Timer(delay, self._refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self):
+        try:
+            with self._lock:
+                # Another worker may already have refreshed the shared token
+                shared = self._load_shared()
+                if shared and shared[1] > self._expires_at and self._is_fresh(shared[1]):
+                    self._token, self._expires_at = shared
+                else:
+                    self._fetch()
+                self._schedule_refresh()
+        except Exception as e:
+            print(f"Error refreshing Reddit token: {e}")
+
+    def auth_headers(self):
+        """Headers for an oauth.reddit.com request"""
+        return {
+            'Authorization': f'Bearer {self.get_token()}',
+            'User-Agent': REDDIT_USER_AGENT
+        }
+
@@ -0,0 +1,46 @@
+"""Cooperative (gevent) server for the backend
+
+Every request runs in a greenlet instead of an OS thread. Monkey-patching
+makes the sockets used by requests (GNews, YouTube, TMDB, OpenWeather,
+Verbwire, ...) and pymongo non-blocking, so a request waiting on an
+upstream yields to the others and thousands of open requests share one
+OS thread. Handlers and their JSON responses are unchanged.
+
+Run from the backend directory:  python serve_async.py
+"""
+from gevent import monkey
+monkey.patch_all()
+
+import os
+
+# Greenlets are cheap, so the shared pools can be much larger than in threaded mode.
+# These defaults must be set before app (and the pool singletons) are imported.
+os.environ.setdefault('FANOUT_MAX_WORKERS', '256')
+os.environ.setdefault('DASHBOARD_MAX_WORKERS', '256')
+os.environ.setdefault('RECIPE_LOOKUP_CONCURRENCY', '32')
+os.environ.setdefault('HTTP_POOL_MAXSIZE', '256')
+
+from gevent.pool import Pool
+from gevent.pywsgi import WSGIServer
+
+from app import app, warm_up
+
+
+def serve(host='0.0.0.0', port=5000, max_connections=None):
+    """Serve the app on a gevent WSGI server with a bounded greenlet pool"""
+    max_connections = max_connections or int(os.getenv('ASYNC_MAX_CONNECTIONS', '2000'))
+    server = WSGIServer((host, port), app, spawn=Pool(max_connections))
+
+    print(f"🚀 Starting async (gevent) server on http://{host}:{port}")
+    print(f"⚡ Up to {max_connections} concurrent connections")
+    server.start()
+    # Bound and listening: run deferred initialization in the background
+    warm_up()
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    serve(
+        host=os.getenv('HOST', '0.0.0.0'),
+        port=int(os.getenv('PORT', '5000'))
+    )
@@ -0,0 +1,140 @@
+"""Startup profiling and deferred initialization for the backend
+
+app.py records its foreground startup phases here and hands heavy work
+(MongoDB indexes, the pandas-backed jobs catalog, the Verbwire client,
+the recipe refresher) to warm_up(), which runs it on a background thread
+once the server is listening.
+
+Usage: python startup.py [--module app] [--top 20]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """Wall-clock timings of startup phases, foreground and background"""
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases = []
+        self._last_mark = self.started_at
+        self._lock = threading.Lock()
+        self._warmup_thread = None
+        self._warmup_done = threading.Event()
+
+    def _record(self, name, seconds, background):
+        with self._lock:
+            self.phases.append({
+                'phase': name,
+                'seconds': round(seconds, 4),
+                'background': background
+            })
+
+    def mark(self, name):
+        """Record a foreground phase that ran since the previous mark"""
+        now = time.perf_counter()
+        self._record(name, now - self._last_mark, background=False)
+        self._last_mark = now
+
+    @contextmanager
+    def phase(self, name, background=False):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, time.perf_counter() - start, background)
+
+    def warm_up(self, tasks):
+        """Run (name, callable) tasks once per process, in order, on a background thread"""
+        if self._warmup_thread is not None:
+            return self._warmup_thread
+        with self._lock:
+            if self._warmup_thread is not None:
+                return self._warmup_thread
+
+            def run():
+                for name, task in tasks:
+                    try:
+                        with self.phase(name, background=True):
+                            task()
+                    except Exception as e:
+                        print(f"Error during startup warm-up ({name}): {e}")
+                self._warmup_done.set()
+
+            self._warmup_thread = threading.Thread(target=run, name='startup-warmup', daemon=True)
+            self._warmup_thread.start()
+            return self._warmup_thread
+
+    def wait(self, timeout=None):
+        """Block until background warm-up has finished"""
+        return self._warmup_done.wait(timeout)
+
+    def report(self):
+        with self._lock:
+            phases = list(self.phases)
+        return {
+            'phases': phases,
+            'foreground_seconds': round(sum(p['seconds'] for p in phases if not p['background']), 4),
+            'warmup_started': self._warmup_thread is not None,
+            'warmup_done': self._warmup_done.is_set()
+        }
+
+
+def importtime_report(module='app', top=20, cwd=None):
+    """Import a module in a fresh interpreter under -X importtime; slowest imports first"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=cwd
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        rows.append({
+            'module': name.strip(),
+            'self_ms': round(int(self_us) / 1000, 1),
+            'cumulative_ms': round(int(cumulative_us) / 1000, 1)
+        })
+    rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+    return rows[:top]
+
+
+# Process-wide startup profile; importing this module starts the clock
+startup_profile = StartupProfile()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Profile backend cold start")
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+
+    print(f"Slowest imports for 'import {args.module}' (python -X importtime):")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for row in importtime_report(args.module, args.top, cwd=backend_dir):
+        print(f"{row['cumulative_ms']:>14} {row['self_ms']:>9}  {row['module']}")
+
+    # Time the foreground import, then the background warm-up, in this process
+    sys.path.insert(0, backend_dir)
+    import_start = time.perf_counter()
+    app_module = __import__(args.module)
+    print(f"\nimport {args.module}: {time.perf_counter() - import_start:.3f}s")
+
+    # app recorded its phases on the imported startup module, not on this __main__ copy
+    from startup import startup_profile as app_profile
+    if hasattr(app_module, 'warm_up'):
+        app_module.warm_up()
+        app_profile.wait()
+
+    print("\nStartup phases:")
+    for phase in app_profile.report()['phases']:
+        where = 'background' if phase['background'] else 'foreground'
+        print(f"  {phase['phase']:<20} {phase['seconds']:>8.3f}s  {where}")
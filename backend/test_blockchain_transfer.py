@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Check that a queued transfer of a token we have no NFTMetadata row for confirms its transaction
+
+Runs against the MongoDB in MONGO_URI (a throwaway database by default);
+the Verbwire API is replaced by a stub answering 200. Skipped when that
+MongoDB isn't reachable.
+"""
+import os
+from unittest import mock
+
+import pytest
+from flask import Flask
+from dotenv import load_dotenv
+
+from database import mongo
+from blockchain_models import NFTTransaction
+from blockchain_jobs import blockchain_jobs
+from http_client import http_client
+
+load_dotenv()
+app = Flask(__name__)
+app.config['MONGO_URI'] = os.getenv(
+    'TEST_MONGO_URI',
+    'mongodb://localhost:27017/onehub_blockchain_check?serverSelectionTimeoutMS=2000'
+)
+mongo.init_app(app)
+
+
+class StubResponse:
+    status_code = 200
+    text = ''
+
+    def json(self):
+        return {'transactionHash': '0xabc123', 'status': 'success'}
+
+
+def test_transfer_of_unknown_token_confirms_transaction():
+    with app.app_context(), \
+            mock.patch.object(http_client, 'post', return_value=StubResponse()), \
+            mock.patch.object(blockchain_jobs._executor, 'submit'):
+        try:
+            mongo.cx.admin.command('ping')
+        except Exception as e:
+            pytest.skip(f"MongoDB not reachable: {e}")
+
+        params = {
+            'contract_address': '0xcontract',
+            'token_id': '42',  # an on-chain token id, not one of our ObjectIds
+            'from_address': '0xfrom',
+            'to_address': '0xto'
+        }
+        job = blockchain_jobs.enqueue('transfer', params)
+        # Run the worker inline; the pool submission above was stubbed out
+        blockchain_jobs._run(job['_id'])
+
+        finished = blockchain_jobs.get(str(job['_id']))
+        transaction = NFTTransaction.find_by_id(job['transaction_id'])
+        assert finished['status'] == 'succeeded', finished
+        assert transaction.status == 'confirmed', transaction.status
+        assert transaction.tx_id == '0xabc123', transaction.tx_id
+        print("✅ Transfer of a token not in the database confirmed its transaction")
+
+
+if __name__ == "__main__":
+    test_transfer_of_unknown_token_confirms_transaction()
@@ -1,9 +1,12 @@
-import requests
 import json
 import os
 import base64
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from blockchain_models import NFTMetadata, NFTTransaction, NFTCollection
+from cache import TTLCache
+from http_client import http_client
 
 class VerbwireService:
     def __init__(self):
@@ -12,6 +15,28 @@ class VerbwireService:
         self.public_api_key = os.getenv('VERBWIRE_PUBLIC_KEY')
         self.base_url = "https://api.verbwire.com/v1"
         
+        # Verbwire's view of a wallet, keyed by lowercased address; dropped when the wallet mints or transfers
+        self.wallet_cache = TTLCache(
+            max_entries=int(os.getenv('VERBWIRE_WALLET_CACHE_MAX_ENTRIES', '1000')),
+            default_ttl=int(os.getenv('VERBWIRE_WALLET_CACHE_TTL', '60'))
+        )
+        
+        # Wallet lookups get their own small pool, one in-flight call per wallet, and a
+        # timeout close to the /getNFTs deadline so slow calls count as breaker failures
+        self.wallet_timeout = float(os.getenv('VERBWIRE_WALLET_TIMEOUT', '4'))
+        self._wallet_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('VERBWIRE_WALLET_CONCURRENCY', '4')),
+            thread_name_prefix='verbwire-wallet'
+        )
+        self._wallet_lookups = {}
+        # Bumped by invalidate_wallet so lookups started before a mint or transfer don't cache their result
+        self._wallet_generations = {}
+        self._wallet_lock = threading.Lock()
+        
+        # Bounds concurrent IPFS uploads and mint calls for mint_batch
+        self.batch_concurrency = int(os.getenv('VERBWIRE_BATCH_CONCURRENCY', '8'))
+        self._batch_executor = ThreadPoolExecutor(max_workers=self.batch_concurrency, thread_name_prefix='verbwire-batch')
+        
         # Validate API keys
         if not self.secret_api_key or not self.public_api_key:
             print("WARNING: Verbwire API keys not found in environment variables")
@@ -32,15 +57,57 @@ class VerbwireService:
             return False, "API keys not configured"
         return True, "API keys configured"
     
-    def mint_nft(self, recipient_address, name, description, image_url, attributes=None):
+    def _record_transaction(self, transaction, **fields):
+        """Fill in and save a pending NFTTransaction, or create a new one"""
+        timestamp = fields.pop('timestamp', None)
+        if transaction is None:
+            transaction = NFTTransaction(**fields)
+        else:
+            for key, value in fields.items():
+                setattr(transaction, key, value)
+        if timestamp:
+            transaction.timestamp = timestamp
+        transaction.save()
+        return transaction
+    
+    def invalidate_wallet(self, *wallet_addresses):
+        """Forget cached Verbwire NFTs for wallets whose holdings just changed
+
+        Lookups already in flight keep running for their callers, but new
+        requests start a fresh one and the old result is not cached.
+        """
+        with self._wallet_lock:
+            for wallet_address in wallet_addresses:
+                if wallet_address:
+                    key = wallet_address.lower()
+                    self._wallet_generations[key] = self._wallet_generations.get(key, 0) + 1
+                    self._wallet_lookups.pop(key, None)
+                    self.wallet_cache.invalidate(key)
+    
+    def _cache_wallet(self, key, generation, result):
+        """Cache a wallet lookup unless the wallet was invalidated after it started"""
+        with self._wallet_lock:
+            if self._wallet_generations.get(key, 0) == generation:
+                self.wallet_cache.set(key, result)
+    
+    def mint_nft(self, recipient_address, name, description, image_url, attributes=None, transaction=None):
         """
         Mint a new NFT using Verbwire API with fallback to mock implementation
+        
+        transaction: a pending NFTTransaction (from a queued job) to confirm
+        instead of creating a new record
         """
+        result = self._mint_nft(recipient_address, name, description, image_url, attributes, transaction)
+        if result.get('success'):
+            self.invalidate_wallet(recipient_address)
+        return result
+    
+    def _mint_nft(self, recipient_address, name, description, image_url, attributes, transaction=None):
         try:
             # Validate API keys
             keys_valid, keys_message = self._validate_api_keys()
             if not keys_valid:
-                return self._create_mock_nft(recipient_address, name, description, image_url, attributes)
+                return self._create_mock_nft(recipient_address, name, description, image_url, attributes, transaction)
             
             # Validate input parameters
             if not all([recipient_address, name, description, image_url]):
@@ -50,7 +117,7 @@ class VerbwireService:
                 }
             
             # Try to mint with Verbwire API
-            result = self._attempt_verbwire_mint(recipient_address, name, description, image_url, attributes)
+            result = self._attempt_verbwire_mint(recipient_address, name, description, image_url, attributes, transaction)
             
             if result['success']:
                 return result
@@ -58,74 +125,193 @@ class VerbwireService:
                 # Fallback to mock implementation
                 print(f"Verbwire minting failed: {result['error']}")
                 print("Falling back to mock implementation...")
-                return self._create_mock_nft(recipient_address, name, description, image_url, attributes)
+                return self._create_mock_nft(recipient_address, name, description, image_url, attributes, transaction)
                 
         except Exception as e:
             print(f"Minting failed: {str(e)}")
-            return self._create_mock_nft(recipient_address, name, description, image_url, attributes)
+            return self._create_mock_nft(recipient_address, name, description, image_url, attributes, transaction)
     
-    def _attempt_verbwire_mint(self, recipient_address, name, description, image_url, attributes):
+    def _attempt_verbwire_mint(self, recipient_address, name, description, image_url, attributes, transaction=None):
         """Attempt to mint NFT using Verbwire API"""
         try:
-            # Create metadata
-            metadata = {
-                "name": name,
-                "description": description,
-                "image": image_url,
-                "attributes": attributes or []
-            }
-            
-            # Try to upload metadata to IPFS
-            metadata_url = self._upload_metadata_to_ipfs(metadata)
-            if not metadata_url:
-                return {
-                    'success': False,
-                    'error': 'Failed to upload metadata to IPFS'
-                }
-            
-            # Try different minting endpoints
-            minting_endpoints = [
-                f"{self.base_url}/nft/mint/mintFromMetadata",
-                f"{self.base_url}/nft/mint/mint",
-                f"{self.base_url}/nft/mint",
-                f"{self.base_url}/mint/nft"
-            ]
+            metadata = self._build_metadata(name, description, image_url, attributes)
+            result = self._submit_verbwire_mint(recipient_address, metadata)
+            if result['success']:
+                return self._save_nft_to_database(name, description, image_url, recipient_address, result['data'], transaction)
+            return result
             
-            payload = {
-                "recipientAddress": recipient_address,
-                "data": metadata_url,
-                "chain": "sepolia"
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f"Verbwire minting error: {str(e)}"
             }
+    
+    @staticmethod
+    def _build_metadata(name, description, image_url, attributes):
+        return {
+            "name": name,
+            "description": description,
+            "image": image_url,
+            "attributes": attributes or []
+        }
+    
+    def _submit_verbwire_mint(self, recipient_address, metadata):
+        """Upload metadata to IPFS and mint it; returns Verbwire's response without saving anything"""
+        # Try to upload metadata to IPFS
+        metadata_url = self._upload_metadata_to_ipfs(metadata)
+        if not metadata_url:
+            return {
+                'success': False,
+                'error': 'Failed to upload metadata to IPFS'
+            }
+        
+        # Try different minting endpoints
+        minting_endpoints = [
+            f"{self.base_url}/nft/mint/mintFromMetadata",
+            f"{self.base_url}/nft/mint/mint",
+            f"{self.base_url}/nft/mint",
+            f"{self.base_url}/mint/nft"
+        ]
+        
+        payload = {
+            "recipientAddress": recipient_address,
+            "data": metadata_url,
+            "chain": "sepolia"
+        }
+        
+        headers = self._get_headers(use_secret=True)
+        
+        for url in minting_endpoints:
+            try:
+                print(f"DEBUG: Trying minting endpoint: {url}")
+                response = http_client.post(url, json=payload, headers=headers, timeout=30)
+                print(f"DEBUG: Response status: {response.status_code}")
+                
+                if response.status_code == 200:
+                    return {
+                        'success': True,
+                        'data': response.json()
+                    }
+                else:
+                    print(f"DEBUG: Endpoint {url} failed with status {response.status_code}")
+                    continue
+                    
+            except Exception as e:
+                print(f"DEBUG: Endpoint {url} failed with error: {e}")
+                continue
+        
+        return {
+            'success': False,
+            'error': "All Verbwire minting endpoints failed"
+        }
+    
+    def mint_batch(self, specs, on_item=None):
+        """
+        Mint many NFTs at once. Metadata uploads and mint calls run
+        batch_concurrency at a time; the resulting NFTs and transactions are
+        saved with one insert_many each. Items that Verbwire can't mint fall
+        back to mock NFTs, like mint_nft. on_item(index, outcome), if given,
+        is called as each item's mint call returns, before anything is saved.
+        Returns per-item results in input order.
+        """
+        keys_valid, _ = self._validate_api_keys()
+        required_fields = ['recipient_address', 'name', 'description', 'image_url']
+        
+        def mint_one(index, spec):
+            missing = [field for field in required_fields if not spec.get(field)]
+            if missing:
+                return {'success': False, 'error': f"Missing required parameters: {', '.join(missing)}"}
             
-            headers = self._get_headers(use_secret=True)
-            
-            for url in minting_endpoints:
+            if keys_valid:
                 try:
-                    print(f"DEBUG: Trying minting endpoint: {url}")
-                    response = requests.post(url, json=payload, headers=headers, timeout=30)
-                    print(f"DEBUG: Response status: {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        return self._save_nft_to_database(name, description, image_url, recipient_address, result)
-                    else:
-                        print(f"DEBUG: Endpoint {url} failed with status {response.status_code}")
-                        continue
-                        
+                    metadata = self._build_metadata(spec['name'], spec['description'], spec['image_url'], spec.get('attributes'))
+                    result = self._submit_verbwire_mint(spec['recipient_address'], metadata)
+                    if result['success']:
+                        return result
+                    print(f"Verbwire minting failed for batch item {index}: {result['error']}")
                 except Exception as e:
-                    print(f"DEBUG: Endpoint {url} failed with error: {e}")
-                    continue
+                    print(f"Minting failed for batch item {index}: {str(e)}")
             
+            # Fallback to mock implementation; the index keeps mock tx ids unique within the batch
             return {
-                'success': False,
-                'error': "All Verbwire minting endpoints failed"
+                'success': True,
+                'is_mock': True,
+                'data': {'transactionHash': f"mock_tx_{datetime.utcnow().timestamp()}_{index}"}
             }
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'error': f"Verbwire minting error: {str(e)}"
+        
+        def mint_and_report(index, spec):
+            outcome = mint_one(index, spec)
+            if on_item:
+                on_item(index, outcome)
+            return outcome
+        
+        futures = [self._batch_executor.submit(mint_and_report, index, spec) for index, spec in enumerate(specs)]
+        outcomes = [future.result() for future in futures]
+        
+        # Persist every minted item with one write per collection
+        minted = [(spec, outcome) for spec, outcome in zip(specs, outcomes) if outcome['success']]
+        now = datetime.utcnow()
+        nfts = [
+            NFTMetadata(
+                name=spec['name'],
+                description=spec['description'],
+                image_url=spec['image_url'],
+                owner_wallet=spec['recipient_address'],
+                mint_date=now
+            )
+            for spec, _ in minted
+        ]
+        # NFTs written before a failed insert keep their ids; only those get transactions
+        NFTMetadata.insert_many(nfts)
+        transactions = {
+            id(nft): NFTTransaction(
+                nft_id=nft._id,
+                action='mint',
+                to_wallet=nft.owner_wallet,
+                tx_id=outcome['data'].get('transactionHash'),
+                status='confirmed'
+            )
+            for nft, (_, outcome) in zip(nfts, minted)
+            if nft._id is not None
+        }
+        NFTTransaction.insert_many(list(transactions.values()))
+        
+        results = []
+        minted_items = iter(zip(nfts, minted))
+        for index, outcome in enumerate(outcomes):
+            if not outcome['success']:
+                results.append({'index': index, 'success': False, 'error': outcome['error']})
+                continue
+            nft, (spec, outcome) = next(minted_items)
+            if nft._id is None:
+                results.append({'index': index, 'success': False, 'error': 'Database save failed'})
+                continue
+            is_mock = outcome.get('is_mock', False)
+            item = {
+                'index': index,
+                'success': True,
+                'nft_id': nft.get_id(),
+                'transaction_hash': outcome['data'].get('transactionHash'),
+                'token_id': str(nft._id) if is_mock else outcome['data'].get('tokenId'),
+                'contract_address': 'mock_contract' if is_mock else outcome['data'].get('contractAddress'),
+                'is_mock': is_mock,
+                'transaction_recorded': transactions[id(nft)]._id is not None
             }
+            if not item['transaction_recorded']:
+                # The NFT is minted and saved; only its history entry is missing
+                item['warning'] = 'Minted, but the transaction record could not be saved'
+            results.append(item)
+        
+        self.invalidate_wallet(*{spec['recipient_address'] for spec, _ in minted})
+        
+        minted_count = sum(1 for result in results if result['success'])
+        return {
+            'success': minted_count > 0,
+            'minted': minted_count,
+            'failed': len(results) - minted_count,
+            'results': results,
+            'error': None if minted_count else 'No NFTs in the batch were minted'
+        }
     
     def _upload_metadata_to_ipfs(self, metadata):
         """Upload metadata to IPFS with fallback"""
@@ -146,7 +332,7 @@ class VerbwireService:
             
             for url in endpoints:
                 try:
-                    response = requests.post(url, json=payload, headers=headers, timeout=30)
+                    response = http_client.post(url, json=payload, headers=headers, timeout=30)
                     if response.status_code == 200:
                         result = response.json()
                         metadata_url = (
@@ -180,7 +366,7 @@ class VerbwireService:
         except:
             return None
     
-    def _create_mock_nft(self, recipient_address, name, description, image_url, attributes):
+    def _create_mock_nft(self, recipient_address, name, description, image_url, attributes, transaction=None):
         """Create a mock NFT for testing purposes"""
         try:
             # Save NFT metadata to database
@@ -193,15 +379,15 @@ class VerbwireService:
             )
             nft.save()
             
-            # Save transaction record
-            transaction = NFTTransaction(
+            # Save transaction record (confirming the queued job's pending one, if any)
+            transaction = self._record_transaction(
+                transaction,
                 nft_id=nft._id,
                 action='mint',
                 to_wallet=recipient_address,
                 tx_id=f"mock_tx_{datetime.utcnow().timestamp()}",
                 status='confirmed'
             )
-            transaction.save()
             
             return {
                 'success': True,
@@ -221,7 +407,7 @@ class VerbwireService:
                 'error': f"Mock NFT creation failed: {str(e)}"
             }
     
-    def _save_nft_to_database(self, name, description, image_url, recipient_address, verbwire_result):
+    def _save_nft_to_database(self, name, description, image_url, recipient_address, verbwire_result, transaction=None):
         """Save NFT to database after successful Verbwire minting"""
         try:
             # Save NFT metadata to database
@@ -234,15 +420,15 @@ class VerbwireService:
             )
             nft.save()
             
-            # Save transaction record
-            transaction = NFTTransaction(
+            # Save transaction record (confirming the queued job's pending one, if any)
+            transaction = self._record_transaction(
+                transaction,
                 nft_id=nft._id,
                 action='mint',
                 to_wallet=recipient_address,
                 tx_id=verbwire_result.get('transactionHash'),
                 status='confirmed'
             )
-            transaction.save()
             
             return {
                 'success': True,
@@ -259,22 +445,28 @@ class VerbwireService:
                 'error': f"Database save failed: {str(e)}"
             }
     
-    def transfer_nft(self, contract_address, token_id, from_address, to_address):
-        """Transfer an NFT with fallback to mock implementation"""
+    def transfer_nft(self, contract_address, token_id, from_address, to_address, transaction=None):
+        """Transfer an NFT with fallback to mock implementation (transaction: see mint_nft)"""
+        result = self._transfer_nft(contract_address, token_id, from_address, to_address, transaction)
+        if result.get('success'):
+            self.invalidate_wallet(from_address, to_address)
+        return result
+    
+    def _transfer_nft(self, contract_address, token_id, from_address, to_address, transaction=None):
         try:
             # Try Verbwire API first
-            result = self._attempt_verbwire_transfer(contract_address, token_id, from_address, to_address)
+            result = self._attempt_verbwire_transfer(contract_address, token_id, from_address, to_address, transaction)
             
             if result['success']:
                 return result
             else:
                 # Fallback to mock implementation
-                return self._create_mock_transfer(contract_address, token_id, from_address, to_address)
+                return self._create_mock_transfer(contract_address, token_id, from_address, to_address, transaction)
                 
         except Exception as e:
-            return self._create_mock_transfer(contract_address, token_id, from_address, to_address)
+            return self._create_mock_transfer(contract_address, token_id, from_address, to_address, transaction)
     
-    def _attempt_verbwire_transfer(self, contract_address, token_id, from_address, to_address):
+    def _attempt_verbwire_transfer(self, contract_address, token_id, from_address, to_address, transaction=None):
         """Attempt to transfer NFT using Verbwire API"""
         try:
             url = f"{self.base_url}/nft/transfer"
@@ -287,28 +479,30 @@ class VerbwireService:
             }
             
             headers = self._get_headers(use_secret=True)
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = http_client.post(url, json=payload, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
                 
-                # Update NFT owner in database
+                # Update NFT owner in database (on-chain tokens we didn't mint have no row)
                 nft = NFTMetadata.find_by_id(token_id)
                 if nft:
                     nft.owner_wallet = to_address
                     nft.updated_at = datetime.utcnow()
                     nft.save()
-                    
-                    # Save transaction record
-                    transaction = NFTTransaction(
-                        nft_id=nft._id,
+                
+                # Save transaction record; a queued job's pending one is confirmed either way
+                if nft or transaction is not None:
+                    transaction = self._record_transaction(
+                        transaction,
+                        nft_id=nft._id if nft else transaction.nft_id,
                         action='transfer',
                         from_wallet=from_address,
                         to_wallet=to_address,
                         tx_id=result.get('transactionHash'),
-                        status='confirmed'
+                        status='confirmed',
+                        timestamp=datetime.utcnow()
                     )
-                    transaction.save()
                 
                 return {
                     'success': True,
@@ -327,7 +521,7 @@ class VerbwireService:
                 'error': f"Transfer failed: {str(e)}"
             }
     
-    def _create_mock_transfer(self, contract_address, token_id, from_address, to_address):
+    def _create_mock_transfer(self, contract_address, token_id, from_address, to_address, transaction=None):
         """Create a mock transfer for testing"""
         try:
             # Update NFT owner in database
@@ -337,16 +531,17 @@ class VerbwireService:
                 nft.updated_at = datetime.utcnow()
                 nft.save()
                 
-                # Save transaction record
-                transaction = NFTTransaction(
+                # Save transaction record (confirming the queued job's pending one, if any)
+                transaction = self._record_transaction(
+                    transaction,
                     nft_id=nft._id,
                     action='transfer',
                     from_wallet=from_address,
                     to_wallet=to_address,
                     tx_id=f"mock_transfer_{datetime.utcnow().timestamp()}",
-                    status='confirmed'
+                    status='confirmed',
+                    timestamp=datetime.utcnow()
                 )
-                transaction.save()
                 
                 return {
                     'success': True,
@@ -407,7 +602,7 @@ class VerbwireService:
             }
             
             headers = self._get_headers(use_secret=False)
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            response = http_client.get(url, params=params, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
@@ -427,13 +622,22 @@ class VerbwireService:
                 'error': f"API call failed: {str(e)}"
             }
     
-    def get_nfts_by_wallet(self, wallet_address):
-        """Get NFTs by wallet with fallback to database"""
+    def get_nfts_by_wallet(self, wallet_address, fallback=True):
+        """Get NFTs by wallet with fallback to database (skipped when fallback is False)"""
         try:
+            key = wallet_address.lower()
+            cached = self.wallet_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            generation = self._wallet_generations.get(key, 0)
             # Try Verbwire API first
             result = self._attempt_verbwire_wallet_nfts(wallet_address)
             
             if result['success']:
+                self._cache_wallet(key, generation, result)
+                return result
+            elif not fallback:
                 return result
             else:
                 # Fallback to database
@@ -455,6 +659,35 @@ class VerbwireService:
                 'error': f"Failed to get wallet NFTs: {str(e)}"
             }
     
+    def submit_wallet_lookup(self, wallet_address):
+        """Start a Verbwire-only wallet lookup in the background, or join the one in flight
+
+        Returns a Future for get_nfts_by_wallet(wallet_address, fallback=False);
+        cached wallets get an already-completed one. invalidate_wallet drops
+        the in-flight lookup, so later callers never join a pre-change one.
+        """
+        key = wallet_address.lower()
+        cached = self.wallet_cache.get(key)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+        
+        with self._wallet_lock:
+            future = self._wallet_lookups.get(key)
+            if future is not None:
+                return future
+            future = self._wallet_executor.submit(self.get_nfts_by_wallet, wallet_address, False)
+            self._wallet_lookups[key] = future
+        
+        def forget(done_future):
+            with self._wallet_lock:
+                if self._wallet_lookups.get(key) is done_future:
+                    del self._wallet_lookups[key]
+        
+        future.add_done_callback(forget)
+        return future
+    
     def _attempt_verbwire_wallet_nfts(self, wallet_address):
         """Attempt to get NFTs from Verbwire API"""
         try:
@@ -465,7 +698,7 @@ class VerbwireService:
             }
             
             headers = self._get_headers(use_secret=False)
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            response = http_client.get(url, params=params, headers=headers, timeout=self.wallet_timeout)
             
             if response.status_code == 200:
                 result = response.json()
@@ -495,7 +728,7 @@ class VerbwireService:
             }
             
             headers = self._get_headers(use_secret=False)
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            response = http_client.get(url, params=params, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
@@ -542,7 +775,7 @@ class VerbwireService:
             }
             
             headers = self._get_headers(use_secret=True)
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = http_client.post(url, json=payload, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
@@ -613,7 +846,7 @@ class VerbwireService:
             }
             
             headers = self._get_headers(use_secret=False)
-            response = requests.get(url, params=params, headers=headers, timeout=30)
+            response = http_client.get(url, params=params, headers=headers, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()
@@ -657,7 +890,7 @@ class VerbwireService:
             }
             
             headers = self._get_headers(use_secret=False)
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = http_client.get(url, params=params, headers=headers, timeout=10)
             
             if response.status_code in [200, 400, 404]:
                 return {
@@ -679,5 +912,15 @@ class VerbwireService:
                 'fallback_available': True
             }
 
-# Initialize Verbwire service instance
-verbwire_service = VerbwireService()
+# Shared Verbwire service instance, created on first use (or by the startup warm-up)
+_verbwire_service = None
+_verbwire_lock = threading.Lock()
+
+def get_verbwire_service():
+    """Return the shared VerbwireService, creating it on first call"""
+    global _verbwire_service
+    if _verbwire_service is None:
+        with _verbwire_lock:
+            if _verbwire_service is None:
+                _verbwire_service = VerbwireService()
+    return _verbwire_service
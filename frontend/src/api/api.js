@@ -30,6 +30,12 @@ class ApiService {
     }
   }
 
+  // Aggregated dashboard endpoint: every card in one request
+  async getDashboard(sections = []) {
+    const query = sections.length ? `?sections=${sections.join(',')}` : '';
+    return this.request(`/api/dashboard${query}`);
+  }
+
   // News endpoints
   async getNews() {
     return this.request('/api/news');
@@ -75,6 +81,13 @@ class ApiService {
     return this.request(`/api/weather?city=${city}`);
   }
 
+  // Several cities in one request; resolves to [{ query, weather }] in request order
+  async getWeatherBatch(cities = []) {
+    const params = new URLSearchParams();
+    cities.forEach((city) => params.append('city', city));
+    return this.request(`/api/weather/batch?${params.toString()}`);
+  }
+
   // Crypto endpoints
   async getCrypto() {
     return this.request('/api/crypto');
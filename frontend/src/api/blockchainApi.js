@@ -25,7 +25,27 @@ class BlockchainApiService {
     return response.json();
   }
 
-  // Mint a new NFT
+  // Get the status of a queued mint or transfer
+  async getJob(jobId) {
+    const response = await fetch(`${this.baseURL}/jobs/${jobId}`, {
+      headers: this.getAuthHeaders()
+    });
+    return this.handleResponse(response);
+  }
+
+  // Poll a queued job until it finishes; resolves with its result, throws if it failed
+  async waitForJob(jobId, { interval = 1000, timeout = 120000 } = {}) {
+    const deadline = Date.now() + timeout;
+    while (Date.now() < deadline) {
+      const job = await this.getJob(jobId);
+      if (job.status === 'succeeded') return { ...job.result, job_id: jobId };
+      if (job.status === 'failed') throw new Error(job.error || 'Blockchain job failed');
+      await new Promise((resolve) => setTimeout(resolve, interval));
+    }
+    throw new Error('Timed out waiting for blockchain job');
+  }
+
+  // Mint a new NFT (queued on the server; resolves once the mint job finishes)
   async mintNFT(nftData) {
     try {
       console.log('DEBUG: Sending mint request to:', `${this.baseURL}/mintNFT`);
@@ -37,14 +57,31 @@ class BlockchainApiService {
         headers: this.getAuthHeaders(),
         body: JSON.stringify(nftData)
       });
-      return await this.handleResponse(response);
+      const job = await this.handleResponse(response);
+      return await this.waitForJob(job.job_id);
     } catch (error) {
       console.error('Error minting NFT:', error);
       throw error;
     }
   }
 
-  // Transfer an NFT
+  // Mint many NFTs in one call; resolves with per-item results once the batch job finishes
+  async mintNFTBatch(nfts) {
+    try {
+      const response = await fetch(`${this.baseURL}/mintNFTBatch`, {
+        method: 'POST',
+        headers: this.getAuthHeaders(),
+        body: JSON.stringify({ nfts })
+      });
+      const job = await this.handleResponse(response);
+      return await this.waitForJob(job.job_id, { timeout: 600000 });
+    } catch (error) {
+      console.error('Error minting NFT batch:', error);
+      throw error;
+    }
+  }
+
+  // Transfer an NFT (queued on the server; resolves once the transfer job finishes)
   async transferNFT(transferData) {
     try {
       const response = await fetch(`${this.baseURL}/transferNFT`, {
@@ -52,19 +89,30 @@ class BlockchainApiService {
         headers: this.getAuthHeaders(),
         body: JSON.stringify(transferData)
       });
-      return await this.handleResponse(response);
+      const job = await this.handleResponse(response);
+      return await this.waitForJob(job.job_id);
     } catch (error) {
       console.error('Error transferring NFT:', error);
       throw error;
     }
   }
 
-  // Get NFTs (optionally filtered by wallet)
-  async getNFTs(walletAddress = '') {
+  // Build the query string for a paginated listing (limit, after, fields)
+  buildPageParams(page = {}, params = new URLSearchParams()) {
+    if (page.limit) params.append('limit', page.limit);
+    if (page.after) params.append('after', page.after);
+    if (page.fields) params.append('fields', [].concat(page.fields).join(','));
+    return params;
+  }
+
+  // Get NFTs (optionally filtered by wallet); unfiltered results are paged,
+  // pass page.after = response.next_after to fetch the next page
+  async getNFTs(walletAddress = '', page = {}) {
     try {
-      const url = walletAddress 
-        ? `${this.baseURL}/getNFTs?wallet=${encodeURIComponent(walletAddress)}`
-        : `${this.baseURL}/getNFTs`;
+      const params = walletAddress
+        ? new URLSearchParams({ wallet: walletAddress })
+        : this.buildPageParams(page);
+      const url = `${this.baseURL}/getNFTs${params.toString() ? '?' + params.toString() : ''}`;
       
       const response = await fetch(url, {
         headers: this.getAuthHeaders()
@@ -91,11 +139,12 @@ class BlockchainApiService {
   }
 
   // Get transactions (optionally filtered by wallet or NFT ID)
-  async getTransactions(filters = {}) {
+  async getTransactions(filters = {}, page = {}) {
     try {
       const params = new URLSearchParams();
       if (filters.wallet) params.append('wallet', filters.wallet);
       if (filters.nft_id) params.append('nft_id', filters.nft_id);
+      if (!filters.wallet && !filters.nft_id) this.buildPageParams(page, params);
       
       const url = `${this.baseURL}/getTransactions${params.toString() ? '?' + params.toString() : ''}`;
       
@@ -110,10 +159,12 @@ class BlockchainApiService {
     }
   }
 
-  // Get collections
-  async getCollections() {
+  // Get collections (paged like getNFTs)
+  async getCollections(page = {}) {
     try {
-      const response = await fetch(`${this.baseURL}/getCollections`, {
+      const params = this.buildPageParams(page);
+      const url = `${this.baseURL}/getCollections${params.toString() ? '?' + params.toString() : ''}`;
+      const response = await fetch(url, {
         headers: this.getAuthHeaders()
       });
       return await this.handleResponse(response);
@@ -12,6 +12,10 @@ const BlockchainPage = ({ onBack }) => {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const [walletAddress, setWalletAddress] = useState('');
+  // Cursors for the next page of each unfiltered listing; null when there is none
+  const [nftsNextAfter, setNftsNextAfter] = useState(null);
+  const [transactionsNextAfter, setTransactionsNextAfter] = useState(null);
+  const [collectionsNextAfter, setCollectionsNextAfter] = useState(null);
 
   // Mint NFT form state
   const [mintForm, setMintForm] = useState({
@@ -59,11 +63,13 @@ const BlockchainPage = ({ onBack }) => {
     };
   };
 
-  const fetchNFTs = async (wallet = '') => {
+  // Pass after (a previous page's next_after) to append the next page instead of replacing the list
+  const fetchNFTs = async (wallet = '', after = null) => {
     try {
       setLoading(true);
-      const data = await blockchainApiService.getNFTs(wallet);
-      setNfts(data.nfts || []);
+      const data = await blockchainApiService.getNFTs(wallet, after ? { after } : {});
+      setNfts(after ? (current) => [...current, ...(data.nfts || [])] : (data.nfts || []));
+      setNftsNextAfter(!wallet && data.has_more ? data.next_after : null);
     } catch (error) {
       console.error('Error fetching NFTs:', error);
       setError('Failed to fetch NFTs');
@@ -72,22 +78,24 @@ const BlockchainPage = ({ onBack }) => {
     }
   };
 
-  const fetchTransactions = async (wallet = '') => {
+  const fetchTransactions = async (wallet = '', after = null) => {
     try {
       const filters = wallet ? { wallet } : {};
-      const data = await blockchainApiService.getTransactions(filters);
-      setTransactions(data.transactions || []);
+      const data = await blockchainApiService.getTransactions(filters, after ? { after } : {});
+      setTransactions(after ? (current) => [...current, ...(data.transactions || [])] : (data.transactions || []));
+      setTransactionsNextAfter(!wallet && data.has_more ? data.next_after : null);
     } catch (error) {
       console.error('Error fetching transactions:', error);
       setError('Failed to fetch transactions');
     }
   };
 
-  const fetchCollections = async () => {
+  const fetchCollections = async (after = null) => {
     try {
-      const data = await blockchainApiService.getCollections();
+      const data = await blockchainApiService.getCollections(after ? { after } : {});
       console.log('DEBUG: Collections data received:', data);
-      setCollections(data.collections || []);
+      setCollections(after ? (current) => [...current, ...(data.collections || [])] : (data.collections || []));
+      setCollectionsNextAfter(data.has_more ? data.next_after : null);
     } catch (error) {
       console.error('Error fetching collections:', error);
     }
@@ -239,6 +247,11 @@ const BlockchainPage = ({ onBack }) => {
           </div>
         )}
       </div>
+      {nftsNextAfter && (
+        <button type="button" onClick={() => fetchNFTs('', nftsNextAfter)} disabled={loading} className="load-more-btn">
+          {loading ? 'Loading...' : 'Load more'}
+        </button>
+      )}
     </div>
   );
 
@@ -272,6 +285,11 @@ const BlockchainPage = ({ onBack }) => {
           </div>
         )}
       </div>
+      {transactionsNextAfter && (
+        <button type="button" onClick={() => fetchTransactions('', transactionsNextAfter)} className="load-more-btn">
+          Load more
+        </button>
+      )}
     </div>
   );
 
@@ -425,6 +443,11 @@ const BlockchainPage = ({ onBack }) => {
               <p>No collections found. Deploy your first collection!</p>
             </div>
           )}
+          {collectionsNextAfter && (
+            <button type="button" onClick={() => fetchCollections(collectionsNextAfter)} className="load-more-btn">
+              Load more
+            </button>
+          )}
         </div>
       </div>
     </div>
@@ -257,8 +257,8 @@ function Dashboard({ user, onLogout }) {
   const [showBlockchainPage, setShowBlockchainPage] = useState(false);
 
   const fetchData = async () => {
-    // Initialize with empty data - no API calls on dashboard load
-    setData({
+    // Start with empty data; the lazy loaders below fill any card that stays empty
+    const emptyData = {
       news: null,
       jobs: null,
       videos: null,
@@ -272,9 +272,24 @@ function Dashboard({ user, onLogout }) {
       weather: null,
       crypto: null,
       recipes: null
-    });
+    };
+    setData(emptyData);
     setLoading(false);
     setLastRefresh(new Date());
+
+    // Load the dashboard cards in one request; failed or slow sections stay empty
+    try {
+      const dashboardRes = await ApiService.getDashboard(['weather', 'crypto', 'recipes', 'jobs']);
+      const loaded = {};
+      Object.entries(dashboardRes.sections || {}).forEach(([name, section]) => {
+        if (section.status === 'ok') {
+          loaded[name] = section.data;
+        }
+      });
+      setData(prev => ({ ...prev, ...loaded }));
+    } catch (err) {
+      console.error('Error fetching dashboard:', err);
+    }
   };
 
   useEffect(() => {
@@ -1,6 +1,10 @@
 import React, { useState, useEffect } from 'react';
+import ApiService from '../api/api';
 import './WeatherDashboard.css';
 
+// Matches the backend's WEATHER_MAX_BATCH_CITIES, so all saved cities fit one batch request
+const MAX_SAVED_CITIES = 10;
+
 const WeatherDashboard = () => {
     const [weatherData, setWeatherData] = useState(null);
     const [loading, setLoading] = useState(true);
@@ -11,6 +15,73 @@ const WeatherDashboard = () => {
     const [showLocationPrompt, setShowLocationPrompt] = useState(false);
     const [locationError, setLocationError] = useState(null);
     const [gettingLocation, setGettingLocation] = useState(false);
+    const [savedCities, setSavedCities] = useState(() => {
+        try {
+            const saved = JSON.parse(localStorage.getItem('saved_weather_cities')) || [];
+            return saved.slice(0, MAX_SAVED_CITIES);
+        } catch (e) {
+            return [];
+        }
+    });
+    const [savedWeather, setSavedWeather] = useState({});
+    const [savedLoading, setSavedLoading] = useState(false);
+    const [savedError, setSavedError] = useState(null);
+
+    // All saved cities come back from one batch request
+    const fetchSavedCities = async (cities = savedCities) => {
+        setSavedError(null);
+        if (cities.length === 0) {
+            setSavedWeather({});
+            return;
+        }
+        
+        setSavedLoading(true);
+        try {
+            const data = await ApiService.getWeatherBatch(cities);
+            const byCity = {};
+            data.results.forEach((result) => {
+                byCity[result.query] = result.weather;
+            });
+            setSavedWeather(byCity);
+        } catch (err) {
+            setSavedError('Could not load weather for saved cities');
+            console.error('Saved cities weather fetch error:', err);
+        } finally {
+            setSavedLoading(false);
+        }
+    };
+
+    const updateSavedCities = (cities) => {
+        setSavedCities(cities);
+        localStorage.setItem('saved_weather_cities', JSON.stringify(cities));
+        fetchSavedCities(cities);
+    };
+
+    const saveCurrentCity = () => {
+        if (savedCities.some((name) => name.toLowerCase() === city.toLowerCase())) {
+            return;
+        }
+        if (savedCities.length >= MAX_SAVED_CITIES) {
+            setSavedError(`You can save up to ${MAX_SAVED_CITIES} cities. Remove one first.`);
+            return;
+        }
+        updateSavedCities([...savedCities, city]);
+    };
+
+    const removeSavedCity = (name) => {
+        updateSavedCities(savedCities.filter((saved) => saved !== name));
+    };
+
+    const showSavedCity = (name) => {
+        // Already loaded by the batch request; no need to fetch again
+        if (savedWeather[name]) {
+            setCity(name);
+            setWeatherData(savedWeather[name]);
+            setError(null);
+        } else {
+            fetchWeatherData(name);
+        }
+    };
 
     const fetchWeatherData = async (cityName = city) => {
         if (cityName === city && !isSearching) {
@@ -160,6 +231,7 @@ const WeatherDashboard = () => {
             setShowLocationPrompt(true);
             setLoading(false);
         }
+        fetchSavedCities();
     }, []);
 
     const handleSearch = (e) => {
@@ -326,12 +398,58 @@ const WeatherDashboard = () => {
                         />
                         <button type="submit" className="search-btn">Search</button>
                     </form>
+                    <button
+                        onClick={saveCurrentCity}
+                        className="reset-location-btn"
+                        disabled={savedCities.length >= MAX_SAVED_CITIES}
+                        title={savedCities.length >= MAX_SAVED_CITIES ? `Up to ${MAX_SAVED_CITIES} saved cities` : 'Save this city'}
+                    >
+                        ⭐ Save City
+                    </button>
                     <button onClick={resetLocationPreference} className="reset-location-btn">
                         🔄 Change Location
                     </button>
                 </div>
             </div>
 
+            {savedError && <p className="error-text">{savedError}</p>}
+
+            {savedCities.length > 0 && (
+                <div className="saved-cities">
+                    {savedCities.map((name) => (
+                        <div
+                            key={name}
+                            className={`saved-city-card${name === city ? ' active' : ''}`}
+                            onClick={() => showSavedCity(name)}
+                        >
+                            <button
+                                className="remove-city-btn"
+                                onClick={(e) => {
+                                    e.stopPropagation();
+                                    removeSavedCity(name);
+                                }}
+                                title="Remove city"
+                            >
+                                ×
+                            </button>
+                            <div className="saved-city-name">{name}</div>
+                            {savedWeather[name] ? (
+                                <div className="saved-city-weather">
+                                    <img
+                                        src={getWeatherIcon(savedWeather[name].icon)}
+                                        alt={savedWeather[name].description}
+                                        className="saved-city-icon"
+                                    />
+                                    <span className="saved-city-temp">{formatTemperature(savedWeather[name].temperature)}°C</span>
+                                </div>
+                            ) : (
+                                <div className="saved-city-weather">{savedLoading ? '...' : 'Unavailable'}</div>
+                            )}
+                        </div>
+                    ))}
+                </div>
+            )}
+
             {isSearching && (
                 <div className="search-loading">
                     <div className="loading-spinner small"></div>
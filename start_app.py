@@ -1,14 +1,23 @@
+import argparse
 import os
+import signal
 import sys
-import subprocess
+import time
 from pathlib import Path
 
+# subprocess, threading and urllib.request (which pulls in socket and ssl) are
+# imported where they are used, after main() has applied gevent's patches
+
 # Add backend directory to Python path
 backend_dir = Path(__file__).parent / "backend"
 sys.path.insert(0, str(backend_dir))
 
+SERVER_MODES = ['dev', 'prod', 'async']
+
 def install_dependencies():
     """Install Python dependencies"""
+    import subprocess
+    
     print("Installing Python dependencies...")
     try:
         subprocess.run([sys.executable, "-m", "pip", "install", "-r", "backend/requirements.txt"], 
@@ -54,28 +63,171 @@ def start_flask_app():
         os.chdir(backend_dir)
         
         # Import and run the app
-        from app import app
+        from app import app, warm_up
         
         print("🚀 Starting Flask server on http://localhost:5000")
         print("📱 Frontend should be available on http://localhost:3000")
         print("Press Ctrl+C to stop the server")
         
+        # The debug reloader's parent process never serves; only the child warms up
+        if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+            warm_up()
         app.run(debug=True, host='0.0.0.0', port=5000)
         
     except Exception as e:
         print(f"❌ Failed to start Flask app: {e}")
         return False
 
+def wait_for_mongodb(timeout):
+    """Block until the app's MongoDB client answers ping, or the timeout passes"""
+    from database import test_mongodb_connection
+    
+    deadline = time.time() + timeout
+    while True:
+        if test_mongodb_connection():
+            return True
+        if time.time() >= deadline:
+            return False
+        time.sleep(2)
+
+def start_health_gate(port, timeout):
+    """Poll /health once workers are up; stop the server if it never turns healthy"""
+    import threading
+    import urllib.request
+    
+    def check():
+        url = f"http://127.0.0.1:{port}/health"
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                with urllib.request.urlopen(url, timeout=5) as response:
+                    if response.status == 200:
+                        print(f"✅ Health gate passed: {url}")
+                        print(f"🔁 Graceful reload: kill -HUP {os.getpid()}")
+                        return
+            except Exception:
+                pass
+            time.sleep(1)
+        
+        print(f"❌ Health gate failed: {url} not healthy after {timeout}s, shutting down")
+        os.kill(os.getpid(), signal.SIGTERM)
+    
+    threading.Thread(target=check, name='health-gate', daemon=True).start()
+
+def start_production_app(options):
+    """Serve the app with gunicorn: preloaded, multi-worker, recycled workers"""
+    print("Starting production server...")
+    os.chdir(backend_dir)
+    
+    from gunicorn.app.base import BaseApplication
+    
+    # Preload: import once in the master. Heavy initialization is deferred to
+    # warm_up(), which must not run threads in the master that forks workers
+    from app import app, warm_up
+    from http_client import http_client
+    
+    if not wait_for_mongodb(options.health_timeout):
+        print("❌ MongoDB ping failed, not starting workers")
+        sys.exit(1)
+    
+    def post_fork(server, worker):
+        # Never share keep-alive sockets opened by the master
+        http_client.adapter.poolmanager.clear()
+        # The listening socket is already bound; warm this worker in the background
+        warm_up()
+    
+    def when_ready(server):
+        start_health_gate(options.port, options.health_timeout)
+    
+    class OneHubApplication(BaseApplication):
+        def __init__(self, application, config):
+            self.application = application
+            self.config_options = config
+            super().__init__()
+        
+        def load_config(self):
+            for key, value in self.config_options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return self.application
+    
+    config = {
+        'bind': f"{options.host}:{options.port}",
+        'workers': options.workers,
+        'threads': options.threads,
+        'preload_app': True,
+        'max_requests': options.max_requests,
+        'max_requests_jitter': options.max_requests_jitter,
+        'timeout': options.timeout,
+        'graceful_timeout': options.graceful_timeout,
+        'post_fork': post_fork,
+        'when_ready': when_ready
+    }
+    
+    print(f"🚀 Starting gunicorn on http://{options.host}:{options.port} "
+          f"({options.workers} workers x {options.threads} threads)")
+    OneHubApplication(app, config).run()
+
+def start_async_app(options):
+    """Serve the app on gevent (see backend/serve_async.py)"""
+    print("Starting async server...")
+    os.chdir(backend_dir)
+    
+    from serve_async import serve
+    serve(host=options.host, port=options.port)
+
+def parse_args():
+    """Command line options; each one can also be set through an environment variable"""
+    parser = argparse.ArgumentParser(description="Start the OneHub dashboard backend")
+    parser.add_argument('--mode', choices=SERVER_MODES, default=os.getenv('ONEHUB_SERVER_MODE', 'dev'),
+                        help="dev: Flask dev server, prod: gunicorn workers, async: gevent (env ONEHUB_SERVER_MODE)")
+    parser.add_argument('--host', default=os.getenv('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('PORT', '5000')))
+    parser.add_argument('--workers', type=int, default=int(os.getenv('WEB_CONCURRENCY', str((os.cpu_count() or 1) * 2 + 1))),
+                        help="gunicorn worker processes (env WEB_CONCURRENCY)")
+    parser.add_argument('--threads', type=int, default=int(os.getenv('GUNICORN_THREADS', '4')),
+                        help="threads per worker (env GUNICORN_THREADS)")
+    parser.add_argument('--max-requests', type=int, default=int(os.getenv('GUNICORN_MAX_REQUESTS', '1000')),
+                        help="recycle a worker after this many requests (env GUNICORN_MAX_REQUESTS)")
+    parser.add_argument('--max-requests-jitter', type=int, default=int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100')),
+                        help="random extra requests so workers don't recycle together (env GUNICORN_MAX_REQUESTS_JITTER)")
+    parser.add_argument('--timeout', type=int, default=int(os.getenv('GUNICORN_TIMEOUT', '60')),
+                        help="worker timeout in seconds; Verbwire calls can take 30s (env GUNICORN_TIMEOUT)")
+    parser.add_argument('--graceful-timeout', type=int, default=int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30')),
+                        help="seconds workers get to finish requests on reload or shutdown (env GUNICORN_GRACEFUL_TIMEOUT)")
+    parser.add_argument('--health-timeout', type=int, default=int(os.getenv('HEALTH_GATE_TIMEOUT', '60')),
+                        help="seconds to wait for the MongoDB ping and /health at startup (env HEALTH_GATE_TIMEOUT)")
+    parser.add_argument('--skip-install', action='store_true', default=os.getenv('ONEHUB_SKIP_INSTALL') == '1',
+                        help="don't pip install requirements first (env ONEHUB_SKIP_INSTALL=1)")
+    return parser.parse_args()
+
 def main():
     """Main startup function"""
-    print("🚀 Starting Dashboard Application Setup...")
+    options = parse_args()
+    
+    if options.mode == 'async':
+        # Patch before anything imports sockets or ssl
+        from gevent import monkey
+        monkey.patch_all()
+    
+    print(f"🚀 Starting Dashboard Application Setup ({options.mode} mode)...")
     print("=" * 50)
     
     # Step 1: Install dependencies
-    if not install_dependencies():
+    if not options.skip_install and not install_dependencies():
         print("❌ Setup failed at dependency installation")
         return
     
+    if options.mode == 'prod':
+        # MongoDB is checked by the startup health gate
+        start_production_app(options)
+        return
+    
+    if options.mode == 'async':
+        start_async_app(options)
+        return
+    
     # Step 2: Setup MongoDB
     if not setup_mongodb():
         print("❌ Setup failed at MongoDB configuration")